@@ -1,17 +1,38 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context, g
 from flask_cors import CORS
-import fitz  # PyMuPDF
 import tiktoken
 import faiss
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from ctransformers import AutoModelForCausalLM
 import tempfile
 import os
+import shutil
+import queue
 import re
+import json
+from functools import partial
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 import logging
-from collections import defaultdict
+import time
+import threading
+import atexit
+from collections import defaultdict, deque
+from extraction_cache import ExtractionCache, hash_bytes
+from embedding_store import EmbeddingStore
+from candidate_index import CandidateIndex
+from candidate_store import CandidateStore
+from job_queue import JobStore, JobManager
+from llm_pool import LLMWorkerPool, default_threads_per_worker, generate_score_only
+from score_cache import ScoreCache
+from pdf_extraction import PAGE_EXTRACTORS, PageExtractionPool, open_pdf
+from uploads import SpooledUploadRequest, upload_size, hash_upload, upload_source, save_upload, open_saved_upload
+from resume_sections import split_resume_sections, SECTION_PRIORITY, SECTION_TITLES
+from metrics import MetricsRegistry, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from model_manager import ModelManager, SerializedModel
+from embedding_batcher import EmbeddingBatcher
+from embedding_scoring import extract_requirements, requirement_coverage, similarity_scores, coverage_report, summarize_coverage
+from skill_matching import SkillMatch
+from concurrent.futures import ThreadPoolExecutor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -36,337 +57,511 @@ def after_request(response):
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
     return response
 
-# Global variables for models
+# Global variables for models, set by load_models once each is loaded
 embed_model = None
 llm_model = None
 tokenizer = None
 
+MODEL_NAMES = ('tokenizer', 'embed', 'llm')
+# Models loaded in a background thread at startup: 'all', 'none' or a comma-separated list of MODEL_NAMES.
+# The default leaves the LLM to the first request that scores with it.
+MODEL_WARMUP = os.environ.get('MODEL_WARMUP', 'tokenizer,embed')
+
 # Configuration constants
+EMBED_MODEL_NAME = "all-MiniLM-L6-v2"
+LLM_MODEL_PATH = "./mistral-7b-instruct-v0.2.Q4_K_M.gguf"
+LLM_MODEL_KWARGS = {
+    'model_type': "mistral",
+    'gpu_layers': 0,
+    'max_new_tokens': 128,  # Reduced for more reliable responses
+    'context_length': 512,
+    'temperature': 0.1,     # Lower temperature for more consistent scoring
+    'repetition_penalty': 1.1
+}
+LLM_GENERATION_KWARGS = {'max_new_tokens': 64, 'temperature': 0.1}
+REASONING_CACHE_VARIANT = 'reasoning'
+SCORING_PROMPT_VERSION = 1  # Bump whenever create_scoring_prompt changes
+
+# Score-only generation (no include_reasoning): stops as soon as the 0-100 integer is complete
+SCORE_ONLY_GENERATION_KWARGS = {'max_new_tokens': 6, 'temperature': 0.1}
+SCORE_ONLY_CACHE_VARIANT = 'score-only'
+
+# JD-major packed scoring: several resumes scored against one job description per prompt
+LLM_PACK_SIZE = int(os.environ.get('LLM_PACK_SIZE', 1))  # Max resumes per prompt; 1 scores every pair on its own
+PACKED_TOKENS_PER_CANDIDATE = 16            # Generation budget per "[n] score - reason" line
+PACKED_SCORE_ONLY_TOKENS_PER_CANDIDATE = 6  # Generation budget per "[n] score" line
+PACKED_PROMPT_VERSION = 1                   # Bump whenever create_packed_scoring_prompt changes
+PACKED_CACHE_VARIANT = f"packed-v{PACKED_PROMPT_VERSION}"
+PACKED_SCORE_ONLY_CACHE_VARIANT = f"packed-score-only-v{PACKED_PROMPT_VERSION}"
+
+# Scoring modes: 'embedding' scores from JD requirement coverage by resume chunks, without the LLM
+SCORING_MODES = ('llm', 'embedding')
 MAX_CONTEXT_TOKENS = 400  # Reduced from 512 to leave more room
 MAX_RESUME_TOKENS = 2000  # Maximum tokens to process from a resume
 MAX_JD_TOKENS = 1000      # Maximum tokens to process from job description
 CHUNK_SIZE = 100          # Increased chunk size for better context
 CHUNK_OVERLAP = 50        # Overlap between chunks
 MAX_CHUNKS_TO_PROCESS = 10  # Limit chunks processed per resume
+EMBED_BATCH_SIZE = 64     # Sentences per SentenceTransformer forward pass
 
-def load_models():
-    """Load the AI models once at startup"""
-    global embed_model, llm_model, tokenizer
-    try:
-        if embed_model is None:
-            logger.info("Loading embedding model...")
-            embed_model = SentenceTransformer("all-MiniLM-L6-v2")
-            
-        if llm_model is None:
-            logger.info("Loading LLM model...")
-            llm_model = AutoModelForCausalLM.from_pretrained(
-                "./mistral-7b-instruct-v0.2.Q4_K_M.gguf",
-                model_type="mistral",
-                gpu_layers=0,
-                max_new_tokens=128,  # Reduced for more reliable responses
-                context_length=512,
-                temperature=0.1,     # Lower temperature for more consistent scoring
-                repetition_penalty=1.1
-            )
-            
-        if tokenizer is None:
-            tokenizer = tiktoken.get_encoding("cl100k_base")
-            
-        logger.info("All models loaded successfully!")
-    except Exception as e:
-        logger.error(f"Error loading models: {str(e)}")
-        raise
+# Coalescing of concurrent small encode() calls into shared forward passes (0 disables)
+EMBED_COALESCE_WINDOW_MS = float(os.environ.get('EMBED_COALESCE_WINDOW_MS', 5))
+EMBED_COALESCE_MAX_BATCH = int(os.environ.get('EMBED_COALESCE_MAX_BATCH', EMBED_BATCH_SIZE))
 
-def analyze_font_properties(span):
-    """Analyze font properties from a span"""
-    font = span.get("font", "")
-    flags = span.get("flags", 0)
-    size = span.get("size", 0)
-    
-    # Font style analysis
-    is_bold = bool(flags & 2**4)  # Bold flag
-    is_italic = bool(flags & 2**1)  # Italic flag
-    is_superscript = bool(flags & 2**0)  # Superscript flag
-    is_subscript = bool(flags & 2**2)  # Subscript flag
-    
-    # Font family analysis
-    font_lower = font.lower()
-    is_monospace = any(mono in font_lower for mono in ['mono', 'courier', 'consolas', 'code'])
-    is_serif = any(serif in font_lower for serif in ['times', 'georgia', 'garamond'])
-    is_sans_serif = any(sans in font_lower for sans in ['arial', 'helvetica', 'calibri', 'verdana'])
-    
-    # Size categories
-    size_category = 'normal'
-    if size > 0:
-        if size >= 16:
-            size_category = 'large'
-        elif size >= 14:
-            size_category = 'medium-large'
-        elif size >= 12:
-            size_category = 'medium'
-        elif size >= 10:
-            size_category = 'small'
-        else:
-            size_category = 'tiny'
-    
-    return {
-        'is_bold': is_bold,
-        'is_italic': is_italic,
-        'is_superscript': is_superscript,
-        'is_subscript': is_subscript,
-        'is_monospace': is_monospace,
-        'is_serif': is_serif,
-        'is_sans_serif': is_sans_serif,
-        'font_name': font,
-        'font_size': size,
-        'size_category': size_category
+# Resume chunking: 'sections' chunks along detected resume sections (Experience, Skills, ...),
+# 'tokens' uses blank-line/token windows only
+CHUNKING_STRATEGY = os.environ.get('CHUNKING_STRATEGY', 'sections')
+SECTION_CHUNK_TOKENS = 200      # Max tokens per section chunk, within the embedding model's window
+SECTION_HEADER_MAX_TOKENS = 40  # Shorter text before the first heading is contact details, not embedded
+
+# Files and directories under ./cache; each moves with the environment variable of the same name
+CACHE_PATHS = {
+    'EXTRACTION_CACHE_DIR': './cache/extraction',
+    'EMBEDDING_STORE_DIR': './cache/embeddings',
+    'CANDIDATE_INDEX_DIR': './cache/candidate_index',
+    'CANDIDATE_DB_PATH': './cache/candidates.sqlite3',
+    'JOB_DB_PATH': './cache/jobs.sqlite3',
+    'JOB_UPLOAD_DIR': './cache/job_uploads',
+    'SCORE_CACHE_PATH': './cache/scores.sqlite3'
+}
+
+def cache_path(name):
+    return os.environ.get(name, CACHE_PATHS[name])
+
+# Extraction cache - bump EXTRACTION_VERSION whenever the extraction output changes
+EXTRACTION_VERSION = 2
+EXTRACTION_CACHE_DIR = cache_path('EXTRACTION_CACHE_DIR')
+EXTRACTION_CACHE_MAX_BYTES = int(os.environ.get('EXTRACTION_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+# Extraction mode for scoring paths: 'plain' skips Markdown styling and layout,
+# which scoring does not need and which costs tokens. /api/extract-text stays 'rich'.
+SCORING_EXTRACTION_MODE = os.environ.get('SCORING_EXTRACTION_MODE', 'plain')
+
+# Upload limits; requests above MAX_UPLOAD_REQUEST_BYTES are rejected with 413 before parsing
+MAX_UPLOAD_FILE_BYTES = int(os.environ.get('MAX_UPLOAD_FILE_BYTES', 20 * 1024 * 1024))
+MAX_UPLOAD_REQUEST_BYTES = int(os.environ.get('MAX_UPLOAD_REQUEST_BYTES', 512 * 1024 * 1024))
+UPLOAD_SPOOL_MAX_MEMORY = 512 * 1024  # Larger requests spool their files to disk
+UPLOAD_TEMP_DIR = os.environ.get('UPLOAD_TEMP_DIR')  # Defaults to the system temp directory
+
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_REQUEST_BYTES
+SpooledUploadRequest.spool_max_memory = UPLOAD_SPOOL_MAX_MEMORY
+SpooledUploadRequest.temp_dir = UPLOAD_TEMP_DIR
+app.request_class = SpooledUploadRequest
+
+# Parallel PDF extraction; 0 keeps the serial page loop
+PDF_EXTRACTION_WORKERS = int(os.environ.get('PDF_EXTRACTION_WORKERS', 0))
+PARALLEL_EXTRACTION_MIN_PAGES = 4  # Smaller documents are not worth the IPC overhead
+
+EXTRACTION_CACHE_VERSION = f"v{EXTRACTION_VERSION}-t{MAX_RESUME_TOKENS}"
+
+# Resume chunk embeddings, reused whenever the same resume is scored again
+EMBEDDING_STORE_DIR = cache_path('EMBEDDING_STORE_DIR')
+EMBEDDING_STORE_VERSION = (
+    f"{EMBED_MODEL_NAME}-c{CHUNK_SIZE}-o{CHUNK_OVERLAP}-m{MAX_CHUNKS_TO_PROCESS}"
+    f"-{CHUNKING_STRATEGY}{SECTION_CHUNK_TOKENS if CHUNKING_STRATEGY == 'sections' else ''}"
+)
+
+# Global candidate index over every resume chunk ever embedded
+CANDIDATE_INDEX_DIR = cache_path('CANDIDATE_INDEX_DIR')
+CANDIDATE_INDEX_NLIST = 256   # IVF lists once the index is large enough to train
+CANDIDATE_INDEX_NPROBE = 16   # IVF lists visited per search
+# Seconds between saves of the candidate index; it is also saved on shutdown
+CANDIDATE_INDEX_SAVE_INTERVAL = float(os.environ.get('CANDIDATE_INDEX_SAVE_INTERVAL', 10))
+DEFAULT_SEARCH_TOP_K = 20
+
+# Persistent candidate corpus (POST /api/candidates): candidates, versions and extracted text
+CANDIDATE_DB_PATH = cache_path('CANDIDATE_DB_PATH')
+CANDIDATE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_.-]{1,64}$')
+
+# Asynchronous batch jobs
+JOB_DB_PATH = cache_path('JOB_DB_PATH')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 1))  # Concurrent batch jobs
+# Resumes uploaded for a batch job wait here until the job has extracted them and finished
+JOB_UPLOAD_DIR = cache_path('JOB_UPLOAD_DIR')
+
+# LLM worker processes; 0 keeps a single in-process model
+LLM_WORKERS = int(os.environ.get('LLM_WORKERS', 0))
+LLM_THREADS_PER_WORKER = int(os.environ.get('LLM_THREADS_PER_WORKER', default_threads_per_worker(LLM_WORKERS)))
+
+# LLM score cache
+SCORE_CACHE_PATH = cache_path('SCORE_CACHE_PATH')
+SCORE_CACHE_TTL = int(os.environ.get('SCORE_CACHE_TTL', 7 * 24 * 3600))
+SCORE_CACHE_MAX_ENTRIES = int(os.environ.get('SCORE_CACHE_MAX_ENTRIES', 100000))
+
+SCORE_CACHE_CONTEXT = json.dumps({
+    'prompt_version': SCORING_PROMPT_VERSION,
+    'model': os.path.basename(LLM_MODEL_PATH),
+    'model_kwargs': LLM_MODEL_KWARGS,
+    'retrieval': EMBEDDING_STORE_VERSION,
+    # Every cache key names its generation mode (variant); each mode's settings are part of the context
+    'generation_kwargs': {
+        REASONING_CACHE_VARIANT: LLM_GENERATION_KWARGS,
+        SCORE_ONLY_CACHE_VARIANT: SCORE_ONLY_GENERATION_KWARGS,
+        PACKED_CACHE_VARIANT: dict(LLM_GENERATION_KWARGS, tokens_per_candidate=PACKED_TOKENS_PER_CANDIDATE),
+        PACKED_SCORE_ONLY_CACHE_VARIANT: dict(
+            LLM_GENERATION_KWARGS, tokens_per_candidate=PACKED_SCORE_ONLY_TOKENS_PER_CANDIDATE
+        )
     }
+}, sort_keys=True)
 
-def format_text_with_style(text, font_props):
-    """Format text with appropriate markdown styling"""
-    if not text.strip():
-        return text
+# Streaming batch responses
+STREAM_PROGRESS_INTERVAL = 2.0  # Seconds between progress events
+STREAM_HEARTBEAT_INTERVAL = 10.0  # Seconds without any event before a heartbeat
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream'
+}
+
+# On-disk stores and worker pools, opened in each server process by open_stores(). Nothing is
+# opened at import: pool processes re-import this module, and a forked server worker must not
+# inherit state its parent read from files the worker will write.
+extraction_cache = None
+resume_embedding_store = None
+score_cache = None
+candidate_index = None
+candidate_store = None
+page_extraction_pool = None
+job_store = None
+job_manager = None
+_stores_pid = None
+_stores_lock = threading.Lock()
+
+# Prometheus metrics, served on /metrics
+TOKEN_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+metrics_registry = MetricsRegistry()
+http_requests = metrics_registry.counter(
+    'hiresync_http_requests_total', 'HTTP requests by endpoint, method and status code',
+    ('endpoint', 'method', 'status')
+)
+http_request_seconds = metrics_registry.histogram(
+    'hiresync_http_request_duration_seconds', 'Time to produce a response (streams: until the first byte)',
+    ('endpoint',)
+)
+http_requests_in_flight = metrics_registry.gauge(
+    'hiresync_http_requests_in_flight', 'Requests currently being handled'
+)
+stage_seconds = metrics_registry.histogram(
+    'hiresync_stage_duration_seconds',
+    'Time spent per pipeline stage (extraction, chunking, embedding, index_build, faiss_search, skill_matching, embedding_scoring, llm_generate)',
+    ('stage',)
+)
+llm_prompt_tokens = metrics_registry.histogram(
+    'hiresync_llm_prompt_tokens', 'Prompt tokens per LLM generation (cl100k)', buckets=TOKEN_BUCKETS
+)
+llm_completion_tokens = metrics_registry.histogram(
+    'hiresync_llm_completion_tokens', 'Generated tokens per LLM generation (cl100k)', buckets=TOKEN_BUCKETS
+)
+llm_generations_in_flight = metrics_registry.gauge(
+    'hiresync_llm_generations_in_flight', 'Prompts submitted to the LLM and not yet answered'
+)
+
+def load_tokenizer():
+    return tiktoken.get_encoding("cl100k_base")
+
+def load_embed_model():
+    # Imported here: sentence_transformers pulls in torch, which alone takes seconds.
+    # encode() is safe to call from several request threads at once.
+    from sentence_transformers import SentenceTransformer
+    logger.info("Loading embedding model...")
+    model = SentenceTransformer(EMBED_MODEL_NAME)
+    if EMBED_COALESCE_WINDOW_MS > 0:
+        model = EmbeddingBatcher(model, max_wait_ms=EMBED_COALESCE_WINDOW_MS, max_batch_size=EMBED_COALESCE_MAX_BATCH)
+    return model
+
+def load_llm_model():
+    if LLM_WORKERS > 0:
+        # Worker processes take prompts from a shared queue, so concurrent callers are fine
+        logger.info(f"Starting {LLM_WORKERS} LLM worker processes...")
+        pool = LLMWorkerPool(
+            LLM_MODEL_PATH,
+            LLM_MODEL_KWARGS,
+            workers=LLM_WORKERS,
+            threads_per_worker=LLM_THREADS_PER_WORKER
+        )
+        # Ready once a worker has loaded the model; a failed load is retried by the next request
+        try:
+            pool.wait_ready()
+        except Exception:
+            pool.close()
+            raise
+        return pool
     
-    formatted = text
+    # A single in-process ctransformers model must not generate for two threads at once
+    from ctransformers import AutoModelForCausalLM
+    logger.info("Loading LLM model...")
+    return SerializedModel(AutoModelForCausalLM.from_pretrained(LLM_MODEL_PATH, **LLM_MODEL_KWARGS))
+
+model_manager = ModelManager({
+    'tokenizer': load_tokenizer,
+    'embed': load_embed_model,
+    'llm': load_llm_model
+})
+
+def load_models(names=MODEL_NAMES):
+    """Load the named models if they are not loaded yet
     
-    # Apply bold formatting
-    if font_props['is_bold']:
-        formatted = f"**{formatted}**"
+    Endpoints ask only for what they use, so text extraction never waits for
+    the LLM. Safe to call from any thread: concurrent callers share one load.
+    """
+    global embed_model, llm_model, tokenizer
+    for name in names:
+        model = model_manager.get(name)
+        if name == 'tokenizer':
+            tokenizer = model
+        elif name == 'embed':
+            embed_model = model
+        else:
+            llm_model = model
+
+def parse_model_names(value):
+    """Parse 'all', 'none' or a comma-separated list of MODEL_NAMES"""
+    value = (value or '').strip().lower()
+    if value in ('', 'none'):
+        return ()
+    if value == 'all':
+        return MODEL_NAMES
+    names = tuple(name.strip() for name in value.split(',') if name.strip())
+    unknown = [name for name in names if name not in MODEL_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown models: {', '.join(unknown)} (expected: {', '.join(MODEL_NAMES)})")
+    return names
+
+def scoring_models(scoring_mode):
+    """Models a scoring request needs; embedding scoring never loads the LLM"""
+    return ('tokenizer', 'embed') if scoring_mode == 'embedding' else MODEL_NAMES
+
+def open_stores():
+    """Open the caches, stores, job queue and extraction pool in this process, once
     
-    # Apply italic formatting
-    if font_props['is_italic']:
-        formatted = f"*{formatted}*"
+    Called by ``start_background_services`` and before every request. A
+    process forked after opening them (e.g. by gunicorn) opens its own.
+    """
+    global extraction_cache, resume_embedding_store, score_cache, candidate_index, candidate_store
+    global page_extraction_pool, job_store, job_manager, _stores_pid
+    with _stores_lock:
+        if _stores_pid == os.getpid():
+            return
+        
+        extraction_cache = ExtractionCache(
+            EXTRACTION_CACHE_DIR,
+            version=EXTRACTION_CACHE_VERSION,
+            max_bytes=EXTRACTION_CACHE_MAX_BYTES
+        )
+        resume_embedding_store = EmbeddingStore(EMBEDDING_STORE_DIR, version=EMBEDDING_STORE_VERSION)
+        score_cache = ScoreCache(
+            SCORE_CACHE_PATH,
+            context=SCORE_CACHE_CONTEXT,
+            ttl_seconds=SCORE_CACHE_TTL,
+            max_entries=SCORE_CACHE_MAX_ENTRIES
+        )
+        candidate_index = CandidateIndex(
+            CANDIDATE_INDEX_DIR,
+            version=EMBEDDING_STORE_VERSION,
+            nlist=CANDIDATE_INDEX_NLIST,
+            nprobe=CANDIDATE_INDEX_NPROBE,
+            chunk_source=resume_embedding_store.get_chunks,
+            save_interval=CANDIDATE_INDEX_SAVE_INTERVAL
+        )
+        candidate_store = CandidateStore(CANDIDATE_DB_PATH)
+        page_extraction_pool = PageExtractionPool(PDF_EXTRACTION_WORKERS) if PDF_EXTRACTION_WORKERS > 0 else None
+        job_store = JobStore(JOB_DB_PATH)
+        job_manager = JobManager(job_store, run_batch_job, workers=JOB_WORKERS, cleanup=remove_batch_job_uploads)
+        _stores_pid = os.getpid()
+
+def close_stores():
+    """Stop batch jobs after their current pair and save the candidate index
     
-    # Apply monospace formatting
-    if font_props['is_monospace']:
-        formatted = f"`{formatted}`"
+    Runs at exit, and should be called by the server before it exits (the
+    interpreter joins job threads before atexit handlers run). Interrupted
+    jobs resume on the next start. Only acts in the process that opened the stores.
+    """
+    if _stores_pid == os.getpid():
+        job_manager.stop()
+        candidate_index.close()
+
+atexit.register(close_stores)
+
+def start_background_services():
+    """Open the stores, then start model warm-up, candidate index autosave and unfinished batch jobs
     
-    # Apply superscript/subscript (using Unicode or markdown)
-    if font_props['is_superscript']:
-        formatted = f"^{formatted}^"
-    elif font_props['is_subscript']:
-        formatted = f"_{formatted}_"
+    Call once per server process, after any fork. With several server
+    processes sharing JOB_DB_PATH only the one holding the job runner lock
+    resumes jobs, so none is run twice.
+    """
+    open_stores()
     
-    return formatted
-
-def extract_text_blocks_with_positioning(page):
-    """Extract text blocks with detailed positioning and formatting"""
-    blocks = []
-    text_dict = page.get_text("dict")
+    warmup_models = parse_model_names(MODEL_WARMUP)
+    if warmup_models:
+        logger.info(f"Warming up models in the background: {', '.join(warmup_models)}")
+        start_model_warmup(warmup_models)
     
-    for block in text_dict.get("blocks", []):
-        if "lines" in block:
-            block_info = {
-                'bbox': block.get('bbox', [0, 0, 0, 0]),
-                'lines': []
-            }
-            
-            for line in block["lines"]:
-                line_info = {
-                    'bbox': line.get('bbox', [0, 0, 0, 0]),
-                    'spans': []
-                }
-                
-                for span in line.get("spans", []):
-                    span_text = span.get("text", "")
-                    if span_text.strip():
-                        font_props = analyze_font_properties(span)
-                        
-                        span_info = {
-                            'text': span_text,
-                            'bbox': span.get('bbox', [0, 0, 0, 0]),
-                            'font_props': font_props,
-                            'formatted_text': format_text_with_style(span_text, font_props)
-                        }
-                        line_info['spans'].append(span_info)
-                
-                if line_info['spans']:
-                    block_info['lines'].append(line_info)
-            
-            if block_info['lines']:
-                blocks.append(block_info)
+    candidate_index.start_autosave()
     
-    return blocks
+    if job_store.acquire_runner_lock():
+        job_manager.resume_unfinished()
 
-def detect_text_structure(blocks):
-    """Detect document structure like headers, paragraphs, lists, etc."""
-    structured_content = []
+def start_model_warmup(names):
+    """Load models in a background thread so the server accepts requests right away"""
+    def warm_up():
+        try:
+            load_models(names)
+            logger.info(f"Model warm-up finished: {', '.join(names)}")
+        except Exception as e:
+            logger.error(f"Model warm-up failed: {str(e)}")
     
-    for block in blocks:
-        block_y = block['bbox'][1]  # Top y-coordinate
-        
-        for line in block['lines']:
-            line_content = []
-            line_y = line['bbox'][1]
-            
-            # Combine spans in the line
-            full_line_text = ""
-            line_has_bold = False
-            line_has_large_font = False
-            line_font_sizes = []
-            
-            for span in line['spans']:
-                span_text = span['text']
-                font_props = span['font_props']
-                
-                full_line_text += span_text
-                line_content.append(span)
-                
-                if font_props['is_bold']:
-                    line_has_bold = True
-                if font_props['size_category'] in ['large', 'medium-large']:
-                    line_has_large_font = True
-                line_font_sizes.append(font_props['font_size'])
-            
-            # Determine line type
-            line_type = 'paragraph'
-            full_line_text_stripped = full_line_text.strip()
-            
-            if not full_line_text_stripped:
-                line_type = 'blank'
-            elif line_has_bold and line_has_large_font:
-                line_type = 'main_header'
-            elif line_has_bold:
-                line_type = 'sub_header'
-            elif full_line_text_stripped.startswith(('•', '▪', '▫', '◦', '‣', '⁃', '-', '*')):
-                line_type = 'bullet_point'
-            elif re.match(r'^\s*\d+[\.\)]\s', full_line_text_stripped):
-                line_type = 'numbered_list'
-            elif full_line_text_stripped.endswith(':') and len(full_line_text_stripped) < 100:
-                line_type = 'section_header'
-            elif len(full_line_text_stripped) < 80 and line_has_bold:
-                line_type = 'sub_header'
-            
-            structured_content.append({
-                'type': line_type,
-                'content': line_content,
-                'text': full_line_text,
-                'y_position': line_y,
-                'bbox': line['bbox']
-            })
-    
-    return structured_content
+    thread = threading.Thread(target=warm_up, name='model-warmup', daemon=True)
+    thread.start()
+    return thread
 
-def preserve_document_layout(structured_content):
-    """Preserve document layout with proper spacing and formatting"""
-    formatted_lines = []
-    previous_y = None
-    previous_type = None
+def extraction_cache_key(file_hash, mode):
+    return f"{mode}-{file_hash}"
+
+def check_upload(file):
+    """Return the EMPTY_FILE / ERROR_ result for uploads that must not be extracted, else None"""
+    size = upload_size(file)
+    if size == 0:
+        return "EMPTY_FILE"
+    if size > MAX_UPLOAD_FILE_BYTES:
+        return f"ERROR_FILE_TOO_LARGE: {file.filename} is {size} bytes, the limit is {MAX_UPLOAD_FILE_BYTES}"
+    return None
+
+def extract_text_from_pdf(file, mode='rich'):
+    """Extract text from PDF file, serving repeat uploads from the extraction cache
     
-    for item in structured_content:
-        current_y = item['y_position']
-        current_type = item['type']
-        
-        # Calculate vertical spacing
-        if previous_y is not None:
-            y_gap = abs(previous_y - current_y)
-            
-            # Add extra spacing for significant gaps
-            if y_gap > 20:  # Significant vertical gap
-                formatted_lines.append("")
-                if y_gap > 40:  # Very large gap
-                    formatted_lines.append("")
-        
-        # Format the line based on its type
-        if current_type == 'blank':
-            formatted_lines.append("")
-        elif current_type == 'main_header':
-            formatted_lines.append("")
-            formatted_lines.append(format_line_content(item['content']))
-            formatted_lines.append("")
-        elif current_type == 'sub_header':
-            if previous_type not in ['main_header', 'blank']:
-                formatted_lines.append("")
-            formatted_lines.append(format_line_content(item['content']))
-        elif current_type == 'section_header':
-            formatted_lines.append("")
-            formatted_lines.append(format_line_content(item['content']))
-        elif current_type == 'bullet_point':
-            formatted_lines.append(format_line_content(item['content']))
-        elif current_type == 'numbered_list':
-            formatted_lines.append(format_line_content(item['content']))
-        else:  # paragraph
-            formatted_lines.append(format_line_content(item['content']))
-        
-        previous_y = current_y
-        previous_type = current_type
-    
-    return formatted_lines
-
-def format_line_content(spans):
-    """Format a line's content preserving all formatting"""
-    formatted_parts = []
-    
-    for span in spans:
-        formatted_text = span['formatted_text']
-        formatted_parts.append(formatted_text)
-    
-    return "".join(formatted_parts)
-
-def extract_text_from_pdf(file):
-    """Extract text from PDF file with perfect formatting preservation"""
+    ``mode`` is 'rich' (Markdown styling and layout) or 'plain' (lean text for scoring).
+    The upload is hashed in chunks and opened by path when spooled to disk, so
+    it is never read into memory as a whole.
+    """
     try:
-        # Read file content
-        file_content = file.read()
-        file.seek(0)  # Reset file pointer
-        
-        if len(file_content) == 0:
-            return "EMPTY_FILE"
+        rejected = check_upload(file)
+        if rejected:
+            return rejected
         
-        # Open PDF with PyMuPDF
-        doc = fitz.open(stream=file_content, filetype="pdf")
+        cache_key = extraction_cache_key(hash_upload(file), mode)
+        cached_text = extraction_cache.get(cache_key)
+        if cached_text is not None:
+            return cached_text
         
-        if doc.page_count == 0:
-            return "EMPTY_CONTENT"
+        text = extract_text_from_pdf_source(upload_source(file), mode)
+        if not text.startswith("ERROR_"):
+            extraction_cache.put(cache_key, text)
         
-        # Extract text from all pages with perfect formatting
-        all_pages_content = []
-        
-        for page_num in range(doc.page_count):
-            page = doc[page_num]
-            
-            # Extract structured content with positioning
-            blocks = extract_text_blocks_with_positioning(page)
-            
-            if not blocks:
-                continue
-            
-            # Detect document structure
-            structured_content = detect_text_structure(blocks)
-            
-            # Preserve layout and formatting
-            formatted_lines = preserve_document_layout(structured_content)
-            
-            # Join the formatted lines
-            page_content = "\n".join(formatted_lines)
-            
-            if page_content.strip():
-                all_pages_content.append(page_content)
+        return text
         
-        doc.close()
+    except Exception as e:
+        logger.error(f"Error extracting PDF text: {str(e)}")
+        return f"ERROR_EXTRACTION: {str(e)}"
+
+def extract_text_from_pdf_source(source, mode='rich'):
+    """Extract text from a PDF file path or bytes with perfect formatting preservation"""
+    with stage_seconds.time(stage='extraction'):
+        return _extract_text_from_pdf_source(source, mode)
+
+def _extract_text_from_pdf_source(source, mode):
+    try:
+        # Open PDF with PyMuPDF
+        doc = open_pdf(source)
+        page_count = doc.page_count
         
-        if not all_pages_content:
+        if page_count == 0:
+            doc.close()
             return "EMPTY_CONTENT"
         
-        # Join all pages with clear page breaks
-        if len(all_pages_content) > 1:
-            full_text = "\n\n--- PAGE BREAK ---\n\n".join(all_pages_content)
+        # Extract text from all pages with perfect formatting
+        if page_extraction_pool is not None and page_count >= PARALLEL_EXTRACTION_MIN_PAGES:
+            doc.close()
+            page_contents = page_extraction_pool.extract_pages(source, page_count, mode)
         else:
-            full_text = all_pages_content[0]
+            extract_page = PAGE_EXTRACTORS[mode]
+            page_contents = [extract_page(doc[page_num]) for page_num in range(page_count)]
+            doc.close()
         
-        # Clean up excessive blank lines while preserving intentional spacing
-        full_text = re.sub(r'\n{4,}', '\n\n\n', full_text)
+        return assemble_document_text(page_contents)
         
-        # Truncate if too long
-        if count_tokens(full_text) > MAX_RESUME_TOKENS:
-            full_text = truncate_text(full_text, MAX_RESUME_TOKENS)
-            logger.info(f"Truncated document text to {MAX_RESUME_TOKENS} tokens")
+    except Exception as e:
+        logger.error(f"Error extracting PDF text: {str(e)}")
+        return f"ERROR_EXTRACTION: {str(e)}"
+
+def assemble_document_text(page_contents):
+    """Join per-page contents in page order, clean up spacing and truncate"""
+    all_pages_content = [content for content in page_contents if content.strip()]
+    
+    if not all_pages_content:
+        return "EMPTY_CONTENT"
+    
+    # Join all pages with clear page breaks
+    if len(all_pages_content) > 1:
+        full_text = "\n\n--- PAGE BREAK ---\n\n".join(all_pages_content)
+    else:
+        full_text = all_pages_content[0]
+    
+    # Clean up excessive blank lines while preserving intentional spacing
+    full_text = re.sub(r'\n{4,}', '\n\n\n', full_text)
+    
+    # Truncate if too long
+    if count_tokens(full_text) > MAX_RESUME_TOKENS:
+        full_text = truncate_text(full_text, MAX_RESUME_TOKENS)
+        logger.info(f"Truncated document text to {MAX_RESUME_TOKENS} tokens")
+    
+    return full_text if full_text.strip() else "EMPTY_CONTENT"
+
+def extract_texts_from_pdfs(files, mode='rich'):
+    """Extract several uploaded PDFs, closing each upload as soon as it is done
+    
+    Returns texts in the order of ``files``. With a pool, whole documents go
+    to the workers with at most two per worker in flight, so spooled uploads
+    are released progressively; without one this is the serial path.
+    """
+    texts = [None] * len(files)
+    
+    if page_extraction_pool is None:
+        for i, file in enumerate(files):
+            texts[i] = extract_text_from_pdf(file, mode)
+            file.close()
+        return texts
+    
+    in_flight = deque()
+    for i, file in enumerate(files):
+        rejected = check_upload(file)
+        if rejected:
+            texts[i] = rejected
+            file.close()
+            continue
         
-        return full_text if full_text.strip() else "EMPTY_CONTENT"
+        cache_key = extraction_cache_key(hash_upload(file), mode)
+        cached_text = extraction_cache.get(cache_key)
+        if cached_text is not None:
+            texts[i] = cached_text
+            file.close()
+            continue
         
+        future = page_extraction_pool.submit_document(upload_source(file), mode)
+        in_flight.append((i, file, cache_key, future, time.perf_counter()))
+        if len(in_flight) >= 2 * page_extraction_pool.workers:
+            i, file, cache_key, future, submitted = in_flight.popleft()
+            texts[i] = finish_pool_extraction(file, cache_key, future, submitted)
+    
+    while in_flight:
+        i, file, cache_key, future, submitted = in_flight.popleft()
+        texts[i] = finish_pool_extraction(file, cache_key, future, submitted)
+    
+    return texts
+
+def finish_pool_extraction(file, cache_key, future, submitted):
+    """Wait for a pooled document, cache its text and release the upload"""
+    try:
+        text = assemble_document_text(future.result())
     except Exception as e:
         logger.error(f"Error extracting PDF text: {str(e)}")
-        return f"ERROR_EXTRACTION: {str(e)}"
+        text = f"ERROR_EXTRACTION: {str(e)}"
+    finally:
+        file.close()
+        stage_seconds.observe(time.perf_counter() - submitted, stage='extraction')
+    
+    if not text.startswith("ERROR_"):
+        extraction_cache.put(cache_key, text)
+    return text
 
 def clean_text(text):
     """Clean text while preserving important formatting"""
@@ -430,23 +625,59 @@ def count_tokens(text):
     """Count tokens in text"""
     return len(tokenizer.encode(text))
 
+def _tail_start(text):
+    """Offset of the last line start that tokenization never merges across
+    
+    cl100k_base pre-tokenization never joins a newline to a following
+    non-whitespace character, so for the returned offset ``i``
+    ``count_tokens(text) == count_tokens(text[:i]) + count_tokens(text[i:])``.
+    Returns 0 when there is no such line start.
+    """
+    idx = text.rfind('\n')
+    while idx >= 0:
+        if idx + 1 < len(text) and not text[idx + 1].isspace():
+            return idx + 1
+        idx = text.rfind('\n', 0, idx)
+    return 0
+
+def _extend_token_count(head_tokens, tail, addition):
+    """Count tokens of ``head + tail + addition`` without re-encoding ``head``
+    
+    ``head_tokens`` is the token count of everything before ``tail``, which
+    must start at a ``_tail_start`` boundary. Only ``tail + addition`` is
+    encoded. Returns ``(total_tokens, new_head_tokens, new_tail)`` describing
+    the extended text the same way.
+    """
+    joined = tail + addition
+    start = _tail_start(joined)
+    head_part = len(tokenizer.encode(joined[:start])) if start else 0
+    tail_part = len(tokenizer.encode(joined[start:]))
+    return head_tokens + head_part + tail_part, head_tokens + head_part, joined[start:]
+
 def truncate_text(text, max_tokens):
     """Truncate text to max_tokens while preserving structure"""
     tokens = tokenizer.encode(text)
     if len(tokens) <= max_tokens:
         return text
     
-    # Try to truncate at paragraph boundaries
+    # Try to truncate at paragraph boundaries, counting the growing prefix incrementally
     paragraphs = text.split('\n\n')
-    current_text = ""
+    kept = []
+    has_text = False
+    head_tokens = 0
+    tail = ""
     
     for paragraph in paragraphs:
-        test_text = current_text + '\n\n' + paragraph if current_text else paragraph
-        if count_tokens(test_text) <= max_tokens:
-            current_text = test_text
+        addition = '\n\n' + paragraph if has_text else paragraph
+        test_tokens, new_head_tokens, new_tail = _extend_token_count(head_tokens, tail, addition)
+        if test_tokens <= max_tokens:
+            kept.append(addition)
+            has_text = has_text or bool(addition)
+            head_tokens, tail = new_head_tokens, new_tail
         else:
             break
     
+    current_text = "".join(kept)
     if current_text:
         return current_text
     
@@ -454,6 +685,25 @@ def truncate_text(text, max_tokens):
     truncated_tokens = tokens[:max_tokens]
     return tokenizer.decode(truncated_tokens)
 
+def parse_number(values, name, convert=int, default=None, minimum=None, maximum=None):
+    """Read an optional numeric form or query field; returns ``(value, error)``"""
+    raw = values.get(name)
+    if raw is None or not raw.strip():
+        return default, None
+    
+    kind = 'an integer' if convert is int else 'a number'
+    try:
+        value = convert(raw)
+    except ValueError:
+        return None, f"{name} must be {kind}, got {raw!r}"
+    if not np.isfinite(value) or (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+        if minimum is None and maximum is None:
+            return None, f"{name} must be a finite number, got {raw!r}"
+        if maximum is None:
+            return None, f"{name} must be {kind} >= {minimum}, got {raw!r}"
+        return None, f"{name} must be {kind} between {minimum} and {maximum}, got {raw!r}"
+    return value, None
+
 def get_job_description_text(request):
     """Extract job description from either text field or PDF file"""
     # First check if there's a job description file
@@ -461,7 +711,7 @@ def get_job_description_text(request):
         jd_file = request.files['job_description_file']
         if jd_file and jd_file.filename:
             # Extract text from PDF
-            jd_text = extract_text_from_pdf(jd_file)
+            jd_text = extract_text_from_pdf(jd_file, SCORING_EXTRACTION_MODE)
             if jd_text.startswith("ERROR_") or jd_text == "EMPTY_CONTENT":
                 return None, f"Failed to extract job description from PDF: {jd_text}"
             
@@ -490,11 +740,18 @@ def get_job_description_text(request):
     return None, "No job description provided (neither text nor file)"
 
 def chunk_text_improved(text, max_tokens=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
-    """Improved text chunking with overlap and structure preservation"""
+    """Improved text chunking with overlap and structure preservation
+    
+    The token count of the growing chunk is tracked incrementally with
+    ``_extend_token_count``, so each section is encoded a bounded number of
+    times instead of re-encoding the whole chunk for every section.
+    """
     # Try to split at natural boundaries first
     sections = re.split(r'\n\s*\n', text)
     chunks = []
     current_chunk = ""
+    head_tokens = 0
+    tail = ""
     
     for section in sections:
         section = section.strip()
@@ -502,28 +759,35 @@ def chunk_text_improved(text, max_tokens=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
             continue
         
         # Check if adding this section would exceed token limit
-        test_chunk = current_chunk + '\n\n' + section if current_chunk else section
+        addition = '\n\n' + section if current_chunk else section
+        test_tokens, new_head_tokens, new_tail = _extend_token_count(head_tokens, tail, addition)
         
-        if count_tokens(test_chunk) <= max_tokens:
-            current_chunk = test_chunk
+        if test_tokens <= max_tokens:
+            current_chunk += addition
+            head_tokens, tail = new_head_tokens, new_tail
         else:
             # Save current chunk if it exists
             if current_chunk:
                 chunks.append(current_chunk)
             
             # If section itself is too long, split it further
-            if count_tokens(section) > max_tokens:
-                # Split by sentences or tokens
-                tokens = tokenizer.encode(section)
+            tokens = tokenizer.encode(section)
+            if len(tokens) > max_tokens:
+                # Split by tokens with overlap
                 start = 0
                 while start < len(tokens):
                     end = min(start + max_tokens, len(tokens))
                     chunk_tokens = tokens[start:end]
                     chunk_text = tokenizer.decode(chunk_tokens)
                     chunks.append(chunk_text)
-                    start = end - overlap
+                    if end == len(tokens):
+                        break
+                    start = max(end - overlap, start + 1)
+                current_chunk = ""
+                head_tokens, tail = 0, ""
             else:
                 current_chunk = section
+                _, head_tokens, tail = _extend_token_count(0, "", section)
     
     # Add final chunk
     if current_chunk:
@@ -531,8 +795,62 @@ def chunk_text_improved(text, max_tokens=CHUNK_SIZE, overlap=CHUNK_OVERLAP):
     
     return chunks if chunks else [text]
 
-def build_faiss_index(chunks, model):
-    """Build FAISS index for chunks with error handling"""
+def chunk_resume_sections(text, max_tokens=SECTION_CHUNK_TOKENS):
+    """Chunk a resume along its sections, most relevant section types first
+    
+    Whole sections, each starting with its title, are packed into chunks of
+    up to ``max_tokens``, so chunk boundaries always fall between sections
+    and every chunk says which sections it holds. Sections longer than
+    ``max_tokens`` are split with ``chunk_text_improved``. Resumes without
+    recognisable headings fall back to ``chunk_text_improved``.
+    """
+    sections = split_resume_sections(text)
+    if not sections:
+        return chunk_text_improved(text)
+    
+    # Merge repeated headings (e.g. Experience continued on the next page), keeping document order
+    bodies = defaultdict(list)
+    for section_type, body in sections:
+        bodies[section_type].append(body)
+    
+    pieces = []
+    for section_type in sorted(bodies, key=SECTION_PRIORITY.index):
+        body = '\n\n'.join(bodies[section_type])
+        if section_type == 'header' and count_tokens(body) <= SECTION_HEADER_MAX_TOKENS:
+            continue
+        
+        title = SECTION_TITLES[section_type]
+        section_text = f"{title}\n{body}"
+        if count_tokens(section_text) <= max_tokens:
+            pieces.append(section_text)
+        else:
+            body_tokens = max_tokens - count_tokens(title + '\n')
+            for piece in chunk_text_improved(body, body_tokens, min(CHUNK_OVERLAP, body_tokens // 2)):
+                pieces.append(f"{title}\n{piece}")
+    
+    chunks = []
+    for piece in pieces:
+        if chunks and count_tokens(chunks[-1] + '\n\n' + piece) <= max_tokens:
+            chunks[-1] += '\n\n' + piece
+        else:
+            chunks.append(piece)
+    
+    return chunks if chunks else chunk_text_improved(text)
+
+def chunk_resume_text(text):
+    """Chunk a resume for embedding according to CHUNKING_STRATEGY, capped at MAX_CHUNKS_TO_PROCESS"""
+    with stage_seconds.time(stage='chunking'):
+        if CHUNKING_STRATEGY == 'sections':
+            chunks = chunk_resume_sections(text)
+        else:
+            chunks = chunk_text_improved(text)
+    return chunks[:MAX_CHUNKS_TO_PROCESS]
+
+def build_faiss_index(chunks, model, embeddings=None):
+    """Build FAISS index for chunks with error handling
+    
+    Pass ``embeddings`` (e.g. from the resume embedding store) to skip encoding.
+    """
     try:
         if not chunks:
             return None, None
@@ -542,10 +860,13 @@ def build_faiss_index(chunks, model):
             chunks = chunks[:MAX_CHUNKS_TO_PROCESS]
             logger.info(f"Limited processing to {MAX_CHUNKS_TO_PROCESS} chunks")
         
-        embeddings = model.encode(chunks, convert_to_tensor=False, show_progress_bar=False)
-        dim = len(embeddings[0])
-        index = faiss.IndexFlatL2(dim)
-        index.add(np.array(embeddings).astype("float32"))
+        if embeddings is None:
+            with stage_seconds.time(stage='embedding'):
+                embeddings = model.encode(chunks, convert_to_tensor=False, show_progress_bar=False)
+        with stage_seconds.time(stage='index_build'):
+            dim = len(embeddings[0])
+            index = faiss.IndexFlatL2(dim)
+            index.add(np.array(embeddings).astype("float32"))
         return index, embeddings
         
     except Exception as e:
@@ -558,14 +879,158 @@ def retrieve_chunks(query, chunks, index, model, k=3):
         if index is None or not chunks:
             return []
         
-        query_vec = model.encode([query], convert_to_tensor=False, show_progress_bar=False)
-        D, I = index.search(np.array(query_vec).astype("float32"), k)
-        return [chunks[i] for i in I[0] if i < len(chunks)]
+        with stage_seconds.time(stage='embedding'):
+            query_vec = model.encode([query], convert_to_tensor=False, show_progress_bar=False)
+        with stage_seconds.time(stage='faiss_search'):
+            D, I = index.search(np.array(query_vec).astype("float32"), k)
+        # FAISS pads with -1 when the index holds fewer than k vectors
+        return [chunks[i] for i in I[0] if 0 <= i < len(chunks)]
         
     except Exception as e:
         logger.error(f"Error retrieving chunks: {str(e)}")
         return chunks[:k] if len(chunks) >= k else chunks
 
+def encode_texts(texts, model, batch_size=EMBED_BATCH_SIZE):
+    """Encode texts in large batches into a float32 matrix"""
+    with stage_seconds.time(stage='embedding'):
+        embeddings = model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_tensor=False,
+            show_progress_bar=False
+        )
+    return np.asarray(embeddings, dtype="float32")
+
+def resume_content_key(resume_text):
+    """Content hash identifying a resume's extracted text"""
+    return hash_bytes(resume_text.encode('utf-8'))
+
+def embed_resume_chunks(resume_texts, model, resume_names=None):
+    """Chunk and embed resumes, reusing vectors from the resume embedding store
+    
+    Returns a ``(chunks, vectors)`` pair per resume. Resumes already in the
+    store cost no chunking or embedding work; all the others are encoded
+    together in one batched call and then added to the store. Every resume
+    seen here is also added to the global candidate index.
+    """
+    results = [None] * len(resume_texts)
+    keys = [resume_content_key(resume_text) for resume_text in resume_texts]
+    pending = []  # (position, key, chunks)
+    
+    for pos, (key, resume_text) in enumerate(zip(keys, resume_texts)):
+        stored = resume_embedding_store.get(key)
+        if stored is not None:
+            results[pos] = stored
+            continue
+        
+        chunks = chunk_resume_text(resume_text)
+        pending.append((pos, key, chunks))
+    
+    if pending:
+        all_chunks = [chunk for _, _, chunks in pending for chunk in chunks]
+        all_vectors = encode_texts(all_chunks, model) if all_chunks else None
+        logger.info(f"Embedded {len(all_chunks)} chunks for {len(pending)} new resumes")
+        
+        start = 0
+        for pos, key, chunks in pending:
+            vectors = all_vectors[start:start + len(chunks)] if chunks else np.zeros((0, 0), dtype="float32")
+            start += len(chunks)
+            resume_embedding_store.put(key, chunks, vectors)
+            results[pos] = (chunks, vectors)
+    
+    new_candidates = []
+    for pos, key in enumerate(keys):
+        if key not in candidate_index:
+            chunks, vectors = results[pos]
+            name = resume_names[pos] if resume_names else key[:12]
+            new_candidates.append((key, name, chunks, vectors))
+    
+    if new_candidates:
+        try:
+            candidate_index.add_many(new_candidates)
+        except Exception as e:
+            logger.error(f"Could not add resumes to candidate index: {str(e)}")
+    
+    return results
+
+def batch_retrieve_chunks(resume_chunk_sets, queries, model, k=3, query_vectors=None):
+    """Retrieve the top-k chunks of every resume for every query in one pass
+    
+    ``resume_chunk_sets`` holds a ``(chunks, vectors)`` pair per resume as
+    returned by ``embed_resume_chunks``. Every query is embedded exactly once
+    (or not at all when ``query_vectors`` is given), then all retrievals are
+    answered from a single (chunks x queries) distance matrix ranked the same
+    way as ``faiss.IndexFlatL2``.
+    
+    Returns ``(retrievals, similarities)``: ``retrievals[r][q]`` holds the
+    chunks of resume ``r`` retrieved for query ``q`` and ``similarities[r, q]``
+    is the best cosine similarity between query ``q`` and any chunk of resume
+    ``r`` (``-inf`` for resumes without chunks).
+    """
+    results = [[[] for _ in queries] for _ in resume_chunk_sets]
+    similarities = np.full((len(resume_chunk_sets), len(queries)), -np.inf, dtype="float32")
+    
+    flat_chunks = []
+    vector_blocks = []
+    offsets = [0]
+    for chunks, vectors in resume_chunk_sets:
+        if chunks:
+            flat_chunks.extend(chunks)
+            vector_blocks.append(vectors)
+        offsets.append(len(flat_chunks))
+    
+    if not flat_chunks or not queries:
+        return results, similarities
+    
+    chunk_vecs = np.vstack(vector_blocks).astype("float32", copy=False)
+    query_vecs = query_vectors if query_vectors is not None else encode_texts(queries, model)
+    search_started = time.perf_counter()
+    
+    chunk_sq_norms = np.einsum('ij,ij->i', chunk_vecs, chunk_vecs)
+    query_sq_norms = np.einsum('ij,ij->i', query_vecs, query_vecs)
+    dots = chunk_vecs @ query_vecs.T
+    
+    # Squared L2 distance: |c|^2 + |q|^2 - 2 c.q
+    distances = chunk_sq_norms[:, None] + query_sq_norms[None, :] - 2.0 * dots
+    cosines = dots / np.maximum(
+        np.sqrt(chunk_sq_norms)[:, None] * np.sqrt(query_sq_norms)[None, :], 1e-12
+    )
+    
+    for r in range(len(resume_chunk_sets)):
+        start, end = offsets[r], offsets[r + 1]
+        if start == end:
+            continue
+        
+        top_k = min(k, end - start)
+        order = np.argsort(distances[start:end], axis=0, kind='stable')[:top_k]
+        for q in range(len(queries)):
+            results[r][q] = [flat_chunks[start + i] for i in order[:, q]]
+        similarities[r] = cosines[start:end].max(axis=0)
+    
+    stage_seconds.observe(time.perf_counter() - search_started, stage='faiss_search')
+    return results, similarities
+
+def select_pairs_for_llm(similarities, top_n=None, threshold=None):
+    """Pick the (resume, JD) pairs worth a full LLM scoring pass
+    
+    ``similarities`` is the resumes x JDs matrix from ``batch_retrieve_chunks``.
+    Pairs below ``threshold`` are dropped, then at most ``top_n`` of the
+    remaining resumes are kept per JD. With neither set every pair is kept.
+    """
+    selected = np.isfinite(similarities)
+    
+    if threshold is not None:
+        selected &= similarities >= threshold
+    
+    if top_n is not None:
+        ranked = np.where(selected, similarities, -np.inf)
+        order = np.argsort(-ranked, axis=0, kind='stable')
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(len(similarities))[:, None], axis=0)
+        selected &= ranks < top_n
+    
+    return selected
+
 def create_scoring_prompt(jd_text, resume_chunks):
     """Create a concise scoring prompt"""
     # Combine chunks intelligently
@@ -591,6 +1056,11 @@ Score (0-100): """
     
     return prompt
 
+def parse_score_only_response(response):
+    """Return the integer score opening a score-only generation (clamped to 0-100), or None"""
+    match = re.match(r'\s*(\d{1,3})', response)
+    return float(min(100, int(match.group(1)))) if match else None
+
 def extract_score_from_response(response):
     """Extract score and reasoning from LLM response"""
     try:
@@ -628,47 +1098,213 @@ def extract_score_from_response(response):
         logger.error(f"Error extracting score: {str(e)}")
         return 50.0, response
 
-def process_resume_jd_matching(resume_text, jd_text, resume_name):
-    """Process a single resume against a job description"""
+def generate_llm_response(prompt, score_only=False, **generation_kwargs):
+    """Run the LLM on a prompt, recording latency and token counts
+    
+    ``generation_kwargs`` override LLM_GENERATION_KWARGS. With ``score_only``
+    generation stops at the end of the first integer (SCORE_ONLY_GENERATION_KWARGS).
+    """
+    llm_prompt_tokens.observe(count_tokens(prompt))
+    llm_generations_in_flight.inc()
+    try:
+        with stage_seconds.time(stage='llm_generate'):
+            if not score_only:
+                response = llm_model(prompt, **dict(LLM_GENERATION_KWARGS, **generation_kwargs))
+            elif isinstance(llm_model, LLMWorkerPool):
+                response = llm_model.generate_score(prompt, **SCORE_ONLY_GENERATION_KWARGS)
+            elif isinstance(llm_model, SerializedModel):
+                # Hold the lock for the whole stream, not just for starting it
+                with llm_model.lock:
+                    response = generate_score_only(llm_model.model, prompt, **SCORE_ONLY_GENERATION_KWARGS)
+            else:
+                response = generate_score_only(llm_model, prompt, **SCORE_ONLY_GENERATION_KWARGS)
+    finally:
+        llm_generations_in_flight.dec()
+    
+    llm_completion_tokens.observe(count_tokens(response))
+    return response
+
+def create_packed_scoring_prompt(jd_text, resume_chunk_lists, include_reasoning=False):
+    """Create one prompt scoring several resumes against the same job description
+    
+    The job text and instructions are written once per pack instead of once
+    per pair, so the LLM evaluates them once for every resume in the pack.
+    Without ``include_reasoning`` each answer line is just "[n] score".
+    """
+    candidates = "\n".join(
+        f"[{n}] {' '.join(chunks)[:300]}..." for n, chunks in enumerate(resume_chunk_lists, 1)
+    )
+    
+    answer_format = "[n] score - reason" if include_reasoning else "[n] score"
+    
+    return f"""Job: {jd_text[:200]}...
+
+Candidates:
+{candidates}
+
+Score each candidate's match to the job (0-100), one line each as "{answer_format}":
+[1] """
+
+PACKED_SCORE_PATTERN = re.compile(r'\[(\d+)\][ \t:]*(\d{1,3})\b[ \t]*[-:\u2013]?[ \t]*([^\n\[]*)')
+
+def extract_packed_scores(response, count):
+    """Parse "[n] score - reason" lines into ``{n: (score, reason)}`` for candidates 1..count"""
+    # The prompt ends with "[1] ", so the first line arrives without its label
+    text = "[1] " + response.strip()
+    scores = {}
+    for match in PACKED_SCORE_PATTERN.finditer(text):
+        n = int(match.group(1))
+        if 1 <= n <= count and n not in scores:
+            scores[n] = (float(min(100, int(match.group(2)))), match.group(3).strip())
+    return scores
+
+def packed_answer_tokens(count, include_reasoning=False):
+    """Generation budget for the answer lines of ``count`` packed resumes"""
+    per_candidate = PACKED_TOKENS_PER_CANDIDATE if include_reasoning else PACKED_SCORE_ONLY_TOKENS_PER_CANDIDATE
+    return per_candidate * count
+
+def packed_prompt_fits(jd_text, resume_chunk_lists, include_reasoning=False):
+    """Whether a packed prompt and its answer lines fit the prompt budget and the context window"""
+    prompt_tokens = count_tokens(create_packed_scoring_prompt(jd_text, resume_chunk_lists, include_reasoning))
+    answer_tokens = packed_answer_tokens(len(resume_chunk_lists), include_reasoning)
+    return prompt_tokens <= MAX_CONTEXT_TOKENS and prompt_tokens + answer_tokens <= LLM_MODEL_KWARGS['context_length']
+
+def plan_resume_packs(jd_text, candidates, pack_size, include_reasoning=False):
+    """Group ``candidates`` (each ending with its top chunks) into packs that fit one prompt"""
+    packs = []
+    current = []
+    for candidate in candidates:
+        trial = current + [candidate]
+        fits = packed_prompt_fits(jd_text, [c[-1] for c in trial], include_reasoning)
+        if current and (len(trial) > pack_size or not fits):
+            packs.append(current)
+            trial = [candidate]
+        current = trial
+    
+    if current:
+        packs.append(current)
+    return packs
+
+def score_resume_pack(jd_text, pack, include_reasoning=False):
+    """LLM-score several resumes against one job description with a single prompt
+    
+    ``pack`` is a list of ``(resume_name, resume_text, top_chunks)``. Returns
+    one result per resume, in order. Resumes whose score line is missing
+    from the response are scored on their own with the per-pair prompt.
+    Without ``include_reasoning`` only the scores are generated.
+    """
+    try:
+        prompt = create_packed_scoring_prompt(jd_text, [chunks for _, _, chunks in pack], include_reasoning)
+        response = generate_llm_response(prompt, max_new_tokens=packed_answer_tokens(len(pack), include_reasoning))
+        scores = extract_packed_scores(response, len(pack))
+    except Exception as e:
+        logger.error(f"Packed scoring of {len(pack)} resumes failed: {str(e)}")
+        scores = {}
+    
+    results = []
+    for n, (resume_name, resume_text, top_chunks) in enumerate(pack, 1):
+        if n not in scores:
+            logger.info(f"No packed score for {resume_name}, scoring it on its own")
+            results.append(process_resume_jd_matching(
+                resume_text, jd_text, resume_name,
+                top_chunks=top_chunks, include_reasoning=include_reasoning
+            ))
+            continue
+        
+        score, reasoning = scores[n]
+        result = {
+            'score': score,
+            'reasoning': reasoning if include_reasoning else "",
+            'chunks_used': len(top_chunks),
+            'llm_pack_size': len(pack)
+        }
+        variant = PACKED_CACHE_VARIANT if include_reasoning else PACKED_SCORE_ONLY_CACHE_VARIANT
+        score_cache.put(score_cache.key_for(resume_text, jd_text, variant), result)
+        results.append(dict(result, resume_name=resume_name, llm_scored=True, cached=False))
+    
+    return results
+
+def process_resume_jd_matching(resume_text, jd_text, resume_name, top_chunks=None, include_reasoning=False):
+    """Process a single resume against a job description
+    
+    When ``top_chunks`` is given (e.g. from ``batch_retrieve_chunks``) the
+    chunking, embedding and retrieval steps are skipped. Unless
+    ``include_reasoning`` is set, the LLM only generates the score and
+    ``reasoning`` is empty.
+    """
     try:
         if resume_text.startswith("ERROR_") or resume_text == "EMPTY_FILE" or resume_text == "EMPTY_CONTENT":
             return {
                 'resume_name': resume_name,
                 'score': 0.0,
                 'reasoning': f"Error processing resume: {resume_text}",
-                'chunks_used': 0
+                'chunks_used': 0,
+                'llm_scored': False
             }
         
-        # Chunk the resume
-        chunks = chunk_text_improved(resume_text)
-        logger.info(f"Created {len(chunks)} chunks for resume: {resume_name}")
+        # Same resume, JD, prompt, model settings and generation mode: reuse the earlier LLM result
+        variant = REASONING_CACHE_VARIANT if include_reasoning else SCORE_ONLY_CACHE_VARIANT
+        cache_key = score_cache.key_for(resume_text, jd_text, variant)
+        cached = score_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached, resume_name=resume_name, llm_scored=True, cached=True)
         
-        # Build index for this resume
-        index, embeddings = build_faiss_index(chunks, embed_model)
-        
-        if index is None:
+        if top_chunks is None:
+            # Chunk and embed the resume, or reuse its stored vectors
+            chunks, embeddings = embed_resume_chunks([resume_text], embed_model, [resume_name])[0]
+            logger.info(f"Using {len(chunks)} chunks for resume: {resume_name}")
+            
+            # Build index for this resume
+            index, embeddings = build_faiss_index(chunks, embed_model, embeddings=embeddings)
+            
+            if index is None:
+                return {
+                    'resume_name': resume_name,
+                    'score': 0.0,
+                    'reasoning': "Failed to build search index",
+                    'chunks_used': 0,
+                    'llm_scored': False
+                }
+            
+            # Retrieve relevant chunks based on job description
+            top_chunks = retrieve_chunks(jd_text, chunks, index, embed_model, k=3)
+        elif not top_chunks:
             return {
                 'resume_name': resume_name,
                 'score': 0.0,
                 'reasoning': "Failed to build search index",
-                'chunks_used': 0
+                'chunks_used': 0,
+                'llm_scored': False
             }
         
-        # Retrieve relevant chunks based on job description
-        top_chunks = retrieve_chunks(jd_text, chunks, index, embed_model, k=3)
-        
         # Create scoring prompt
         prompt = create_scoring_prompt(jd_text, top_chunks)
         
-        # Generate response
-        response = llm_model(prompt, max_new_tokens=64, temperature=0.1)
-        score, reasoning = extract_score_from_response(response)
+        # Generate just the score, unless the client asked for the reasoning
+        score = None
+        if not include_reasoning:
+            score = parse_score_only_response(generate_llm_response(prompt, score_only=True))
+            reasoning = ""
+            if score is None:
+                logger.info(f"No score-only answer for {resume_name}, generating with reasoning")
+        
+        if score is None:
+            response = generate_llm_response(prompt)
+            score, reasoning = extract_score_from_response(response)
+        
+        score_cache.put(cache_key, {
+            'score': score,
+            'reasoning': reasoning,
+            'chunks_used': len(top_chunks)
+        })
         
         return {
             'resume_name': resume_name,
             'score': score,
             'reasoning': reasoning,
-            'chunks_used': len(top_chunks)
+            'chunks_used': len(top_chunks),
+            'llm_scored': True,
+            'cached': False
         }
         
     except Exception as e:
@@ -677,20 +1313,656 @@ def process_resume_jd_matching(resume_text, jd_text, resume_name):
             'resume_name': resume_name,
             'score': 0.0,
             'reasoning': f"Error processing: {str(e)}",
-            'chunks_used': 0
+            'chunks_used': 0,
+            'llm_scored': False
         }
 
+def embed_resume_entries(resume_entries):
+    """``(chunks, vectors)`` for every ``(resume_name, resume_text)``; resumes that failed extraction get none"""
+    valid = [
+        i for i, (_, text) in enumerate(resume_entries)
+        if not (text.startswith("ERROR_") or text in ("EMPTY_FILE", "EMPTY_CONTENT"))
+    ]
+    chunk_sets = [([], None)] * len(resume_entries)
+    embedded = embed_resume_chunks(
+        [resume_entries[i][1] for i in valid],
+        embed_model,
+        [resume_entries[i][0] for i in valid]
+    )
+    for i, chunk_set in zip(valid, embedded):
+        chunk_sets[i] = chunk_set
+    return chunk_sets
+
+def score_by_embeddings(resume_entries, job_descriptions):
+    """Score every (resume, JD) pair from embedding similarities alone, without the LLM
+    
+    Each JD is split into requirements (its bullet lines), and every
+    requirement is matched with its most similar chunk of every resume. All
+    requirements of all JDs are embedded in one call and compared with all
+    chunks in one matrix product; resume chunks come from the embedding
+    store. The score is the weighted share of requirements covered, scaled
+    to 0-100 (see ``embedding_scoring``). Returns a resumes x JDs nested
+    list of result dicts, each with its per-requirement ``requirements_coverage``.
+    """
+    chunk_sets = embed_resume_entries(resume_entries)
+    requirement_lists = [extract_requirements(jd) for jd in job_descriptions]
+    requirement_vectors = encode_texts([text for requirements in requirement_lists for text, _ in requirements], embed_model)
+    
+    with stage_seconds.time(stage='embedding_scoring'):
+        coverage = requirement_coverage(chunk_sets, requirement_vectors)
+        bounds = np.cumsum([0] + [len(requirements) for requirements in requirement_lists])
+        scores = np.column_stack([
+            similarity_scores(coverage[:, start:end], [weight for _, weight in requirements])
+            for requirements, start, end in zip(requirement_lists, bounds[:-1], bounds[1:])
+        ])
+    
+    results = []
+    for i, (resume_name, resume_text) in enumerate(resume_entries):
+        chunks, _ = chunk_sets[i]
+        row = []
+        for j, requirements in enumerate(requirement_lists):
+            if not chunks:
+                failed = resume_text.startswith("ERROR_") or resume_text in ("EMPTY_FILE", "EMPTY_CONTENT")
+                row.append({
+                    'resume_name': resume_name,
+                    'score': 0.0,
+                    'reasoning': f"Error processing resume: {resume_text}" if failed else "No resume content to compare",
+                    'chunks_used': 0,
+                    'llm_scored': False,
+                    'scoring_mode': 'embedding'
+                })
+                continue
+            
+            report = coverage_report(requirements, coverage[i, bounds[j]:bounds[j + 1]])
+            row.append({
+                'resume_name': resume_name,
+                'score': round(float(scores[i, j]), 1),
+                'reasoning': summarize_coverage(report),
+                'chunks_used': len(chunks),
+                'llm_scored': False,
+                'scoring_mode': 'embedding',
+                'requirements_coverage': report,
+                'cached': False
+            })
+        results.append(row)
+    
+    return results
+
+def embed_resume_version(resume_text, content_key, previous_key=None):
+    """Chunk and embed one resume version, reusing the vectors of chunks unchanged since ``previous_key``
+    
+    Returns ``(chunks, vectors, chunks_embedded)``. A version already in the
+    resume embedding store costs nothing.
+    """
+    stored = resume_embedding_store.get(content_key)
+    if stored is not None:
+        return stored[0], stored[1], 0
+    
+    chunks = chunk_resume_text(resume_text)
+    previous = resume_embedding_store.get(previous_key) if previous_key else None
+    known = dict(zip(previous[0], previous[1])) if previous is not None else {}
+    new_chunks = [chunk for chunk in dict.fromkeys(chunks) if chunk not in known]
+    if new_chunks:
+        known.update(zip(new_chunks, encode_texts(new_chunks, embed_model)))
+    logger.info(f"Embedded {len(new_chunks)}/{len(chunks)} chunks for resume version {content_key[:12]}")
+    
+    vectors = np.array([known[chunk] for chunk in chunks], dtype="float32")
+    resume_embedding_store.put(content_key, chunks, vectors)
+    return chunks, vectors, len(new_chunks)
+
+def ingest_candidate(file, candidate_id=None, name=None):
+    """Extract, section, chunk and embed an uploaded resume once and record it as a candidate version
+    
+    An upload whose file or extracted text matches the candidate's current
+    version changes nothing. Without ``candidate_id``, a resume whose text
+    is already some candidate's current version is reported as a duplicate
+    of that candidate. A new version re-embeds only the chunks that changed.
+    Returns the candidate with the ingest ``status`` (created, updated,
+    unchanged or duplicate) and ``chunks_embedded``.
+    """
+    existing = candidate_store.get(candidate_id) if candidate_id else None
+    name = name or (existing['name'] if existing else file.filename)
+    
+    file_hash = hash_upload(file)
+    if existing is not None and existing['file_hash'] == file_hash:
+        return dict(existing, status='unchanged', chunks_embedded=0)
+    
+    resume_text = extract_text_from_pdf(file, SCORING_EXTRACTION_MODE)
+    if resume_text.startswith("ERROR_") or resume_text in ("EMPTY_FILE", "EMPTY_CONTENT"):
+        raise ValueError(f"Could not extract text from {file.filename}: {resume_text}")
+    
+    content_key = resume_content_key(resume_text)
+    if existing is not None and existing['content_key'] == content_key:
+        return dict(existing, status='unchanged', chunks_embedded=0)
+    if candidate_id is None:
+        duplicate = candidate_store.find_by_content(content_key)
+        if duplicate is not None:
+            return dict(candidate_store.get(duplicate), status='duplicate', chunks_embedded=0)
+    
+    if candidate_store.get_content(content_key) is None:
+        candidate_store.put_content(content_key, resume_text, split_resume_sections(resume_text))
+    previous_key = existing['content_key'] if existing else None
+    chunks, vectors, chunks_embedded = embed_resume_version(resume_text, content_key, previous_key)
+    candidate_id, _ = candidate_store.add_version(candidate_id, name, file_hash, content_key)
+    
+    # The search index holds current versions only
+    candidate_index.add(content_key, name, chunks, vectors)
+    if previous_key and not candidate_store.find_by_content(previous_key):
+        candidate_index.remove(previous_key)
+    
+    return dict(
+        candidate_store.get(candidate_id),
+        status='updated' if existing else 'created',
+        chunks=len(chunks),
+        chunks_embedded=chunks_embedded
+    )
+
+def load_candidate_resumes(candidate_ids):
+    """``(resume_name, resume_text)`` of each candidate's current version; returns ``(entries, error)``"""
+    entries = []
+    for candidate_id in candidate_ids:
+        candidate = candidate_store.get(candidate_id)
+        content = candidate_store.get_content(candidate['content_key']) if candidate else None
+        if content is None:
+            return None, f"Unknown candidate: {candidate_id}"
+        entries.append((candidate['name'], content[0]))
+    return entries, None
+
+def match_skills(resume_entries, job_descriptions):
+    """Keyword coverage of the JD skill requirements for every pair, or None if it fails"""
+    try:
+        with stage_seconds.time(stage='skill_matching'):
+            return SkillMatch(
+                [
+                    "" if text.startswith("ERROR_") or text in ("EMPTY_FILE", "EMPTY_CONTENT") else text
+                    for _, text in resume_entries
+                ],
+                job_descriptions
+            )
+    except Exception as e:
+        logger.error(f"Skill matching failed: {str(e)}")
+        return None
+
+def parse_batch_request(req, upload_dir=None):
+    """Read resumes, job descriptions and prefilter options from a batch request
+    
+    Resumes are extracted right away so the batch no longer depends on the
+    uploaded files. Returns ``(batch, error)`` where ``batch`` holds the
+    keyword arguments for ``iter_batch_results``. With ``upload_dir`` the
+    resumes are not extracted: each is copied there and listed as
+    ``[name, path]`` under ``resume_files``, ahead of ``resume_entries``,
+    for ``run_batch_job`` to extract.
+    """
+    resumes = []
+    job_descriptions = []
+    
+    # Optional similarity prefilter before LLM scoring
+    rerank_top_n, error = parse_number(req.form, 'rerank_top_n', int, minimum=1)
+    if error:
+        return None, error
+    similarity_threshold, error = parse_number(req.form, 'similarity_threshold', float, minimum=-1.0, maximum=1.0)
+    if error:
+        return None, error
+    # Optional keyword prefilter: share of the JD's skill requirements the resume names (0-1)
+    min_skill_coverage, error = parse_number(req.form, 'min_skill_coverage', float, minimum=0.0, maximum=1.0)
+    if error:
+        return None, error
+    
+    # Resumes per LLM prompt (JD-major packed scoring); defaults to LLM_PACK_SIZE
+    pack_size, error = parse_number(req.form, 'llm_pack_size', int, minimum=1)
+    if error:
+        return None, error
+    include_reasoning = req.form.get('include_reasoning', 'false').lower() == 'true'
+    scoring_mode = req.form.get('scoring_mode', 'llm')
+    if scoring_mode not in SCORING_MODES:
+        return None, f"Unsupported scoring mode: {scoring_mode} (expected: {', '.join(SCORING_MODES)})"
+    
+    # Extract resume files
+    for key in req.files:
+        if key.startswith('resume_'):
+            resumes.append(req.files[key])
+    
+    # Ingested candidates (POST /api/candidates), scored after the uploaded resumes
+    candidate_ids = [
+        candidate_id.strip()
+        for value in req.form.getlist('candidate_ids')
+        for candidate_id in value.split(',')
+        if candidate_id.strip()
+    ]
+    
+    # Extract job descriptions (text format for batch processing)
+    for key in req.form:
+        if key.startswith('job_description_'):
+            jd_text = format_job_description_text(req.form[key])
+            if count_tokens(jd_text) > MAX_JD_TOKENS:
+                jd_text = truncate_text(jd_text, MAX_JD_TOKENS)
+            job_descriptions.append(jd_text)
+    
+    # Also check for JD files in batch processing
+    for key in req.files:
+        if key.startswith('job_description_file_'):
+            jd_file = req.files[key]
+            jd_text = extract_text_from_pdf(jd_file, SCORING_EXTRACTION_MODE)
+            jd_file.close()
+            if not jd_text.startswith("ERROR_") and jd_text != "EMPTY_CONTENT":
+                jd_text = format_job_description_text(jd_text)
+                if count_tokens(jd_text) > MAX_JD_TOKENS:
+                    jd_text = truncate_text(jd_text, MAX_JD_TOKENS)
+                job_descriptions.append(jd_text)
+    
+    if not resumes and not candidate_ids:
+        return None, 'No resume files provided'
+    
+    if not job_descriptions:
+        return None, 'No job descriptions provided'
+    
+    candidate_entries, error = load_candidate_resumes(candidate_ids)
+    if error:
+        return None, error
+    
+    if upload_dir is not None:
+        resume_files = []
+        for resume_file in resumes:
+            resume_files.append([resume_file.filename, save_upload(resume_file, upload_dir)])
+            resume_file.close()
+        resume_entries = []
+    else:
+        # Extract every resume once
+        logger.info(f"Extracting {len(resumes)} resumes")
+        resume_texts = extract_texts_from_pdfs(resumes, SCORING_EXTRACTION_MODE) if resumes else []
+        resume_entries = [(resume_file.filename, text) for resume_file, text in zip(resumes, resume_texts)]
+    
+    batch = {
+        'resume_entries': resume_entries + candidate_entries,
+        'candidate_ids': [None] * len(resumes) + candidate_ids,
+        'job_descriptions': job_descriptions,
+        'rerank_top_n': rerank_top_n,
+        'similarity_threshold': similarity_threshold,
+        'min_skill_coverage': min_skill_coverage,
+        'pack_size': pack_size,
+        'include_reasoning': include_reasoning,
+        'scoring_mode': scoring_mode
+    }
+    if upload_dir is not None:
+        batch['resume_files'] = resume_files
+    return batch, None
+
+def iter_batch_results(resume_entries, job_descriptions, rerank_top_n=None,
+                       similarity_threshold=None, skip_pairs=None, pack_size=None,
+                       include_reasoning=False, scoring_mode='llm', min_skill_coverage=None,
+                       candidate_ids=None):
+    """Score every (resume, JD) pair, yielding ``(pair_index, result)`` as each finishes
+    
+    ``resume_entries`` is a list of ``(resume_name, resume_text)`` and
+    ``pair_index = i * len(job_descriptions) + j``. Pairs listed in
+    ``skip_pairs`` (already finished by an earlier run) are not scored again.
+    
+    Pairs are scored resume-major, one prompt each, unless ``pack_size``
+    (default LLM_PACK_SIZE) is above 1: then they are scored JD-major with up
+    to ``pack_size`` resumes per prompt, and results arrive grouped by JD.
+    Per-pair scoring generates only the score unless ``include_reasoning``.
+    With ``scoring_mode='embedding'`` no pair reaches the LLM: every pair is
+    scored by ``score_by_embeddings`` and the prefilter options are ignored.
+    
+    Every result carries its ``skill_match`` (keyword coverage of the JD's
+    skill requirements); pairs below ``min_skill_coverage`` are not LLM-scored.
+    ``candidate_ids`` (aligned with ``resume_entries``, None for uploads) is
+    copied into the results of ingested candidates.
+    """
+    skip_pairs = skip_pairs or set()
+    skills = match_skills(resume_entries, job_descriptions)
+    
+    if scoring_mode == 'embedding':
+        for i, row in enumerate(score_by_embeddings(resume_entries, job_descriptions)):
+            for j, result in enumerate(row):
+                pair_index = i * len(job_descriptions) + j
+                if pair_index in skip_pairs:
+                    continue
+                jd = job_descriptions[j]
+                result['similarity'] = None
+                result['skill_match'] = skills.report(i, j) if skills else None
+                result['job_description'] = jd[:100] + "..." if len(jd) > 100 else jd
+                if candidate_ids and candidate_ids[i]:
+                    result['candidate_id'] = candidate_ids[i]
+                yield pair_index, result
+        return
+    
+    # Embed new resumes and all JDs in batch and retrieve for every pair at once
+    try:
+        chunk_sets = embed_resume_entries(resume_entries)
+        retrievals, similarities = batch_retrieve_chunks(chunk_sets, job_descriptions, embed_model, k=3)
+    except Exception as e:
+        logger.error(f"Batched retrieval failed, falling back to per-pair retrieval: {str(e)}")
+        retrievals = [[None] * len(job_descriptions) for _ in resume_entries]
+        similarities = None
+    
+    # First stage: only pairs that pass the similarity filter reach the LLM
+    if similarities is not None and (rerank_top_n is not None or similarity_threshold is not None):
+        llm_pairs = select_pairs_for_llm(similarities, rerank_top_n, similarity_threshold)
+        logger.info(f"Similarity prefilter kept {int(llm_pairs.sum())}/{llm_pairs.size} pairs for LLM scoring")
+    else:
+        llm_pairs = None
+    
+    # Keyword prefilter; JDs without skill requirements (NaN coverage) let every pair through
+    if skills is not None and min_skill_coverage is not None:
+        skill_pairs = ~(skills.pair_coverage < min_skill_coverage)
+        logger.info(f"Skill prefilter kept {int(skill_pairs.sum())}/{skill_pairs.size} pairs for LLM scoring")
+    else:
+        skill_pairs = None
+    
+    def finish(i, j, result):
+        jd = job_descriptions[j]
+        result['similarity'] = similarity_of(i, j)
+        result['skill_match'] = skills.report(i, j) if skills else None
+        result['job_description'] = jd[:100] + "..." if len(jd) > 100 else jd
+        if candidate_ids and candidate_ids[i]:
+            result['candidate_id'] = candidate_ids[i]
+        return i * len(job_descriptions) + j, result
+    
+    def similarity_of(i, j):
+        if similarities is not None and np.isfinite(similarities[i, j]):
+            return round(float(similarities[i, j]), 4)
+        return None
+    
+    def prefilter_reason(i, j):
+        """Why the pair is kept from the LLM, or None if it goes to the LLM"""
+        if skill_pairs is not None and not skill_pairs[i, j]:
+            coverage = round(float(skills.pair_coverage[i, j]), 4)
+            return f"Not LLM-scored: skill coverage {coverage} is below {min_skill_coverage}"
+        similarity = similarity_of(i, j)
+        if llm_pairs is not None and not llm_pairs[i, j] and similarity is not None:
+            return f"Not LLM-scored: similarity {similarity} did not pass the prefilter"
+        return None
+    
+    def score_pair(i, j):
+        resume_name, resume_text = resume_entries[i]
+        reason = prefilter_reason(i, j)
+        
+        if reason is not None:
+            result = {
+                'resume_name': resume_name,
+                'score': 0.0,
+                'reasoning': reason,
+                'chunks_used': 0,
+                'llm_scored': False
+            }
+        else:
+            logger.info(f"Scoring resume {i+1}/{len(resume_entries)} against JD {j+1}/{len(job_descriptions)}")
+            result = process_resume_jd_matching(
+                resume_text, 
+                job_descriptions[j], 
+                resume_name,
+                top_chunks=retrievals[i][j],
+                include_reasoning=include_reasoning
+            )
+        
+        return [finish(i, j, result)]
+    
+    def already_scored(scored):
+        return [scored]
+    
+    def score_pack(j, pack):
+        logger.info(f"Scoring {len(pack)} resumes in one prompt against JD {j+1}/{len(job_descriptions)}")
+        results = score_resume_pack(
+            job_descriptions[j],
+            [(name, text, chunks) for _, name, text, chunks in pack],
+            include_reasoning
+        )
+        return [finish(i, j, result) for (i, _, _, _), result in zip(pack, results)]
+    
+    # Cached results that answer a pair: scored packed or on its own, in the same generation mode
+    if include_reasoning:
+        cache_variants = [PACKED_CACHE_VARIANT, REASONING_CACHE_VARIANT]
+    else:
+        cache_variants = [PACKED_SCORE_ONLY_CACHE_VARIANT, SCORE_ONLY_CACHE_VARIANT]
+    
+    pack_size = pack_size or LLM_PACK_SIZE
+    tasks = []
+    if pack_size > 1 and similarities is not None:
+        # JD-major: resumes headed for the LLM are packed several to a prompt per JD
+        for j, jd in enumerate(job_descriptions):
+            candidates = []
+            for i, (resume_name, resume_text) in enumerate(resume_entries):
+                pair_index = i * len(job_descriptions) + j
+                if pair_index in skip_pairs:
+                    continue
+                
+                needs_llm = (
+                    retrievals[i][j]
+                    and prefilter_reason(i, j) is None
+                    and not (resume_text.startswith("ERROR_") or resume_text in ("EMPTY_FILE", "EMPTY_CONTENT"))
+                )
+                if not needs_llm:
+                    tasks.append(partial(score_pair, i, j))
+                    continue
+                
+                # A pair scored earlier, packed or on its own, is not scored again
+                cached = next(filter(None, (
+                    score_cache.get(score_cache.key_for(resume_text, jd, variant)) for variant in cache_variants
+                )), None)
+                if cached is not None:
+                    result = dict(cached, resume_name=resume_name, llm_scored=True, cached=True)
+                    tasks.append(partial(already_scored, finish(i, j, result)))
+                    continue
+                
+                candidates.append((i, resume_name, resume_text, retrievals[i][j]))
+            
+            for pack in plan_resume_packs(jd, candidates, pack_size, include_reasoning):
+                tasks.append(partial(score_pack, j, pack))
+    else:
+        for i in range(len(resume_entries)):
+            for j in range(len(job_descriptions)):
+                if i * len(job_descriptions) + j not in skip_pairs:
+                    tasks.append(partial(score_pair, i, j))
+    
+    # Score all combinations; with an LLM worker pool keep every worker busy
+    for scored in iter_concurrently(tasks, LLM_WORKERS):
+        yield from scored
+
+def iter_concurrently(tasks, workers):
+    """Call each task, yielding results in task order with up to ``workers`` running at once"""
+    if workers <= 1:
+        for task in tasks:
+            yield task()
+        return
+    
+    window = deque()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pair-scorer')
+    try:
+        for task in tasks:
+            window.append(executor.submit(task))
+            if len(window) >= 2 * workers:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+    finally:
+        # Generator closed early (cancelled job / dropped stream): drop queued tasks
+        for future in window:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+def format_stream_event(event, stream_format):
+    """Serialize one streaming event as an NDJSON line or an SSE message (heartbeats as an SSE comment)"""
+    if stream_format == 'sse' and event['type'] == 'heartbeat':
+        return ": keep-alive\n\n"
+    payload = json.dumps(event)
+    if stream_format == 'sse':
+        return f"event: {event['type']}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+def produce_batch_results(batch, upload_dir, events, stop):
+    """Stream producer thread: extract the batch's saved resumes and score it, feeding ``events``
+    
+    Puts ``('result', (pair_index, result))`` items, then ``('done', None)`` or
+    ``('error', message)``. Stops after the current pair once ``stop`` is set.
+    ``upload_dir`` (the saved resumes) is deleted when scoring ends either way.
+    """
+    results = run_batch_job(batch, None)
+    try:
+        for scored in results:
+            if stop.is_set():
+                return
+            events.put(('result', scored))
+        events.put(('done', None))
+    except Exception as e:
+        logger.error(f"Error while streaming batch results: {str(e)}")
+        events.put(('error', str(e)))
+    finally:
+        results.close()
+        shutil.rmtree(upload_dir, ignore_errors=True)
+
+def stream_batch_results(batch, upload_dir, stream_format):
+    """Yield each pair's result as soon as it is scored, plus periodic progress events
+    
+    ``batch`` comes from ``parse_batch_request`` with ``upload_dir``, so
+    the start event goes out before any resume is extracted. Extraction and
+    scoring run in a producer thread; while it has nothing new for
+    STREAM_HEARTBEAT_INTERVAL seconds a heartbeat keeps proxies and clients
+    from timing out the connection. A dropped client stops the producer.
+    """
+    resumes_count = len(batch['candidate_ids'])
+    total = resumes_count * len(batch['job_descriptions'])
+    completed = 0
+    llm_scored_count = 0
+    last_progress = time.monotonic()
+    
+    events = queue.Queue()
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=produce_batch_results, args=(batch, upload_dir, events, stop), name='stream-producer', daemon=True
+    )
+    producer.start()
+    try:
+        yield format_stream_event({
+            'type': 'start',
+            'total': total,
+            'resumes_count': resumes_count,
+            'job_descriptions_count': len(batch['job_descriptions'])
+        }, stream_format)
+        
+        while True:
+            try:
+                kind, payload = events.get(timeout=STREAM_HEARTBEAT_INTERVAL)
+            except queue.Empty:
+                yield format_stream_event({'type': 'heartbeat'}, stream_format)
+                continue
+            
+            if kind == 'error':
+                yield format_stream_event({'type': 'error', 'error': payload}, stream_format)
+                return
+            if kind == 'done':
+                break
+            
+            pair_index, result = payload
+            completed += 1
+            llm_scored_count += 1 if result['llm_scored'] else 0
+            yield format_stream_event({
+                'type': 'result',
+                'pair_index': pair_index,
+                'result': result
+            }, stream_format)
+            
+            if time.monotonic() - last_progress >= STREAM_PROGRESS_INTERVAL:
+                last_progress = time.monotonic()
+                yield format_stream_event({
+                    'type': 'progress',
+                    'completed': completed,
+                    'total': total,
+                    'progress': round(completed / total, 4)
+                }, stream_format)
+    finally:
+        # Client gone (GeneratorExit) or stream finished: let the producer wind down
+        stop.set()
+    
+    yield format_stream_event({
+        'type': 'done',
+        'total_processed': completed,
+        'llm_scored_count': llm_scored_count
+    }, stream_format)
+
+def run_batch_job(batch, done_pairs):
+    """Job handler: extract the job's uploaded resumes and score the batch, skipping pairs finished earlier"""
+    load_models(scoring_models(batch.get('scoring_mode', 'llm')))
+    batch = dict(batch)
+    resume_files = batch.pop('resume_files', [])
+    
+    missing = [name for name, path in resume_files if not os.path.isfile(path)]
+    if missing:
+        raise RuntimeError(f"Uploaded resumes of this job are no longer available: {', '.join(missing)}")
+    
+    # Extraction is cached by file hash, so a resumed job does not extract again
+    uploads = [open_saved_upload(path, name) for name, path in resume_files]
+    if uploads:
+        logger.info(f"Extracting {len(uploads)} resumes")
+    texts = extract_texts_from_pdfs(uploads, SCORING_EXTRACTION_MODE) if uploads else []
+    
+    batch['resume_entries'] = [(name, text) for (name, _), text in zip(resume_files, texts)] + [
+        tuple(entry) for entry in batch['resume_entries']
+    ]
+    yield from iter_batch_results(skip_pairs=done_pairs, **batch)
+
+def remove_batch_job_uploads(batch):
+    """Job cleanup: delete the resumes saved for a finished, failed or cancelled job"""
+    for _, path in batch.get('resume_files', []):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+metrics_registry.gauge(
+    'hiresync_batch_jobs', 'Batch jobs by status (queued and running are the job queue depth)', ('status',),
+    function=lambda: {(status,): count for status, count in job_store.count_by_status().items()}
+)
+
+@app.before_request
+def ensure_stores():
+    open_stores()
+
+@app.before_request
+def start_request_metrics():
+    g.request_started = time.perf_counter()
+    http_requests_in_flight.inc()
+
+@app.after_request
+def record_request_metrics(response):
+    """Count the request and its latency per endpoint (route function name)"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.endpoint or 'unmatched'
+        http_requests.inc(endpoint=endpoint, method=request.method, status=response.status_code)
+        http_request_seconds.observe(time.perf_counter() - started, endpoint=endpoint)
+        http_requests_in_flight.dec()
+    return response
+
+@app.before_request
+def reject_oversized_requests():
+    """Refuse uploads over MAX_UPLOAD_REQUEST_BYTES before any file is spooled"""
+    if request.content_length is not None and request.content_length > MAX_UPLOAD_REQUEST_BYTES:
+        return jsonify({'error': f'Request exceeds the upload limit of {MAX_UPLOAD_REQUEST_BYTES} bytes'}), 413
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    """Same 413 for bodies without Content-Length, which only go over the limit while the form is parsed"""
+    return jsonify({'error': f'Request exceeds the upload limit of {MAX_UPLOAD_REQUEST_BYTES} bytes'}), 413
+
 @app.route('/api/extract-text', methods=['POST'])
 def extract_text_endpoint():
     """Extract text from a PDF file"""
     try:
+        # Extraction only needs the tokenizer (for truncation), never the embedding model or LLM
+        load_models(('tokenizer',))
+        
         # Get the PDF file from the request
         pdf_file = request.files.get('pdf_file')
         if not pdf_file:
             return jsonify({'error': 'No PDF file provided'}), 400
         
+        mode = request.form.get('mode', 'rich')
+        if mode not in PAGE_EXTRACTORS:
+            return jsonify({'error': f"mode must be one of: {', '.join(PAGE_EXTRACTORS)}"}), 400
+        
         # Extract text from the PDF
-        text = extract_text_from_pdf(pdf_file)
+        text = extract_text_from_pdf(pdf_file, mode)
         
         if text.startswith("ERROR_") or text == "EMPTY_CONTENT":
             return jsonify({'error': f'Failed to extract text: {text}'}), 400
@@ -700,6 +1972,9 @@ def extract_text_endpoint():
             'success': True
         })
         
+    except HTTPException:
+        # Form parsing errors such as 413 for a chunked upload over MAX_CONTENT_LENGTH
+        raise
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -714,10 +1989,47 @@ def get_status():
             'max_resume_tokens': MAX_RESUME_TOKENS,
             'max_jd_tokens': MAX_JD_TOKENS,
             'chunk_size': CHUNK_SIZE,
-            'max_chunks': MAX_CHUNKS_TO_PROCESS
-        }
+            'max_chunks': MAX_CHUNKS_TO_PROCESS,
+            'chunking_strategy': CHUNKING_STRATEGY,
+            'scoring_extraction_mode': SCORING_EXTRACTION_MODE,
+            'llm_pack_size': LLM_PACK_SIZE
+        },
+        'extraction_cache': extraction_cache.stats(),
+        'embedding_store': resume_embedding_store.stats(),
+        'candidate_index': candidate_index.stats(),
+        'candidates': candidate_store.stats(),
+        'jobs': job_store.count_by_status(),
+        'score_cache': score_cache.stats(),
+        'models': model_manager.status(),
+        'llm_pool': llm_model.stats() if isinstance(llm_model, LLMWorkerPool) else None,
+        'embedding_batcher': embed_model.stats() if isinstance(embed_model, EmbeddingBatcher) else None
     })
 
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Expose request counters, stage latencies and queue depths in Prometheus text format"""
+    return Response(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+@app.route('/api/ready', methods=['GET'])
+def get_readiness():
+    """Report per-model readiness; 503 until the requested models are loaded
+    
+    ``/api/status`` answers whether the server is alive. This answers whether
+    it can serve scoring right now, for load balancers and startup probes.
+    By default it asks about the models warmed up at startup (MODEL_WARMUP);
+    pass ``?models=all`` or e.g. ``?models=tokenizer,embed`` to choose.
+    """
+    try:
+        names = parse_model_names(request.args.get('models', MODEL_WARMUP))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    ready = model_manager.is_ready(names)
+    return jsonify({
+        'ready': ready,
+        'models': model_manager.status(names)
+    }), 200 if ready else 503
+
 @app.route('/api/test', methods=['GET'])
 def test_endpoint():
     """Simple test endpoint for debugging"""
@@ -735,12 +2047,17 @@ def test_endpoint():
 def single_resume_check():
     """Check a single resume against a job description"""
     try:
+        scoring_mode = request.form.get('scoring_mode', 'llm')
+        if scoring_mode not in SCORING_MODES:
+            return jsonify({'error': f"Unsupported scoring mode: {scoring_mode} (expected: {', '.join(SCORING_MODES)})"}), 400
+        
         # Load models if not loaded
-        load_models()
+        load_models(scoring_models(scoring_mode))
         
-        # Get resume file
+        # Get resume file, or an ingested candidate
         resume_file = request.files.get('resume')
-        if not resume_file:
+        candidate_id = request.form.get('candidate_id')
+        if not resume_file and not candidate_id:
             return jsonify({'error': 'No resume file provided'}), 400
         
         # Get job description (either from text or file)
@@ -749,30 +2066,59 @@ def single_resume_check():
             return jsonify({'error': error}), 400
         
         # Get optional parameters
-        max_score = int(request.form.get('max_score', 100))
-        cutoff_score = int(request.form.get('cutoff_score', 70))
+        max_score, error = parse_number(request.form, 'max_score', int, default=100, minimum=1)
+        if error:
+            return jsonify({'error': error}), 400
+        cutoff_score, error = parse_number(request.form, 'cutoff_score', int, default=70, minimum=0)
+        if error:
+            return jsonify({'error': error}), 400
+        include_reasoning = request.form.get('include_reasoning', 'false').lower() == 'true'
         
-        # Extract text from resume
-        resume_text = extract_text_from_pdf(resume_file)
+        # Extract text from resume; an ingested candidate is already extracted
+        if resume_file:
+            resume_name = resume_file.filename
+            resume_text = extract_text_from_pdf(resume_file, SCORING_EXTRACTION_MODE)
+        else:
+            entries, error = load_candidate_resumes([candidate_id])
+            if error:
+                return jsonify({'error': error}), 404
+            resume_name, resume_text = entries[0]
         
         # Process matching
-        result = process_resume_jd_matching(
-            resume_text, 
-            job_description, 
-            resume_file.filename
-        )
+        if scoring_mode == 'embedding':
+            result = score_by_embeddings([(resume_name, resume_text)], [job_description])[0][0]
+        else:
+            result = process_resume_jd_matching(
+                resume_text, 
+                job_description, 
+                resume_name,
+                include_reasoning=include_reasoning
+            )
         
         # Scale score to max_score
         scaled_score = (result['score'] / 100) * max_score
         
-        return jsonify({
+        response = {
             'score': round(scaled_score, 1),
             'reasoning': result['reasoning'],
             'resume_name': result['resume_name'],
             'job_description_source': 'file' if 'job_description_file' in request.files else 'text',
-            'chunks_used': result['chunks_used']
-        })
+            'chunks_used': result['chunks_used'],
+            'cached': result.get('cached', False),
+            'scoring_mode': scoring_mode
+        }
+        if 'requirements_coverage' in result:
+            response['requirements_coverage'] = result['requirements_coverage']
+        if not resume_file:
+            response['candidate_id'] = candidate_id
+        
+        skills = match_skills([(resume_name, resume_text)], [job_description])
+        response['skill_match'] = skills.report(0, 0) if skills else None
         
+        return jsonify(response)
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in single resume check: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -781,73 +2127,310 @@ def single_resume_check():
 def resume_checker():
     """Check multiple resumes against multiple job descriptions"""
     try:
-        # Load models if not loaded
-        load_models()
+        # Load models if not loaded; the LLM only once the scoring mode is known
+        load_models(('tokenizer',))
         
-        # Get form data
-        resumes = []
-        job_descriptions = []
+        stream_format = request.args.get('stream') or request.form.get('stream')
+        if stream_format:
+            if stream_format not in STREAM_FORMATS:
+                return jsonify({'error': f'Unsupported stream format: {stream_format}'}), 400
+            
+            # Resumes are only saved here; the stream loads the models and extracts them after its start event
+            upload_dir = tempfile.mkdtemp(prefix='hiresync-stream-')
+            try:
+                batch, error = parse_batch_request(request, upload_dir=upload_dir)
+            except Exception:
+                shutil.rmtree(upload_dir, ignore_errors=True)
+                raise
+            if error:
+                shutil.rmtree(upload_dir, ignore_errors=True)
+                return jsonify({'error': error}), 400
+            
+            return Response(
+                stream_with_context(stream_batch_results(batch, upload_dir, stream_format)),
+                mimetype=STREAM_FORMATS[stream_format],
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
         
-        # Extract resume files
-        for key in request.files:
-            if key.startswith('resume_'):
-                resumes.append(request.files[key])
+        batch, error = parse_batch_request(request)
+        if error:
+            return jsonify({'error': error}), 400
         
-        # Extract job descriptions (text format for batch processing)
-        for key in request.form:
-            if key.startswith('job_description_'):
-                jd_text = format_job_description_text(request.form[key])
-                if count_tokens(jd_text) > MAX_JD_TOKENS:
-                    jd_text = truncate_text(jd_text, MAX_JD_TOKENS)
-                job_descriptions.append(jd_text)
+        load_models(scoring_models(batch['scoring_mode']))
         
-        # Also check for JD files in batch processing
-        for key in request.files:
-            if key.startswith('job_description_file_'):
-                jd_file = request.files[key]
-                jd_text = extract_text_from_pdf(jd_file)
-                if not jd_text.startswith("ERROR_") and jd_text != "EMPTY_CONTENT":
-                    jd_text = format_job_description_text(jd_text)
-                    if count_tokens(jd_text) > MAX_JD_TOKENS:
-                        jd_text = truncate_text(jd_text, MAX_JD_TOKENS)
-                    job_descriptions.append(jd_text)
-        
-        if not resumes:
-            return jsonify({'error': 'No resume files provided'}), 400
+        # Packed scoring finishes pairs JD by JD; respond in pair order either way
+        results = [result for _, result in sorted(iter_batch_results(**batch), key=lambda scored: scored[0])]
         
-        if not job_descriptions:
-            return jsonify({'error': 'No job descriptions provided'}), 400
+        return jsonify({
+            'results': results,
+            'total_processed': len(results),
+            'llm_scored_count': sum(1 for r in results if r['llm_scored']),
+            'resumes_count': len(batch['resume_entries']),
+            'job_descriptions_count': len(batch['job_descriptions']),
+            'scoring_mode': batch['scoring_mode']
+        })
         
-        # Process all combinations
-        results = []
-        for i, resume_file in enumerate(resumes):
-            logger.info(f"Processing resume {i+1}/{len(resumes)}: {resume_file.filename}")
-            resume_text = extract_text_from_pdf(resume_file)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in batch resume check: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs', methods=['POST'])
+def create_batch_job():
+    """Queue a batch resume check and return its job id immediately"""
+    try:
+        # Models for scoring are loaded, and resumes extracted, by the job itself
+        load_models(('tokenizer',))
+        
+        batch, error = parse_batch_request(request, upload_dir=JOB_UPLOAD_DIR)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        total = len(batch['candidate_ids']) * len(batch['job_descriptions'])
+        job_id = job_manager.submit(batch, total)
+        
+        return jsonify({
+            'job_id': job_id,
+            'status': 'queued',
+            'total': total
+        }), 202
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating batch job: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_batch_job(job_id):
+    """Report a batch job's progress and the results finished so far"""
+    try:
+        job = job_store.get(job_id)
+        if job is None:
+            return jsonify({'error': f'Unknown job: {job_id}'}), 404
+        
+        job['progress'] = round(job['completed'] / job['total'], 4) if job['total'] else 1.0
+        if request.args.get('results', 'true').lower() != 'false':
+            job['results'] = [result for _, result in job_store.get_results(job_id)]
+        
+        return jsonify(job)
+        
+    except Exception as e:
+        logger.error(f"Error reading job {job_id}: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_batch_job(job_id):
+    """Stop a queued or running batch job"""
+    try:
+        status = job_manager.cancel(job_id)
+        if status is None:
+            return jsonify({'error': f'Unknown job: {job_id}'}), 404
+        
+        return jsonify({'job_id': job_id, 'status': status})
+        
+    except Exception as e:
+        logger.error(f"Error cancelling job {job_id}: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/search-candidates', methods=['POST'])
+def search_candidates():
+    """Rank every indexed candidate against a job description"""
+    try:
+        # The LLM is only needed when the shortlist is scored
+        llm_score = request.form.get('llm_score', 'false').lower() == 'true'
+        load_models(MODEL_NAMES if llm_score else ('tokenizer', 'embed'))
+        
+        # Get job description (either from text or file)
+        job_description, error = get_job_description_text(request)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        top_k, error = parse_number(request.form, 'top_k', int, default=DEFAULT_SEARCH_TOP_K, minimum=1)
+        if error:
+            return jsonify({'error': error}), 400
+        include_reasoning = request.form.get('include_reasoning', 'false').lower() == 'true'
+        
+        start_time = time.perf_counter()
+        query_vectors = encode_texts([job_description], embed_model)
+        with stage_seconds.time(stage='faiss_search'):
+            candidates = candidate_index.search(query_vectors[0], top_k)
+        search_ms = (time.perf_counter() - start_time) * 1000
+        for candidate in candidates:
+            candidate['candidate_id'] = candidate_store.find_by_content(candidate['resume_id'])
+        
+        # Optionally send the shortlist through the LLM scorer
+        if llm_score and candidates:
+            chunk_sets = []
+            for candidate in candidates:
+                stored = resume_embedding_store.get(candidate['resume_id'])
+                chunk_sets.append(stored if stored is not None else ([], None))
+            
+            retrievals, _ = batch_retrieve_chunks(
+                chunk_sets, [job_description], embed_model, k=3, query_vectors=query_vectors
+            )
             
-            for j, jd in enumerate(job_descriptions):
-                logger.info(f"Processing JD {j+1}/{len(job_descriptions)}")
+            for candidate, (chunks, _), retrieved in zip(candidates, chunk_sets, retrievals):
+                # The stored resume text keeps the score cache shared with the other scoring endpoints;
+                # resumes that were scored but never ingested only have their chunks
+                content = candidate_store.get_content(candidate['resume_id'])
                 result = process_resume_jd_matching(
-                    resume_text, 
-                    jd, 
-                    resume_file.filename
+                    content[0] if content is not None else "\n\n".join(chunks),
+                    job_description,
+                    candidate['resume_name'],
+                    top_chunks=retrieved[0],
+                    include_reasoning=include_reasoning
                 )
-                result['job_description'] = jd[:100] + "..." if len(jd) > 100 else jd
-                results.append(result)
+                candidate['score'] = result['score']
+                candidate['reasoning'] = result['reasoning']
+                candidate['chunks_used'] = result['chunks_used']
+            
+            candidates.sort(key=lambda c: c['score'], reverse=True)
         
         return jsonify({
-            'results': results,
-            'total_processed': len(results),
-            'resumes_count': len(resumes),
-            'job_descriptions_count': len(job_descriptions)
+            'candidates': candidates,
+            'total_returned': len(candidates),
+            'indexed_candidates': candidate_index.stats()['candidates'],
+            'search_ms': round(search_ms, 2),
+            'llm_scored': llm_score
         })
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in batch resume check: {str(e)}")
+        logger.error(f"Error in candidate search: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/candidates', methods=['POST'])
+def ingest_candidates():
+    """Add resumes to the candidate corpus, or new versions of existing candidates
+    
+    Each file ``resume`` or ``resume_<n>`` may come with a ``candidate_id`` /
+    ``candidate_id_<n>`` (a new version of that candidate, or a new candidate
+    with that id) and a ``name`` / ``name_<n>``.
+    """
+    try:
+        load_models(('tokenizer', 'embed'))
+        
+        uploads = []
+        for key in request.files:
+            if key == 'resume' or key.startswith('resume_'):
+                suffix = key[len('resume'):]
+                candidate_id = request.form.get(f'candidate_id{suffix}') or None
+                if candidate_id is not None and not CANDIDATE_ID_PATTERN.match(candidate_id):
+                    return jsonify({'error': f'Invalid candidate id: {candidate_id}'}), 400
+                uploads.append((request.files[key], candidate_id, request.form.get(f'name{suffix}')))
+        
+        if not uploads:
+            return jsonify({'error': 'No resume files provided'}), 400
+        
+        results = []
+        for resume_file, candidate_id, name in uploads:
+            try:
+                results.append(ingest_candidate(resume_file, candidate_id, name))
+            except Exception as e:
+                logger.error(f"Error ingesting {resume_file.filename}: {str(e)}")
+                results.append({'filename': resume_file.filename, 'candidate_id': candidate_id,
+                                'status': 'failed', 'error': str(e)})
+            finally:
+                resume_file.close()
+        
+        counts = defaultdict(int)
+        for result in results:
+            counts[result['status']] += 1
+        
+        return jsonify({'candidates': results, 'counts': counts})
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error ingesting candidates: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/candidates', methods=['GET'])
+def list_candidates():
+    """List ingested candidates, most recently updated first"""
+    try:
+        limit, error = parse_number(request.args, 'limit', int, default=100, minimum=1)
+        if error:
+            return jsonify({'error': error}), 400
+        offset, error = parse_number(request.args, 'offset', int, default=0, minimum=0)
+        if error:
+            return jsonify({'error': error}), 400
+        return jsonify({
+            'candidates': candidate_store.list(limit, offset),
+            'total': candidate_store.count()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error listing candidates: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/candidates/<candidate_id>', methods=['GET'])
+def get_candidate(candidate_id):
+    """Return an ingested candidate with its versions and current sections"""
+    try:
+        candidate = candidate_store.get(candidate_id)
+        if candidate is None:
+            return jsonify({'error': f'Unknown candidate: {candidate_id}'}), 404
+        
+        content = candidate_store.get_content(candidate['content_key'])
+        stored = resume_embedding_store.get(candidate['content_key'])
+        return jsonify(dict(
+            candidate,
+            versions=candidate_store.versions(candidate_id),
+            sections=[section_type for section_type, _ in content[1]] if content else [],
+            chunks=len(stored[0]) if stored is not None else None
+        ))
+        
+    except Exception as e:
+        logger.error(f"Error reading candidate {candidate_id}: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/candidates/<candidate_id>', methods=['DELETE'])
+def delete_candidate(candidate_id):
+    """Delete an ingested candidate with all its versions"""
+    try:
+        content_keys = candidate_store.delete(candidate_id)
+        if content_keys is None:
+            return jsonify({'error': f'Unknown candidate: {candidate_id}'}), 404
+        
+        # Contents another candidate still uses stay searchable
+        for content_key in content_keys:
+            if not candidate_store.find_by_content(content_key):
+                candidate_index.remove(content_key)
+        
+        return jsonify({'candidate_id': candidate_id, 'deleted': True})
+        
+    except Exception as e:
+        logger.error(f"Error deleting candidate {candidate_id}: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/candidate-index/<resume_id>', methods=['DELETE'])
+def delete_indexed_resume(resume_id):
+    """Remove a resume (by its content hash ``resume_id``) from the global search index"""
+    try:
+        owner = candidate_store.find_by_content(resume_id)
+        if owner:
+            return jsonify({
+                'error': f'Resume {resume_id} is the current version of candidate {owner}; '
+                         f'delete the candidate instead'
+            }), 409
+        
+        if not candidate_index.remove(resume_id):
+            return jsonify({'error': f'Unknown resume: {resume_id}'}), 404
+        
+        return jsonify({'resume_id': resume_id, 'deleted': True})
+        
+    except Exception as e:
+        logger.error(f"Error removing resume {resume_id} from the index: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    print("Loading AI models...")
-    load_models()
-    print("Models loaded successfully!")
-    print("Starting Flask server on http://localhost:8501")
-    app.run(host='0.0.0.0', port=8501, debug=False)
\ No newline at end of file
+    start_background_services()
+    print("Starting Flask development server on http://localhost:8501 (see wsgi.py for production)")
+    try:
+        app.run(host='0.0.0.0', port=8501, debug=False, threaded=True)
+    finally:
+        close_stores()
\ No newline at end of file
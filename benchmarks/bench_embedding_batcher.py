@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the embedding micro-batcher
+
+Simulates concurrent /api/single-resume-check handlers: each of ``--clients``
+threads repeatedly encodes a few resume chunks and one JD query, the calls
+made per request. Runs the same load against the bare model and against
+EmbeddingBatcher for each coalescing window, and reports throughput, per-call
+latency (p50/p95) and how many requests shared a forward pass.
+
+``--fake-embeddings`` replaces SentenceTransformer with a model whose cost is
+a fixed per-call overhead plus a per-text cost, for machines without torch.
+
+Usage:
+    python benchmarks/bench_embedding_batcher.py [--clients 16] [--requests 20] [--windows 0,2,5,10]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embedding_batcher import EmbeddingBatcher
+
+WORDS = ("python kubernetes terraform postgres react led designed built reduced latency "
+         "migrated mentored pipelines services platform customers roadmap").split()
+
+
+class SimulatedModel:
+    """Encode cost of ``call_ms`` per call plus ``text_ms`` per text, without the GIL held"""
+
+    def __init__(self, call_ms=4.0, text_ms=0.3, dim=384):
+        self.call_ms = call_ms
+        self.text_ms = text_ms
+        self.dim = dim
+        self._lock = threading.Lock()  # One forward pass at a time, like a saturated CPU
+
+    def encode(self, sentences, **kwargs):
+        texts = [sentences] if isinstance(sentences, str) else sentences
+        with self._lock:
+            time.sleep((self.call_ms + self.text_ms * len(texts)) / 1000.0)
+        vectors = np.ones((len(texts), self.dim), dtype='float32')
+        return vectors[0] if isinstance(sentences, str) else vectors
+
+
+def make_texts(rng, count):
+    return [' '.join(rng.choice(WORDS) for _ in range(60)) for _ in range(count)]
+
+
+def run_load(model, clients, requests, chunks):
+    """Every client sends ``requests`` (chunks + query) encodes; returns (seconds, latencies in ms)"""
+    latencies = []
+    lock = threading.Lock()
+
+    def client(seed):
+        rng = random.Random(seed)
+        mine = []
+        for _ in range(requests):
+            for batch in (make_texts(rng, chunks), make_texts(rng, 1)):
+                started = time.perf_counter()
+                model.encode(batch, convert_to_tensor=False, show_progress_bar=False)
+                mine.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(seed,)) for seed in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent request handlers')
+    parser.add_argument('--requests', type=int, default=20, help='Requests per client')
+    parser.add_argument('--chunks', type=int, default=3, help='Resume chunks encoded per request')
+    parser.add_argument('--windows', default='0,2,5,10', help='Coalescing windows in ms (0: bare model)')
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--fake-embeddings', action='store_true', help='Use a simulated model instead of torch')
+    args = parser.parse_args()
+
+    if args.fake_embeddings:
+        model = SimulatedModel()
+    else:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer("all-MiniLM-L6-v2")
+    model.encode(make_texts(random.Random(0), 4))  # Warm-up
+
+    calls = args.clients * args.requests * 2
+    print(f"{args.clients} clients x {args.requests} requests ({args.chunks} chunks + 1 query), "
+          f"{'simulated' if args.fake_embeddings else 'all-MiniLM-L6-v2'} model")
+    print(f"{'window':>8s} {'calls/s':>10s} {'p50 ms':>9s} {'p95 ms':>9s} {'req/batch':>10s}")
+
+    for window in [float(w) for w in args.windows.split(',')]:
+        target = EmbeddingBatcher(model, max_wait_ms=window, max_batch_size=args.max_batch) if window > 0 else model
+        try:
+            seconds, latencies = run_load(target, args.clients, args.requests, args.chunks)
+        finally:
+            if window > 0:
+                target.close()
+
+        per_batch = target.stats()['requests_per_batch'] if window > 0 else 1.0
+        label = f"{window:g} ms" if window > 0 else 'off'
+        print(f"{label:>8s} {calls / seconds:10.1f} {np.percentile(latencies, 50):9.2f} "
+              f"{np.percentile(latencies, 95):9.2f} {per_batch:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark for JD-major packed LLM scoring
+
+Scores every resume in benchmarks/corpus/ against every job description,
+once with one prompt per pair (create_scoring_prompt) and once per pack
+size with several resumes per prompt (create_packed_scoring_prompt), and
+reports prompt tokens evaluated per pair, generation budget per pair and
+pairs/sec. Both modes generate only the scores unless ``--include-reasoning``.
+
+With ``--model`` the GGUF model is run and pairs/sec is measured. Without
+it pairs/sec is estimated from the token counts and ``--prompt-tps`` /
+``--gen-tps``, the prompt evaluation and generation speeds of the model on
+the target machine (defaults: a 7B Q4 model on an 8-core CPU).
+
+Usage:
+    python benchmarks/bench_llm_packing.py [--pack-sizes 2,4,6]
+    python benchmarks/bench_llm_packing.py --model ./mistral-7b-instruct-v0.2.Q4_K_M.gguf
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from bench_pipeline import isolate_caches
+
+
+def load_corpus(api):
+    resumes = [
+        api.extract_text_from_pdf_source(path, api.SCORING_EXTRACTION_MODE)
+        for path in sorted(glob.glob(os.path.join(CORPUS_DIR, '*.pdf')))
+    ]
+    jds = []
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, 'jd_*.txt'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            jds.append(api.format_job_description_text(f.read()))
+    return resumes, jds
+
+
+def build_prompts(api, resumes, jds, pack_size, include_reasoning):
+    """Return ``(prompt, max_new_tokens)`` for every LLM call needed to score all pairs"""
+    chunk_lists = [api.chunk_resume_text(text)[:3] for text in resumes]
+    pair_kwargs = api.LLM_GENERATION_KWARGS if include_reasoning else api.SCORE_ONLY_GENERATION_KWARGS
+    prompts = []
+    for jd in jds:
+        if pack_size == 1:
+            for chunks in chunk_lists:
+                prompts.append((api.create_scoring_prompt(jd, chunks), pair_kwargs['max_new_tokens']))
+            continue
+
+        for pack in api.plan_resume_packs(jd, [(chunks,) for chunks in chunk_lists], pack_size, include_reasoning):
+            prompt = api.create_packed_scoring_prompt(jd, [chunks for chunks, in pack], include_reasoning)
+            prompts.append((prompt, api.packed_answer_tokens(len(pack), include_reasoning)))
+    return prompts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pack-sizes', default='2,4,6', help='Resumes per prompt to compare with per-pair scoring')
+    parser.add_argument('--model', help='GGUF model to run; without it pairs/sec is estimated')
+    parser.add_argument('--prompt-tps', type=float, default=60.0, help='Prompt evaluation tokens/sec (estimate)')
+    parser.add_argument('--gen-tps', type=float, default=8.0, help='Generated tokens/sec (estimate)')
+    parser.add_argument('--include-reasoning', action='store_true', help='Generate a reason with every score')
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix='hiresync-bench-')
+    isolate_caches(cache_dir)
+    try:
+        run(args)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def run(args):
+    import api_server as api
+    api.load_models(('tokenizer',))
+
+    llm = None
+    if args.model:
+        from ctransformers import AutoModelForCausalLM
+        llm = AutoModelForCausalLM.from_pretrained(args.model, **api.LLM_MODEL_KWARGS)
+
+    resumes, jds = load_corpus(api)
+    pairs = len(resumes) * len(jds)
+    print(f"{len(resumes)} resumes x {len(jds)} job descriptions = {pairs} pairs, "
+          f"{'measured with ' + os.path.basename(args.model) if llm else 'estimated'}")
+    print(f"{'mode':>10s} {'calls':>6s} {'prompt tok/pair':>16s} {'gen tok/pair':>13s} {'pairs/s':>9s} {'speedup':>8s}")
+
+    baseline = None
+    for pack_size in [1] + [int(size) for size in args.pack_sizes.split(',')]:
+        prompts = build_prompts(api, resumes, jds, pack_size, args.include_reasoning)
+        prompt_tokens = sum(api.count_tokens(prompt) for prompt, _ in prompts)
+
+        if llm is not None:
+            generated_tokens = 0
+            started = time.perf_counter()
+            for prompt, max_new_tokens in prompts:
+                response = llm(prompt, **dict(api.LLM_GENERATION_KWARGS, max_new_tokens=max_new_tokens))
+                generated_tokens += api.count_tokens(response)
+            seconds = time.perf_counter() - started
+        else:
+            generated_tokens = sum(max_new_tokens for _, max_new_tokens in prompts)
+            seconds = prompt_tokens / args.prompt_tps + generated_tokens / args.gen_tps
+
+        rate = pairs / seconds
+        baseline = baseline or rate
+        label = 'per-pair' if pack_size == 1 else f"pack {pack_size}"
+        print(f"{label:>10s} {len(prompts):6d} {prompt_tokens / pairs:16.1f} {generated_tokens / pairs:13.1f} "
+              f"{rate:9.3f} {rate / baseline:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the end-to-end resume matching pipeline
+
+Runs every resume in benchmarks/corpus/ against every job description and
+times each stage of api_server's matching pipeline separately:
+
+    extract_text_from_pdf       text extraction of a resume file (extraction cache bypassed)
+    format_job_description_text JD clean-up and truncation
+    chunk_text_improved         blank-line/token-window chunking
+    chunk_resume_text           chunking as configured (CHUNKING_STRATEGY)
+    build_faiss_index           chunk embedding + index build
+    retrieve_chunks             query embedding + top-k search
+    create_scoring_prompt       prompt construction
+    llm_generate                generation, with a deterministic fake LLM
+
+The LLM is always stubbed, so results measure this code rather than the
+model. The embedding model is the real SentenceTransformer unless
+``--fake-embeddings`` is given. All caches go to a temporary directory.
+
+Results are written as JSON with p50/p95 per stage. Pass ``--baseline`` to
+compare against an earlier run; the exit code is 1 if any stage's p50 or
+p95 regressed by more than ``--tolerance`` (and by at least ``--min-delta-ms``,
+so sub-millisecond stages do not flap on timer noise).
+
+Usage:
+    python benchmarks/bench_pipeline.py --output results.json
+    python benchmarks/bench_pipeline.py --baseline results.json [--tolerance 0.2]
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+STAGES = [
+    'extract_text_from_pdf',
+    'format_job_description_text',
+    'chunk_text_improved',
+    'chunk_resume_text',
+    'build_faiss_index',
+    'retrieve_chunks',
+    'create_scoring_prompt',
+    'llm_generate',
+]
+
+
+class FakeLLM:
+    """Deterministic stand-in for the GGUF model: the score depends only on the prompt"""
+
+    def __call__(self, prompt, **generate_kwargs):
+        score = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest(), 16) % 101
+        return f" {score}. The candidate's experience partially matches the role."
+
+
+class FakeEmbeddings:
+    """Deterministic hashed bag-of-words embeddings, for machines without the model"""
+
+    dim = 384
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        vectors = np.zeros((len(texts), self.dim), dtype='float32')
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, int(hashlib.md5(word.encode('utf-8')).hexdigest(), 16) % self.dim] += 1.0
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors[0] if single else vectors
+
+
+def isolate_caches(cache_dir):
+    """Point every api_server cache path (``api_server.CACHE_PATHS``) at a throwaway directory
+
+    Call before the stores are opened; importing api_server opens nothing.
+    """
+    import api_server
+
+    for name, default in api_server.CACHE_PATHS.items():
+        path = os.path.join(cache_dir, os.path.basename(default))
+        os.environ[name] = path
+        setattr(api_server, name, path)
+
+
+def timed(samples, stage, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    samples[stage].append((time.perf_counter() - start) * 1000)
+    return result
+
+
+def run_pipeline(api, resume_paths, jd_texts, repeat):
+    """Run every (resume, JD) pair ``repeat`` times, returning per-stage samples in ms"""
+    samples = {stage: [] for stage in STAGES}
+
+    for _ in range(repeat):
+        jds = [
+            timed(samples, 'format_job_description_text', format_jd, api, jd_text)
+            for jd_text in jd_texts
+        ]
+
+        for path in resume_paths:
+            resume_text = timed(samples, 'extract_text_from_pdf', api.extract_text_from_pdf_source,
+                                path, api.SCORING_EXTRACTION_MODE)
+            timed(samples, 'chunk_text_improved', api.chunk_text_improved, resume_text)
+            chunks = timed(samples, 'chunk_resume_text', api.chunk_resume_text, resume_text)
+            index, _ = timed(samples, 'build_faiss_index', api.build_faiss_index, chunks, api.embed_model)
+
+            for jd_text in jds:
+                top_chunks = timed(samples, 'retrieve_chunks', api.retrieve_chunks,
+                                   jd_text, chunks, index, api.embed_model, k=3)
+                prompt = timed(samples, 'create_scoring_prompt', api.create_scoring_prompt, jd_text, top_chunks)
+                timed(samples, 'llm_generate', api.llm_model, prompt, **api.LLM_GENERATION_KWARGS)
+
+    return samples
+
+
+def format_jd(api, jd_text):
+    """The text-JD path of the API: formatting plus truncation"""
+    jd_text = api.format_job_description_text(jd_text)
+    if api.count_tokens(jd_text) > api.MAX_JD_TOKENS:
+        jd_text = api.truncate_text(jd_text, api.MAX_JD_TOKENS)
+    return jd_text
+
+
+def summarize(samples):
+    return {
+        stage: {
+            'count': len(values),
+            'p50_ms': round(float(np.percentile(values, 50)), 4),
+            'p95_ms': round(float(np.percentile(values, 95)), 4),
+            'mean_ms': round(float(np.mean(values)), 4),
+            'total_ms': round(float(np.sum(values)), 3)
+        }
+        for stage, values in samples.items() if values
+    }
+
+
+def compare(results, baseline, tolerance, min_delta_ms):
+    """Print per-stage changes against a baseline; returns the regressed stages"""
+    regressions = []
+    print(f"{'stage':30s} {'p50 ms':>10s} {'base':>10s} {'change':>8s} {'p95 ms':>10s} {'base':>10s} {'change':>8s}")
+    for stage, current in results['stages'].items():
+        base = baseline.get('stages', {}).get(stage)
+        if base is None:
+            print(f"{stage:30s} {current['p50_ms']:10.3f} {'-':>10s}")
+            continue
+
+        changes = []
+        flag = ''
+        for metric in ('p50_ms', 'p95_ms'):
+            change = (current[metric] - base[metric]) / base[metric] if base[metric] > 0 else 0.0
+            changes.append(change)
+            if change > tolerance and current[metric] - base[metric] >= min_delta_ms:
+                regressions.append(f"{stage} {metric}")
+                flag = '  ❌'
+
+        print(f"{stage:30s} {current['p50_ms']:10.3f} {base['p50_ms']:10.3f} {changes[0]:+8.1%} "
+              f"{current['p95_ms']:10.3f} {base['p95_ms']:10.3f} {changes[1]:+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Passes over the corpus')
+    parser.add_argument('--output', help='Write results JSON here (default: stdout)')
+    parser.add_argument('--baseline', help='Results JSON of an earlier run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative slowdown (default: 0.2)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.5,
+                        help='Ignore slowdowns smaller than this many milliseconds (default: 0.5)')
+    parser.add_argument('--fake-embeddings', action='store_true', help='Use hashed embeddings instead of the model')
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix='hiresync-bench-')
+    isolate_caches(cache_dir)
+    try:
+        import tiktoken
+        import api_server as api
+
+        api.tokenizer = tiktoken.get_encoding("cl100k_base")
+        api.llm_model = FakeLLM()
+        if args.fake_embeddings:
+            api.embed_model = FakeEmbeddings()
+        else:
+            from sentence_transformers import SentenceTransformer
+            api.embed_model = SentenceTransformer(api.EMBED_MODEL_NAME)
+
+        resume_paths = sorted(glob.glob(os.path.join(CORPUS_DIR, '*.pdf')))
+        jd_texts = []
+        for path in sorted(glob.glob(os.path.join(CORPUS_DIR, 'jd_*.txt'))):
+            with open(path, 'r', encoding='utf-8') as f:
+                jd_texts.append(f.read())
+
+        # Warm-up pass so model and library initialisation is not measured
+        run_pipeline(api, resume_paths[:1], jd_texts[:1], 1)
+
+        started = time.perf_counter()
+        samples = run_pipeline(api, resume_paths, jd_texts, args.repeat)
+        wall_s = time.perf_counter() - started
+
+        results = {
+            'meta': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'resumes': len(resume_paths),
+                'job_descriptions': len(jd_texts),
+                'repeat': args.repeat,
+                'embeddings': 'fake' if args.fake_embeddings else api.EMBED_MODEL_NAME,
+                'extraction_mode': api.SCORING_EXTRACTION_MODE,
+                'chunking_strategy': api.CHUNKING_STRATEGY,
+                'wall_seconds': round(wall_s, 3)
+            },
+            'stages': summarize(samples)
+        }
+
+        output = json.dumps(results, indent=2)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+            print(f"Wrote {args.output}")
+        elif not args.baseline:
+            print(output)
+
+        if args.baseline:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+            regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+            if regressions:
+                print(f"❌ Regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+                sys.exit(1)
+            print(f"✅ No stage regressed beyond {args.tolerance:.0%}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for chunk_text_improved and truncate_text
+
+Times the incremental token counting in api_server against the previous
+implementations (which re-encoded the whole growing chunk / prefix for every
+section) on synthetic 10-page resumes, and checks that both produce exactly
+the same chunks and truncations.
+
+Usage:
+    python benchmarks/bench_tokenization.py [--pages 10] [--resumes 5] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tiktoken
+
+from bench_pipeline import isolate_caches
+
+api_server = None  # Imported by run(), once the caches point at a temporary directory
+
+WORDS = (
+    "python java kubernetes docker aws terraform react node sql postgres "
+    "led team of engineers designed implemented scalable services reduced latency "
+    "by improved reliability migrated legacy platform to cloud mentored interns "
+    "machine learning pipelines data analysis stakeholders delivered roadmap"
+).split()
+
+HEADERS = ["**Experience**", "**Education**", "**Skills**", "**Projects**", "Certifications:", "Summary:"]
+
+
+def make_resume(pages, seed):
+    """Build a deterministic resume-like document of roughly ``pages`` pages"""
+    rng = random.Random(seed)
+    page_texts = []
+    for _ in range(pages):
+        lines = []
+        while len(lines) < 45:
+            kind = rng.random()
+            if kind < 0.1:
+                lines.extend(["", rng.choice(HEADERS), ""])
+            elif kind < 0.6:
+                words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 18)))
+                lines.append(f"• {words.capitalize()}, {rng.randint(10, 95)}% faster.")
+            elif kind < 0.75:
+                lines.append(f"{rng.choice(WORDS).title()} Inc. | 20{rng.randint(10, 24)} - Present")
+            elif kind < 0.8:
+                lines.append("")
+            else:
+                lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 40))))
+        page_texts.append("\n".join(lines))
+    return "\n\n--- PAGE BREAK ---\n\n".join(page_texts)
+
+
+def reference_chunk_text(text, max_tokens=None, overlap=None):
+    """Previous chunk_text_improved: re-counts the whole growing chunk per section"""
+    max_tokens = max_tokens or api_server.CHUNK_SIZE
+    overlap = overlap or api_server.CHUNK_OVERLAP
+    count_tokens = api_server.count_tokens
+    tokenizer = api_server.tokenizer
+    sections = re.split(r'\n\s*\n', text)
+    chunks = []
+    current_chunk = ""
+
+    for section in sections:
+        section = section.strip()
+        if not section:
+            continue
+
+        test_chunk = current_chunk + '\n\n' + section if current_chunk else section
+
+        if count_tokens(test_chunk) <= max_tokens:
+            current_chunk = test_chunk
+        else:
+            if current_chunk:
+                chunks.append(current_chunk)
+
+            if count_tokens(section) > max_tokens:
+                tokens = tokenizer.encode(section)
+                start = 0
+                while start < len(tokens):
+                    end = min(start + max_tokens, len(tokens))
+                    chunks.append(tokenizer.decode(tokens[start:end]))
+                    if end == len(tokens):
+                        break
+                    start = end - overlap
+                current_chunk = ""
+            else:
+                current_chunk = section
+
+    if current_chunk:
+        chunks.append(current_chunk)
+
+    return chunks if chunks else [text]
+
+
+def reference_truncate_text(text, max_tokens):
+    """Previous truncate_text: re-counts the whole accumulated prefix per paragraph"""
+    count_tokens = api_server.count_tokens
+    tokenizer = api_server.tokenizer
+    tokens = tokenizer.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+
+    current_text = ""
+    for paragraph in text.split('\n\n'):
+        test_text = current_text + '\n\n' + paragraph if current_text else paragraph
+        if count_tokens(test_text) <= max_tokens:
+            current_text = test_text
+        else:
+            break
+
+    if current_text:
+        return current_text
+
+    return tokenizer.decode(tokens[:max_tokens])
+
+
+def time_call(func, docs, repeat):
+    """Best-of-``repeat`` mean seconds per document"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in docs:
+            func(doc)
+        best = min(best, (time.perf_counter() - start) / len(docs))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--resumes', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix='hiresync-bench-')
+    isolate_caches(cache_dir)
+    try:
+        run(args)
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def run(args):
+    global api_server
+    import api_server
+
+    api_server.tokenizer = tiktoken.get_encoding("cl100k_base")
+    docs = [make_resume(args.pages, seed) for seed in range(args.resumes)]
+    max_tokens = api_server.MAX_RESUME_TOKENS
+
+    mismatches = 0
+    for doc in docs:
+        if api_server.chunk_text_improved(doc) != reference_chunk_text(doc):
+            mismatches += 1
+        if api_server.truncate_text(doc, max_tokens) != reference_truncate_text(doc, max_tokens):
+            mismatches += 1
+
+    avg_tokens = sum(api_server.count_tokens(doc) for doc in docs) / len(docs)
+    print(f"{len(docs)} synthetic {args.pages}-page resumes, ~{avg_tokens:.0f} tokens each")
+
+    for name, new, old in [
+        ('chunk_text_improved', api_server.chunk_text_improved, reference_chunk_text),
+        ('truncate_text', lambda d: api_server.truncate_text(d, max_tokens),
+         lambda d: reference_truncate_text(d, max_tokens)),
+    ]:
+        new_s = time_call(new, docs, args.repeat)
+        old_s = time_call(old, docs, args.repeat)
+        print(f"{name:22s} previous {old_s * 1000:9.2f} ms/resume   "
+              f"incremental {new_s * 1000:8.2f} ms/resume   ({old_s / new_s:5.1f}x)")
+
+    if mismatches:
+        print(f"❌ {mismatches} outputs differ from the previous implementation")
+        sys.exit(1)
+    print("✅ Outputs identical to the previous implementation")
+
+
+if __name__ == "__main__":
+    main()
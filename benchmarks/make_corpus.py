@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Generate the synthetic benchmark corpus
+
+Writes deterministic resume PDFs of varying page counts and a few job
+descriptions into benchmarks/corpus/. The generated files are committed so
+benchmark runs are comparable across machines; re-run this only when the
+corpus itself should change (and re-save any baselines afterwards).
+
+Usage:
+    python benchmarks/make_corpus.py
+"""
+
+import os
+import random
+
+import fitz  # PyMuPDF
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+# Page counts of the generated resumes
+RESUME_PAGES = [1, 1, 2, 2, 3, 5, 8, 12]
+
+WORDS = (
+    "python java go kubernetes docker aws gcp terraform react typescript sql postgres kafka spark "
+    "led designed built shipped reduced improved migrated automated mentored scaled owned "
+    "latency reliability pipelines services platform dashboards experiments models customers "
+    "team roadmap stakeholders incidents costs throughput accuracy"
+).split()
+
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Industries", "Wayne Tech"]
+ROLES = ["Software Engineer", "Senior Software Engineer", "Data Engineer", "ML Engineer", "Tech Lead"]
+
+JOB_DESCRIPTIONS = {
+    'jd_backend.txt': """Senior Backend Engineer
+
+About the role
+We are looking for a backend engineer to build and scale our payments platform.
+
+Responsibilities
+- Design and operate Python and Go services on Kubernetes
+- Own reliability, latency and cost of core APIs
+- Mentor engineers and drive the technical roadmap
+
+Requirements
+- 5+ years of backend experience
+- Strong SQL and Postgres skills, Kafka a plus
+- Experience with AWS or GCP and Terraform
+""",
+    'jd_data.txt': """Data Engineer
+
+Overview
+Join the data platform team building batch and streaming pipelines.
+
+Responsibilities
+- Build Spark and Kafka pipelines feeding analytics and ML models
+- Improve data quality, throughput and costs
+- Partner with stakeholders on dashboards and experiments
+
+Qualifications
+- Python and SQL
+- Experience with cloud data warehouses and orchestration
+""",
+    'jd_frontend.txt': """Frontend Engineer
+
+Role
+Build customer-facing dashboards in React and TypeScript.
+
+Requirements
+- 3+ years with React, TypeScript and modern tooling
+- Care for accessibility, performance and design systems
+- Experience shipping experiments with product teams
+""",
+}
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+class PageWriter:
+    """Writes lines top to bottom, starting new pages as needed"""
+
+    def __init__(self, doc, pages):
+        self.doc = doc
+        self.pages_left = pages
+        self.page = None
+        self.y = 0
+        self.new_page()
+
+    def new_page(self):
+        self.page = self.doc.new_page()
+        self.pages_left -= 1
+        self.y = 60
+
+    def full(self):
+        return self.pages_left <= 0 and self.y > 760
+
+    def line(self, text, size=10, font='helv', indent=0, gap=4):
+        if self.y > 780:
+            if self.pages_left <= 0:
+                return False
+            self.new_page()
+        self.page.insert_text((50 + indent, self.y), text, fontsize=size, fontname=font)
+        self.y += size + gap
+        return True
+
+
+def make_resume(pages, seed):
+    """Build a deterministic resume with roughly ``pages`` full pages"""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    writer = PageWriter(doc, pages)
+
+    writer.line(f"Candidate {seed}", size=18, font='hebo', gap=8)
+    writer.line(f"candidate{seed}@example.com | +1 555 01{seed:02d} | github.com/candidate{seed}", gap=16)
+    writer.line("Summary", size=14, font='hebo', gap=6)
+    for _ in range(2):
+        writer.line(sentence(rng, 12))
+    writer.y += 12
+
+    sections = ['Experience', 'Projects', 'Skills', 'Education', 'Certifications']
+    while not writer.full():
+        for section in sections:
+            if not writer.line(section, size=14, font='hebo', gap=6):
+                break
+            if section == 'Experience':
+                for _ in range(rng.randint(2, 4)):
+                    start = rng.randint(2008, 2020)
+                    writer.line(f"{rng.choice(ROLES)} | {rng.choice(COMPANIES)} | {start} - {start + rng.randint(1, 4)}",
+                                font='hebo', size=11)
+                    for _ in range(rng.randint(3, 5)):
+                        writer.line(f"• {sentence(rng, rng.randint(8, 14))}", indent=10)
+                    writer.y += 6
+            elif section == 'Skills':
+                writer.line(', '.join(rng.sample(WORDS[:14], 8)), font='cour')
+            else:
+                for _ in range(rng.randint(1, 3)):
+                    writer.line(f"• {sentence(rng, rng.randint(6, 10))}", indent=10)
+            writer.y += 12
+
+    data = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return data
+
+
+def main():
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    for i, pages in enumerate(RESUME_PAGES):
+        path = os.path.join(CORPUS_DIR, f"resume_{i:02d}_{pages}p.pdf")
+        with open(path, 'wb') as f:
+            f.write(make_resume(pages, seed=i))
+        print(f"Wrote {path}")
+
+    for name, text in JOB_DESCRIPTIONS.items():
+        path = os.path.join(CORPUS_DIR, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
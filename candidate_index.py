@@ -0,0 +1,268 @@
+import json
+import logging
+import os
+import shutil
+import threading
+
+import faiss
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class CandidateIndex:
+    """Global FAISS index over the chunk embeddings of every known resume
+
+    Each chunk vector gets its own int64 id; the metadata maps ids back to
+    the resume (candidate) they came from. Small corpora use an exact
+    ``IndexIDMap2(IndexFlatIP)``. Once ``train_threshold`` vectors have been
+    added the index is retrained once as an ``IndexIVFFlat`` with ``nlist``
+    lists. Both support incremental ``add_with_ids``/``remove_ids``. Vectors
+    are L2-normalised so inner product is cosine similarity.
+
+    Chunk texts are not kept here: ``chunk_source(resume_id)`` (the resume
+    embedding store) supplies them for ``best_chunk``. Changes are persisted
+    by ``flush``, at most every ``save_interval`` seconds once
+    ``start_autosave`` is called and on ``close``; the index is copied under
+    the lock and written to disk outside it, so searches never wait on a save.
+    """
+
+    def __init__(self, index_dir, version, nlist=256, nprobe=16, train_threshold=None,
+                 chunk_source=None, save_interval=10.0):
+        self.root_dir = index_dir
+        self.version = str(version)
+        self.index_dir = os.path.join(index_dir, self.version)
+        self.index_path = os.path.join(self.index_dir, 'candidates.faiss')
+        self.meta_path = os.path.join(self.index_dir, 'candidates.json')
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_threshold = train_threshold or nlist * 39
+        self.chunk_source = chunk_source
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # One writer of the files at a time
+        self._closed = threading.Event()
+        self._autosave = None
+        self._dirty = False
+        self.saves = 0
+        self._index = None
+        self._candidates = {}  # resume id -> {'name', 'ids'}
+        self._id_to_candidate = {}
+        self._next_id = 0
+        self._load()
+
+    def _load(self):
+        """Load the persisted index and drop indexes from older versions"""
+        os.makedirs(self.index_dir, exist_ok=True)
+
+        for name in os.listdir(self.root_dir):
+            path = os.path.join(self.root_dir, name)
+            if name != self.version and os.path.isdir(path):
+                logger.info(f"Removing stale candidate index version: {name}")
+                shutil.rmtree(path, ignore_errors=True)
+
+        if not (os.path.exists(self.index_path) and os.path.exists(self.meta_path)):
+            return
+
+        try:
+            self._index = faiss.read_index(self.index_path)
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except Exception as e:
+            logger.error(f"Could not load candidate index, starting empty: {str(e)}")
+            self._index = None
+            return
+
+        self._next_id = meta['next_id']
+        self._candidates = meta['candidates']
+        for resume_id, candidate in self._candidates.items():
+            candidate.pop('chunks', None)  # Written by older versions
+            for chunk_id in candidate['ids']:
+                self._id_to_candidate[chunk_id] = resume_id
+
+        self._set_nprobe()
+        logger.info(f"Candidate index ready: {len(self._candidates)} candidates, {self._index.ntotal} vectors")
+
+    def flush(self):
+        """Persist index and metadata atomically if they changed; returns True if written"""
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return False
+                index_bytes = faiss.serialize_index(self._index)
+                meta = json.dumps({'next_id': self._next_id, 'candidates': self._candidates})
+                self._dirty = False
+
+            tmp_index = f"{self.index_path}.tmp"
+            tmp_meta = f"{self.meta_path}.tmp"
+            try:
+                index_bytes.tofile(tmp_index)
+                with open(tmp_meta, 'w', encoding='utf-8') as f:
+                    f.write(meta)
+                os.replace(tmp_index, self.index_path)
+                os.replace(tmp_meta, self.meta_path)
+            except Exception:
+                with self._lock:
+                    self._dirty = True
+                raise
+            self.saves += 1
+            return True
+
+    def start_autosave(self):
+        """Flush pending changes every ``save_interval`` seconds in a background thread"""
+        if self._autosave is not None and self._autosave.is_alive():
+            return
+        self._autosave = threading.Thread(target=self._autosave_loop, name='candidate-index-autosave', daemon=True)
+        self._autosave.start()
+
+    def _autosave_loop(self):
+        while not self._closed.wait(self.save_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Could not save candidate index: {str(e)}")
+
+    def close(self):
+        """Stop the autosave thread and write pending changes"""
+        self._closed.set()
+        if self._autosave is not None and self._autosave.is_alive():
+            self._autosave.join()
+        self.flush()
+
+    def _is_ivf(self):
+        return isinstance(self._index, faiss.IndexIVF)
+
+    def _set_nprobe(self):
+        if self._is_ivf():
+            self._index.nprobe = self.nprobe
+
+    def _maybe_train_ivf(self):
+        """Switch from the exact flat index to IVF once there is enough data"""
+        if self._is_ivf() or self._index.ntotal < self.train_threshold:
+            return
+
+        ids = faiss.vector_to_array(self._index.id_map).astype('int64')
+        vectors = self._index.index.reconstruct_n(0, self._index.ntotal)
+
+        dim = vectors.shape[1]
+        quantizer = faiss.IndexFlatIP(dim)
+        ivf = faiss.IndexIVFFlat(quantizer, dim, self.nlist, faiss.METRIC_INNER_PRODUCT)
+        ivf.train(vectors)
+        ivf.add_with_ids(vectors, ids)
+
+        self._index = ivf
+        self._set_nprobe()
+        logger.info(f"Candidate index retrained as IVF with {self.nlist} lists over {len(ids)} vectors")
+
+    def add(self, resume_id, resume_name, chunks, vectors):
+        """Add (or replace) a candidate's chunk vectors"""
+        self.add_many([(resume_id, resume_name, chunks, vectors)])
+
+    def add_many(self, entries):
+        """Add (or replace) several candidates
+
+        ``entries`` is an iterable of ``(resume_id, resume_name, chunks, vectors)``;
+        only the vectors are kept, ``chunks`` is accepted for symmetry with the
+        embedding store.
+        """
+        with self._lock:
+            added = False
+            for resume_id, resume_name, chunks, vectors in entries:
+                if not len(vectors):
+                    continue
+
+                vectors = np.array(vectors, dtype='float32')
+                faiss.normalize_L2(vectors)
+
+                if resume_id in self._candidates:
+                    self._remove_locked(resume_id)
+
+                if self._index is None:
+                    self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(vectors.shape[1]))
+
+                ids = np.arange(self._next_id, self._next_id + len(vectors), dtype='int64')
+                self._next_id += len(vectors)
+                self._index.add_with_ids(vectors, ids)
+
+                self._candidates[resume_id] = {'name': resume_name, 'ids': ids.tolist()}
+                for chunk_id in ids.tolist():
+                    self._id_to_candidate[chunk_id] = resume_id
+                added = True
+
+            if added:
+                self._maybe_train_ivf()
+                self._dirty = True
+
+    def remove(self, resume_id):
+        """Remove a candidate; returns False if it was not indexed"""
+        with self._lock:
+            if resume_id not in self._candidates:
+                return False
+            self._remove_locked(resume_id)
+            self._dirty = True
+            return True
+
+    def _remove_locked(self, resume_id):
+        candidate = self._candidates.pop(resume_id)
+        self._index.remove_ids(np.array(candidate['ids'], dtype='int64'))
+        for chunk_id in candidate['ids']:
+            self._id_to_candidate.pop(chunk_id, None)
+
+    def __contains__(self, resume_id):
+        with self._lock:
+            return resume_id in self._candidates
+
+    def search(self, query_vector, top_k=20):
+        """Return the top_k candidates ranked by their best chunk similarity"""
+        query = np.array(query_vector, dtype='float32').reshape(1, -1)
+        faiss.normalize_L2(query)
+
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                return []
+
+            # Over-fetch chunks so that top_k distinct candidates survive aggregation
+            k = min(self._index.ntotal, top_k * 10)
+            similarities, ids = self._index.search(query, k)
+
+            ranked = {}
+            for similarity, chunk_id in zip(similarities[0], ids[0]):
+                resume_id = self._id_to_candidate.get(int(chunk_id))
+                if resume_id is None or resume_id in ranked:
+                    continue
+                candidate = self._candidates[resume_id]
+                ranked[resume_id] = {
+                    'resume_id': resume_id,
+                    'resume_name': candidate['name'],
+                    'similarity': round(float(similarity), 4),
+                    'best_chunk': candidate['ids'].index(int(chunk_id))
+                }
+                if len(ranked) >= top_k:
+                    break
+
+        # Chunk positions become texts outside the lock
+        for result in ranked.values():
+            chunks = self.get_chunks(result['resume_id'])
+            position = result['best_chunk']
+            result['best_chunk'] = chunks[position] if chunks and position < len(chunks) else None
+        return list(ranked.values())
+
+    def get_chunks(self, resume_id):
+        """Return the chunk texts of a candidate from ``chunk_source``, or None"""
+        if self.chunk_source is None:
+            return None
+        return self.chunk_source(resume_id)
+
+    def stats(self):
+        """Return index size and type"""
+        with self._lock:
+            return {
+                'version': self.version,
+                'type': 'ivf' if self._is_ivf() else 'flat',
+                'candidates': len(self._candidates),
+                'vectors': self._index.ntotal if self._index is not None else 0,
+                'nlist': self.nlist,
+                'nprobe': self.nprobe,
+                'unsaved_changes': self._dirty,
+                'saves': self.saves
+            }
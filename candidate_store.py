@@ -0,0 +1,183 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class CandidateStore:
+    """SQLite registry of ingested candidates and their resume versions
+
+    A candidate has a stable id and one row per uploaded version; each
+    version points at the content hash (see ``resume_content_key``) of its
+    extracted text. The text and its sections are stored once per content
+    hash, however many candidates or versions share it. Chunk vectors live
+    in the resume embedding store under the same content hash.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS candidates (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    current_version INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS candidate_versions (
+                    candidate_id TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    file_hash TEXT NOT NULL,
+                    content_key TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (candidate_id, version)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS resume_contents (
+                    content_key TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    sections TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS candidate_versions_content ON candidate_versions (content_key)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def get(self, candidate_id):
+        """Return the candidate and its current version as a dict, or None"""
+        with self._connect() as conn:
+            row = conn.execute("""
+                SELECT c.id, c.name, c.current_version, c.created_at, c.updated_at, v.file_hash, v.content_key
+                FROM candidates c
+                JOIN candidate_versions v ON v.candidate_id = c.id AND v.version = c.current_version
+                WHERE c.id = ?
+            """, (candidate_id,)).fetchone()
+        if row is None:
+            return None
+
+        return {
+            'candidate_id': row[0],
+            'name': row[1],
+            'version': row[2],
+            'created_at': row[3],
+            'updated_at': row[4],
+            'file_hash': row[5],
+            'content_key': row[6]
+        }
+
+    def versions(self, candidate_id):
+        """Every version of a candidate, oldest first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT version, file_hash, content_key, created_at FROM candidate_versions "
+                "WHERE candidate_id = ? ORDER BY version",
+                (candidate_id,)
+            ).fetchall()
+        return [
+            {'version': row[0], 'file_hash': row[1], 'content_key': row[2], 'created_at': row[3]}
+            for row in rows
+        ]
+
+    def list(self, limit=100, offset=0):
+        """Candidates with their current version, most recently updated first"""
+        with self._connect() as conn:
+            ids = [row[0] for row in conn.execute(
+                "SELECT id FROM candidates ORDER BY updated_at DESC LIMIT ? OFFSET ?", (limit, offset)
+            )]
+        return [candidate for candidate in map(self.get, ids) if candidate is not None]
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def find_by_content(self, content_key):
+        """Id of a candidate whose current version has this content, or None"""
+        with self._connect() as conn:
+            row = conn.execute("""
+                SELECT c.id FROM candidates c
+                JOIN candidate_versions v ON v.candidate_id = c.id AND v.version = c.current_version
+                WHERE v.content_key = ?
+                ORDER BY c.created_at LIMIT 1
+            """, (content_key,)).fetchone()
+        return row[0] if row else None
+
+    def get_content(self, content_key):
+        """Return ``(text, sections)`` stored for a content hash, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT text, sections FROM resume_contents WHERE content_key = ?", (content_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], [tuple(section) for section in json.loads(row[1])]
+
+    def put_content(self, content_key, text, sections):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO resume_contents (content_key, text, sections, created_at) VALUES (?, ?, ?, ?)",
+                (content_key, text, json.dumps(sections), time.time())
+            )
+
+    def add_version(self, candidate_id, name, file_hash, content_key):
+        """Record a new current version, creating the candidate if needed
+
+        ``candidate_id`` may be None for a new candidate. Returns
+        ``(candidate_id, version)``.
+        """
+        candidate_id = candidate_id or uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT MAX(version) FROM candidate_versions WHERE candidate_id = ?", (candidate_id,)
+            ).fetchone()
+            version = (row[0] or 0) + 1
+            conn.execute(
+                "INSERT INTO candidate_versions (candidate_id, version, file_hash, content_key, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (candidate_id, version, file_hash, content_key, now)
+            )
+            conn.execute("""
+                INSERT INTO candidates (id, name, current_version, created_at, updated_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET name = excluded.name, current_version = excluded.current_version,
+                    updated_at = excluded.updated_at
+            """, (candidate_id, name, version, now, now))
+        return candidate_id, version
+
+    def delete(self, candidate_id):
+        """Delete a candidate and its versions; returns the content keys its versions used, or None"""
+        with self._lock, self._connect() as conn:
+            keys = [row[0] for row in conn.execute(
+                "SELECT DISTINCT content_key FROM candidate_versions WHERE candidate_id = ?", (candidate_id,)
+            )]
+            deleted = conn.execute("DELETE FROM candidates WHERE id = ?", (candidate_id,)).rowcount
+            conn.execute("DELETE FROM candidate_versions WHERE candidate_id = ?", (candidate_id,))
+            # Contents no other version refers to
+            conn.execute("""
+                DELETE FROM resume_contents
+                WHERE content_key NOT IN (SELECT content_key FROM candidate_versions)
+            """)
+        return keys if deleted else None
+
+    def stats(self):
+        with self._connect() as conn:
+            return {
+                'candidates': conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0],
+                'versions': conn.execute("SELECT COUNT(*) FROM candidate_versions").fetchone()[0],
+                'contents': conn.execute("SELECT COUNT(*) FROM resume_contents").fetchone()[0]
+            }
@@ -0,0 +1,161 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# encode() arguments the batcher handles itself; anything else is passed straight to the model
+BATCHED_ENCODE_KWARGS = ('batch_size', 'show_progress_bar', 'convert_to_tensor')
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent ``encode`` calls into shared forward passes
+
+    Wraps a SentenceTransformer and is used in its place. Small requests from
+    concurrent handlers (a few chunks, one JD query) are queued; a collector
+    thread waits at most ``max_wait_ms`` after the first queued request, or
+    until ``max_batch_size`` texts are queued, then encodes them all in one
+    call and hands each caller its rows. Requests of ``max_batch_size`` texts
+    or more gain nothing from batching and go straight to the model.
+
+    The collector thread starts on the first batched call, and again in a
+    forked child (e.g. a gunicorn worker of a preloaded app), where threads
+    of the parent do not exist.
+    """
+
+    def __init__(self, model, max_wait_ms=5, max_batch_size=64):
+        self.model = model
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._batched_requests = 0
+        self._batched_texts = 0
+        self._direct_requests = 0
+        self._closed = False
+        self._queue = None
+        self._collector = None
+        self._pid = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def encode(self, sentences, **kwargs):
+        """Same contract as ``SentenceTransformer.encode`` for numpy output"""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        direct = (
+            self._closed
+            or not texts
+            or len(texts) >= self.max_batch_size
+            or kwargs.get('convert_to_tensor', False)
+            or any(name not in BATCHED_ENCODE_KWARGS for name in kwargs)
+        )
+        if direct:
+            with self._lock:
+                self._direct_requests += 1
+            return self.model.encode(sentences, **kwargs)
+
+        future = Future()
+        self._ensure_collector().put((texts, future))
+        vectors = future.result()
+        return vectors[0] if single else vectors
+
+    def _after_fork(self):
+        # A lock held by a parent thread at fork time would never be released in the child
+        self._lock = threading.Lock()
+
+    def _ensure_collector(self):
+        """Start the collector in this process if needed and return its queue"""
+        pid = os.getpid()
+        if self._pid == pid:
+            return self._queue
+
+        with self._lock:
+            if self._pid != pid:
+                # After a fork the old queue may be locked by a thread that no longer exists
+                self._queue = queue.Queue()
+                self._collector = threading.Thread(
+                    target=self._collect, args=(self._queue,), name='embedding-batcher', daemon=True
+                )
+                self._collector.start()
+                self._pid = pid
+        return self._queue
+
+    def _collect(self, requests):
+        while True:
+            item = requests.get()
+            if item is None:
+                break
+
+            batch = [item]
+            count = len(item[0])
+            deadline = time.monotonic() + self.max_wait
+            while count < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = requests.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    requests.put(None)
+                    break
+                batch.append(item)
+                count += len(item[0])
+
+            self._encode_batch(batch, count)
+
+    def _encode_batch(self, batch, count):
+        all_texts = [text for texts, _ in batch for text in texts]
+        try:
+            vectors = np.asarray(self.model.encode(
+                all_texts,
+                batch_size=self.max_batch_size,
+                convert_to_tensor=False,
+                show_progress_bar=False
+            ))
+        except Exception as e:
+            logger.error(f"Batched embedding of {count} texts failed: {str(e)}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        start = 0
+        for texts, future in batch:
+            future.set_result(vectors[start:start + len(texts)])
+            start += len(texts)
+
+        with self._lock:
+            self._batches += 1
+            self._batched_requests += len(batch)
+            self._batched_texts += count
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_wait_ms': round(self.max_wait * 1000, 3),
+                'max_batch_size': self.max_batch_size,
+                'batches': self._batches,
+                'batched_requests': self._batched_requests,
+                'batched_texts': self._batched_texts,
+                'requests_per_batch': round(self._batched_requests / self._batches, 2) if self._batches else None,
+                'direct_requests': self._direct_requests,
+                'queued': self._queue.qsize() if self._queue is not None else 0
+            }
+
+    def close(self):
+        """Stop the collector after the queued requests are encoded"""
+        self._closed = True
+        if self._pid == os.getpid():
+            self._queue.put(None)
+            self._collector.join(timeout=5)
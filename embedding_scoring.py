@@ -0,0 +1,151 @@
+import re
+
+import numpy as np
+
+from resume_sections import normalize_heading
+
+# JD sections whose bullets describe the company or the offer, not the candidate
+NON_REQUIREMENT_SECTIONS = ('ABOUT', 'OVERVIEW', 'COMPANY', 'BENEFITS', 'PERKS', 'WHAT WE OFFER')
+# Headings that open a JD section; "About <company>" headings are matched by prefix
+JD_SECTION_HEADINGS = (
+    'requirements', 'job requirements', 'key requirements', 'minimum requirements',
+    'qualifications', 'required qualifications', 'minimum qualifications', 'basic qualifications',
+    'preferred qualifications', 'responsibilities', 'key responsibilities', 'job responsibilities',
+    'duties', 'skills', 'required skills', 'key skills', 'experience', 'required experience',
+    'education', 'overview', 'job overview', 'summary', 'job summary', 'description', 'job description',
+    'position', 'position summary', 'role', 'the role', 'your role', 'about', 'company', 'benefits',
+    'perks', 'what we offer', 'what you will do', 'what you ll do', 'who you are', 'what you bring',
+    'nice to have', 'bonus points'
+)
+MAX_HEADING_WORDS = 5
+# Lines like "Kafka a plus" count half as much as hard requirements
+OPTIONAL_MARKERS = ('a plus', 'nice to have', 'preferred', 'bonus', 'optional')
+OPTIONAL_WEIGHT = 0.5
+
+BULLET_PATTERN = re.compile(r'^(?:[•▪▫◦‣⁃\-*·]|\d+[.)])\s*')
+MIN_REQUIREMENT_WORDS = 3
+
+# Cosine similarity of all-MiniLM-L6-v2 between a requirement and its best resume chunk,
+# mapped linearly to 0-1 between LOW and HIGH. Hand-picked, not fitted to LLM scores
+SIMILARITY_LOW = 0.15
+SIMILARITY_HIGH = 0.60
+REQUIREMENT_MET_SIMILARITY = 0.45
+
+
+def _strip_markup(line):
+    line = line.strip()
+    if line.startswith('**') and line.endswith('**') and len(line) > 4:
+        line = line[2:-2].strip()
+    return line
+
+
+def _is_header(line):
+    """Whether a markup-stripped JD line is a section heading
+
+    ``format_job_description_text`` bolds every line mentioning experience,
+    skills, role, ... so bolding says nothing. A heading is a short line that
+    is not a bullet and either names a known JD section or is a digit-free
+    ``Title:`` / ALL CAPS line, as in ``resume_sections.is_marked_heading``.
+    """
+    if len(line) > 50 or BULLET_PATTERN.match(line):
+        return False
+    name = normalize_heading(line)
+    if not name or len(name.split()) > MAX_HEADING_WORDS:
+        return False
+    if name in JD_SECTION_HEADINGS or name.startswith('about '):
+        return True
+    is_marked = line.endswith(':') or (line.isupper() and any(c.isalpha() for c in line))
+    return is_marked and not any(c.isdigit() for c in line)
+
+
+def extract_requirements(jd_text):
+    """Split a job description (raw or formatted by ``format_job_description_text``) into requirements
+
+    Returns a list of ``(requirement, weight)``. Bullet and numbered lines are
+    requirements, except under About/Company/Benefits style headings. Without
+    any bullets every line of a few words that is not a heading is used; a
+    JD without such lines is a single requirement, its text without markup.
+    """
+    bullets = []
+    lines = []
+    plain_lines = []
+    section = ''
+    for raw_line in jd_text.split('\n'):
+        line = _strip_markup(raw_line)
+        if not line:
+            continue
+        plain_lines.append(line)
+        if _is_header(line):
+            section = line.upper()
+            continue
+        if any(marker in section for marker in NON_REQUIREMENT_SECTIONS):
+            continue
+
+        bullet = BULLET_PATTERN.match(line)
+        text = line[bullet.end():].strip() if bullet else line
+        if len(text.split()) < MIN_REQUIREMENT_WORDS:
+            continue
+        (bullets if bullet else lines).append(text)
+
+    requirements = bullets or lines or [' '.join(plain_lines)]
+    return [
+        (text, OPTIONAL_WEIGHT if any(marker in text.lower() for marker in OPTIONAL_MARKERS) else 1.0)
+        for text in requirements if text
+    ]
+
+
+def normalize_rows(vectors):
+    vectors = np.asarray(vectors, dtype='float32')
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def requirement_coverage(chunk_sets, requirement_vectors):
+    """Best cosine similarity between every requirement and any chunk of every resume
+
+    ``chunk_sets`` holds a ``(chunks, vectors)`` pair per resume. All chunks
+    are compared with all requirements in one matrix product, then reduced
+    to a ``(resumes, requirements)`` matrix; resumes without chunks get 0.
+    """
+    coverage = np.zeros((len(chunk_sets), len(requirement_vectors)), dtype='float32')
+    blocks = [vectors for chunks, vectors in chunk_sets if chunks]
+    if not blocks or not len(requirement_vectors):
+        return coverage
+
+    similarities = normalize_rows(np.vstack(blocks)) @ normalize_rows(requirement_vectors).T
+    has_chunks = np.array([bool(chunks) for chunks, _ in chunk_sets])
+    starts = np.cumsum([0] + [len(chunks) for chunks, _ in chunk_sets if chunks])[:-1]
+    coverage[has_chunks] = np.maximum.reduceat(similarities, starts, axis=0)
+    return coverage
+
+
+def similarity_scores(coverage, weights):
+    """Map requirement similarities to 0-100 scores: weighted mean of per-requirement matches
+
+    ``coverage`` is ``(resumes, requirements)``. Each similarity is scaled
+    linearly from SIMILARITY_LOW (0) to SIMILARITY_HIGH (1) and clipped.
+    """
+    weights = np.asarray(weights, dtype='float32')
+    matches = np.clip((coverage - SIMILARITY_LOW) / (SIMILARITY_HIGH - SIMILARITY_LOW), 0.0, 1.0)
+    return 100.0 * (matches @ weights) / max(float(weights.sum()), 1e-12)
+
+
+def coverage_report(requirements, similarities):
+    """Per-requirement coverage of one resume, for the API response"""
+    return [
+        {
+            'requirement': text,
+            'weight': weight,
+            'similarity': round(float(similarity), 4),
+            'met': bool(similarity >= REQUIREMENT_MET_SIMILARITY)
+        }
+        for (text, weight), similarity in zip(requirements, similarities)
+    ]
+
+
+def summarize_coverage(report):
+    met = [item for item in report if item['met']]
+    missing = [item['requirement'] for item in report if not item['met']]
+    summary = f"Embedding match: covers {len(met)}/{len(report)} job requirements."
+    if missing:
+        summary += " Weakest: " + "; ".join(missing[:3])
+    return summary
@@ -0,0 +1,147 @@
+import json
+import logging
+import os
+import shutil
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingStore:
+    """Persistent store of resume chunk embeddings keyed by content hash
+
+    Vectors are appended as raw float32 rows to ``vectors.f32`` and read back
+    through a memory map. The sidecar ``chunks.jsonl`` holds one line per
+    resume with its chunk texts and the row offset/count of its vectors.
+    Like the extraction cache, the store lives under a version directory so
+    changing the embedding model or chunking parameters starts a fresh store.
+    """
+
+    def __init__(self, store_dir, version):
+        self.root_dir = store_dir
+        self.version = str(version)
+        self.store_dir = os.path.join(store_dir, self.version)
+        self.vectors_path = os.path.join(self.store_dir, 'vectors.f32')
+        self.sidecar_path = os.path.join(self.store_dir, 'chunks.jsonl')
+        self.meta_path = os.path.join(self.store_dir, 'meta.json')
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> {'row', 'count', 'chunks'}
+        self._dim = None
+        self._rows = 0
+        self._mmap = None
+        self._mmap_rows = 0
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self):
+        """Read the sidecar and drop stores written by other versions"""
+        os.makedirs(self.store_dir, exist_ok=True)
+
+        for name in os.listdir(self.root_dir):
+            path = os.path.join(self.root_dir, name)
+            if name != self.version and os.path.isdir(path):
+                logger.info(f"Removing stale embedding store version: {name}")
+                shutil.rmtree(path, ignore_errors=True)
+
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                self._dim = json.load(f)['dim']
+
+        if self._dim and os.path.exists(self.vectors_path):
+            row_bytes = self._dim * 4
+            size = os.path.getsize(self.vectors_path)
+            if size % row_bytes:
+                # Drop a partially written row left by an interrupted append
+                with open(self.vectors_path, 'r+b') as f:
+                    f.truncate(size - size % row_bytes)
+            self._rows = size // row_bytes
+
+        if os.path.exists(self.sidecar_path):
+            with open(self.sidecar_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry['row'] + entry['count'] <= self._rows:
+                        self._entries[entry['key']] = entry
+
+        logger.info(f"Embedding store ready: {len(self._entries)} resumes, {self._rows} vectors")
+
+    def _vectors(self):
+        """Return a read-only memory map over every stored vector"""
+        if self._mmap is None or self._mmap_rows != self._rows:
+            self._mmap = np.memmap(
+                self.vectors_path, dtype='float32', mode='r', shape=(self._rows, self._dim)
+            )
+            self._mmap_rows = self._rows
+        return self._mmap
+
+    def get(self, key):
+        """Return (chunks, vectors) stored for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            if entry['count'] == 0:
+                return entry['chunks'], np.zeros((0, self._dim or 0), dtype='float32')
+            vectors = self._vectors()[entry['row']:entry['row'] + entry['count']]
+            return entry['chunks'], vectors
+
+    def get_chunks(self, key):
+        """Return the chunk texts stored for key, or None; not counted as a hit or miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return list(entry['chunks']) if entry is not None else None
+
+    def put(self, key, chunks, vectors):
+        """Append the chunk vectors for key to the store"""
+        vectors = np.ascontiguousarray(vectors, dtype='float32')
+        if len(chunks) != len(vectors):
+            raise ValueError("chunks and vectors must have the same length")
+
+        with self._lock:
+            if key in self._entries:
+                return
+
+            if len(vectors):
+                if self._dim is None:
+                    self._dim = int(vectors.shape[1])
+                    with open(self.meta_path, 'w', encoding='utf-8') as f:
+                        json.dump({'dim': self._dim}, f)
+                elif vectors.shape[1] != self._dim:
+                    raise ValueError(f"Expected {self._dim}-dim vectors, got {vectors.shape[1]}")
+
+                with open(self.vectors_path, 'ab') as f:
+                    f.write(vectors.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            entry = {'key': key, 'row': self._rows, 'count': len(chunks), 'chunks': list(chunks)}
+            with open(self.sidecar_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + '\n')
+
+            self._rows += len(vectors)
+            self._entries[key] = entry
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            return {
+                'version': self.version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'resumes': len(self._entries),
+                'vectors': self._rows,
+                'dim': self._dim
+            }
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def hash_bytes(data):
+    """Return the SHA-256 hex digest of raw file bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ExtractionCache:
+    """On-disk, content-addressed cache for extracted PDF text
+
+    Entries live in ``<cache_dir>/<version>/<sha256>.json``. Changing the
+    version stamp moves the cache to a fresh directory and removes the old
+    one, so a change to the extraction logic never serves stale text. Total
+    size is bounded; least recently used entries are evicted first.
+    """
+
+    def __init__(self, cache_dir, version, max_bytes):
+        self.root_dir = cache_dir
+        self.version = str(version)
+        self.cache_dir = os.path.join(cache_dir, self.version)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> size in bytes, oldest first
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    def _load(self):
+        """Index existing entries and drop directories from older versions"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        for name in os.listdir(self.root_dir):
+            path = os.path.join(self.root_dir, name)
+            if name != self.version and os.path.isdir(path):
+                logger.info(f"Removing stale extraction cache version: {name}")
+                shutil.rmtree(path, ignore_errors=True)
+
+        existing = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            existing.append((stat.st_mtime, name[:-5], stat.st_size))
+
+        for _, key, size in sorted(existing):
+            self._entries[key] = size
+            self._total_bytes += size
+
+        logger.info(f"Extraction cache ready: {len(self._entries)} entries, {self._total_bytes} bytes")
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """Return cached text for key, or None on a miss"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+
+            path = self._path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                os.utime(path)  # Persist recency across restarts
+            except (OSError, ValueError) as e:
+                logger.warning(f"Dropping unreadable extraction cache entry {key}: {str(e)}")
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry['text']
+
+    def put(self, key, text):
+        """Store extracted text for key, evicting old entries if needed"""
+        payload = json.dumps({'version': self.version, 'text': text}).encode('utf-8')
+        if len(payload) > self.max_bytes:
+            return
+
+        with self._lock:
+            path = self._path(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"Could not write extraction cache entry {key}: {str(e)}")
+                return
+
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+            self._entries[key] = len(payload)
+            self._total_bytes += len(payload)
+
+            while self._total_bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        self._total_bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            return {
+                'version': self.version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes
+            }
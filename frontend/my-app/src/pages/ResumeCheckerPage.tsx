@@ -295,6 +295,7 @@ export function ResumeCheckerPage({ manualMode = false }: { manualMode?: boolean
       
       formData.append('max_score', '100');
       formData.append('cutoff_score', cutoffScore.toString());
+      formData.append('include_reasoning', 'true');
 
       console.log('Sending request to API...');
       
@@ -0,0 +1,51 @@
+"""
+gunicorn settings for the Resume Checker API server: gunicorn -c gunicorn.conf.py wsgi:app
+
+The server runs one worker process with several threads; the worker count
+is not configurable. The resume embedding store, candidate index and
+extraction cache are append-only files and in-memory indexes owned by one
+process, and a second worker writing the same cache directory would corrupt
+them. Embedding calls run concurrently across threads; LLM calls are
+serialized unless LLM_WORKERS starts a pool of LLM processes.
+
+Only the read-only tokenizer and embedding model are loaded in the master
+(``PRELOAD_MODELS``) before the worker is forked, so a restarted worker
+starts without reloading them. The caches, stores and job queue are opened
+by the worker itself (``post_worker_init``), never by the master: a worker
+re-forked after a timeout or crash reads them afresh from disk instead of
+inheriting stale offsets and indexes. The LLM is always loaded after the
+fork: its worker processes and threads cannot be inherited.
+"""
+
+import os
+
+bind = f"{os.environ.get('WEB_HOST', '0.0.0.0')}:{os.environ.get('WEB_PORT', 8501)}"
+workers = 1  # The on-disk stores have a single writer; scale with WEB_THREADS and LLM_WORKERS
+threads = int(os.environ.get('WEB_THREADS', 8))
+worker_class = 'gthread'
+timeout = int(os.environ.get('WEB_TIMEOUT', 600))  # Batch requests score many pairs in one request
+preload_app = True
+
+PRELOAD_MODELS = os.environ.get('PRELOAD_MODELS', 'tokenizer,embed')
+
+
+def when_ready(server):
+    """Load shared models in the master before workers are forked"""
+    import api_server
+
+    names = [name for name in api_server.parse_model_names(PRELOAD_MODELS) if name != 'llm']
+    api_server.load_models(names)
+
+
+def post_worker_init(worker):
+    """Open the stores in the worker and start its background services"""
+    import api_server
+
+    api_server.start_background_services()
+
+
+def worker_exit(server, worker):
+    """Interrupt batch jobs after their current pair so the worker exits promptly; they resume on restart"""
+    import api_server
+
+    api_server.close_stores()
@@ -0,0 +1,292 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process deployments only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobStore:
+    """SQLite persistence for batch jobs and their per-pair results"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    total INTEGER NOT NULL,
+                    payload TEXT NOT NULL,
+                    error TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_results (
+                    job_id TEXT NOT NULL,
+                    pair_index INTEGER NOT NULL,
+                    result TEXT NOT NULL,
+                    PRIMARY KEY (job_id, pair_index)
+                )
+            """)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def acquire_runner_lock(self):
+        """Try to become the process that resumes unfinished jobs; returns True on success
+
+        Several server processes (e.g. gunicorn workers) can share one job
+        database. An exclusive lock on ``<db_path>.runner.lock`` is held for
+        the life of the process that wins, and released by the OS when it
+        exits, so a restarted process can take over.
+        """
+        if fcntl is None:
+            return True
+
+        lock_file = open(self.db_path + '.runner.lock', 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        self._runner_lock_file = lock_file
+        return True
+
+    def create(self, payload, total):
+        """Insert a new queued job and return its id"""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, created_at, updated_at, total, payload) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, now, now, total, json.dumps(payload))
+            )
+        return job_id
+
+    def set_status(self, job_id, status, error=None):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, error, time.time(), job_id)
+            )
+
+    def add_result(self, job_id, pair_index, result):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO job_results (job_id, pair_index, result) VALUES (?, ?, ?)",
+                (job_id, pair_index, json.dumps(result))
+            )
+            conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (time.time(), job_id))
+
+    def get(self, job_id):
+        """Return the job row as a dict, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, status, created_at, updated_at, total, error FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            completed = conn.execute(
+                "SELECT COUNT(*) FROM job_results WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+
+        return {
+            'job_id': row[0],
+            'status': row[1],
+            'created_at': row[2],
+            'updated_at': row[3],
+            'total': row[4],
+            'completed': completed,
+            'error': row[5]
+        }
+
+    def status(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def get_payload(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_results(self, job_id):
+        """Return finished results ordered by pair index"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT pair_index, result FROM job_results WHERE job_id = ? ORDER BY pair_index",
+                (job_id,)
+            ).fetchall()
+        return [(pair_index, json.loads(result)) for pair_index, result in rows]
+
+    def done_pairs(self, job_id):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT pair_index FROM job_results WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def unfinished(self):
+        """Return ids of jobs that were queued or running, oldest first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (QUEUED, RUNNING)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def count_by_status(self):
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+
+class JobManager:
+    """Runs batch jobs on a worker pool, persisting progress to a JobStore
+
+    ``handler(payload, done_pairs)`` must yield ``(pair_index, result)`` for
+    every pair not in ``done_pairs``. Each result is committed as soon as it
+    is produced, so a restart resumes a job without redoing finished pairs.
+    ``cleanup(payload)``, if given, is called once a job has completed,
+    failed or been cancelled, to release files the payload refers to.
+    ``stop`` interrupts running jobs after their current pair, for shutdown.
+    """
+
+    def __init__(self, store, handler, workers=2, cleanup=None):
+        self.store = store
+        self.handler = handler
+        self.cleanup = cleanup
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='batch-job')
+        self._cancelled = set()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def submit(self, payload, total):
+        """Persist a new job and queue it; returns the job id"""
+        job_id = self.store.create(payload, total)
+        if self._stopping.is_set():
+            # Shutting down: the job stays queued and is resumed on the next start
+            return job_id
+        self._executor.submit(self._run, job_id)
+        logger.info(f"Queued job {job_id} with {total} pairs")
+        return job_id
+
+    def resume_unfinished(self):
+        """Re-queue jobs left queued or running by a previous process"""
+        job_ids = self.store.unfinished()
+        for job_id in job_ids:
+            self.store.set_status(job_id, QUEUED)
+            self._executor.submit(self._run, job_id)
+        if job_ids:
+            logger.info(f"Resumed {len(job_ids)} unfinished jobs")
+        return job_ids
+
+    def cancel(self, job_id):
+        """Request cancellation; returns the job's status afterwards, or None"""
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        if job['status'] in FINISHED_STATES:
+            return job['status']
+
+        with self._lock:
+            self._cancelled.add(job_id)
+        self.store.set_status(job_id, CANCELLED)
+        return CANCELLED
+
+    def stop(self):
+        """Stop for shutdown: running jobs return after their current pair, queued jobs do not start
+
+        Interrupted jobs stay running (queued jobs stay queued) with their
+        finished pairs saved, so ``resume_unfinished`` carries on with them
+        on the next start. Does not wait for the running pairs.
+        """
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("Job manager stopping; unfinished jobs resume on the next start")
+
+    def _is_cancelled(self, job_id):
+        with self._lock:
+            if job_id in self._cancelled:
+                return True
+        # Cancelled through another server process sharing the database
+        return self.store.status(job_id) == CANCELLED
+
+    def _run(self, job_id):
+        if self._stopping.is_set():
+            return
+        if self._is_cancelled(job_id):
+            self._cleanup(job_id)
+            return
+
+        interrupted = False
+        try:
+            self.store.set_status(job_id, RUNNING)
+            payload = self.store.get_payload(job_id)
+            done_pairs = self.store.done_pairs(job_id)
+
+            for pair_index, result in self.handler(payload, done_pairs):
+                if self._is_cancelled(job_id):
+                    self.store.set_status(job_id, CANCELLED)
+                    logger.info(f"Job {job_id} cancelled")
+                    return
+                self.store.add_result(job_id, pair_index, result)
+                if self._stopping.is_set():
+                    interrupted = True
+                    logger.info(f"Job {job_id} interrupted by shutdown; it resumes on the next start")
+                    return
+
+            if not self._is_cancelled(job_id):
+                self.store.set_status(job_id, COMPLETED)
+                logger.info(f"Job {job_id} completed")
+
+        except Exception as e:
+            if self._stopping.is_set():
+                # e.g. the LLM pool closed under the job: not a failure of the job
+                interrupted = True
+                logger.info(f"Job {job_id} interrupted by shutdown ({str(e)}); it resumes on the next start")
+                return
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            self.store.set_status(job_id, FAILED, error=str(e))
+
+        finally:
+            # An interrupted job still needs its files when it resumes
+            if not interrupted:
+                self._cleanup(job_id)
+
+    def _cleanup(self, job_id):
+        if self.cleanup is None:
+            return
+        try:
+            self.cleanup(self.store.get_payload(job_id))
+        except Exception as e:
+            logger.error(f"Cleanup of job {job_id} failed: {str(e)}")
@@ -0,0 +1,291 @@
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+# Generated text that already holds a whole 0-100 score: three digits, or one or two followed by a non-digit
+COMPLETE_SCORE = re.compile(r'\s*(\d{3}|\d{1,2}(?=\D))')
+# Generated text that started with something other than a number: no score is coming
+NOT_A_SCORE = re.compile(r'\s*[^\s\d]')
+
+
+def generate_score_only(model, prompt, **generate_kwargs):
+    """Stream a generation and stop as soon as a complete integer score has been emitted
+
+    Digits are separate tokens for Mistral, so a score takes at most three
+    tokens plus the one that ends it. Returns the generated text. Models
+    that do not stream (return a string) are used as they are.
+    """
+    stream = model(prompt, stream=True, **generate_kwargs)
+    if isinstance(stream, str):
+        return stream
+
+    text = ''
+    try:
+        for piece in stream:
+            text += piece
+            if COMPLETE_SCORE.match(text) or NOT_A_SCORE.match(text):
+                break
+    finally:
+        stream.close()
+    return text
+
+
+def _worker_main(worker_id, model_path, model_kwargs, task_queue, result_queue, current_task):
+    """Worker process: load the GGUF model once, then serve prompts until told to stop
+
+    ``current_task`` is a shared value holding the id of the prompt being
+    generated (-1 when idle), so the parent can fail it if this process dies.
+    """
+    try:
+        from ctransformers import AutoModelForCausalLM
+        model = AutoModelForCausalLM.from_pretrained(model_path, **model_kwargs)
+    except Exception as e:
+        result_queue.put(('failed', worker_id, None, str(e), 0.0))
+        return
+
+    result_queue.put(('ready', worker_id, None, None, 0.0))
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        task_id, prompt, generate_kwargs, score_only = task
+        current_task.value = task_id
+        started = time.perf_counter()
+        try:
+            if score_only:
+                text = generate_score_only(model, prompt, **generate_kwargs)
+            else:
+                text = model(prompt, **generate_kwargs)
+            result_queue.put(('done', worker_id, task_id, text, time.perf_counter() - started))
+        except Exception as e:
+            result_queue.put(('error', worker_id, task_id, str(e), time.perf_counter() - started))
+        current_task.value = -1
+
+
+class LLMWorkerPool:
+    """Pool of worker processes that each hold one copy of the GGUF model
+
+    Prompts go through a shared queue, so an idle worker always picks up the
+    next one. Instances are callable like a ctransformers model
+    (``pool(prompt, max_new_tokens=64)``) and block until the text is ready;
+    ``submit`` returns a ``Future`` instead.
+
+    A worker that fails to load the model (or dies before it is ready) is
+    not restarted. Once every worker has failed, pending and new prompts
+    fail with the load error; ``wait_ready`` reports it to the loader.
+    """
+
+    def __init__(self, model_path, model_kwargs, workers, threads_per_worker):
+        self.model_path = model_path
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.model_kwargs = dict(model_kwargs, threads=threads_per_worker)
+
+        self._ctx = multiprocessing.get_context('spawn')
+        self._task_queue = self._ctx.Queue()
+        self._result_queue = self._ctx.Queue()
+        self._task_ids = itertools.count()
+        self._pending = {}  # task id -> Future
+        self._lock = threading.Lock()
+        self._processes = {}
+        self._worker_stats = {}
+        self._started_at = time.monotonic()
+        self._closed = False
+        self._failed = {}  # worker id -> load error
+        self._load_error = None
+        self._settled = threading.Event()  # A worker is ready, or all of them failed
+
+        for worker_id in range(workers):
+            self._spawn(worker_id)
+
+        self._collector = threading.Thread(target=self._collect, name='llm-pool-collector', daemon=True)
+        self._collector.start()
+        logger.info(f"Started LLM worker pool: {workers} workers x {threads_per_worker} threads")
+
+    def _spawn(self, worker_id):
+        current_task = self._ctx.Value('q', -1, lock=False)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.model_path, self.model_kwargs, self._task_queue, self._result_queue, current_task),
+            name=f'llm-worker-{worker_id}',
+            daemon=True
+        )
+        process.start()
+        # stats() iterates these under the lock, e.g. while a dead worker is respawned
+        with self._lock:
+            self._processes[worker_id] = process
+            self._worker_stats[worker_id] = {
+                'pid': process.pid,
+                'ready': False,
+                'tasks': 0,
+                'errors': 0,
+                'busy_seconds': 0.0,
+                'current_task': current_task,
+                'started_at': time.monotonic()
+            }
+
+    def submit(self, prompt, score_only=False, **generate_kwargs):
+        """Queue a prompt and return a Future resolving to the generated text
+
+        With ``score_only`` the worker stops generating as soon as a score is
+        complete (see ``generate_score_only``).
+        """
+        if self._closed:
+            raise RuntimeError("LLM worker pool is closed")
+        if self._load_error is not None:
+            raise RuntimeError(self._load_error)
+
+        future = Future()
+        task_id = next(self._task_ids)
+        with self._lock:
+            self._pending[task_id] = future
+        self._task_queue.put((task_id, prompt, generate_kwargs, score_only))
+        return future
+
+    def wait_ready(self, timeout=None):
+        """Block until a worker has loaded the model; raises if every worker failed"""
+        if not self._settled.wait(timeout):
+            raise TimeoutError(f"No LLM worker ready after {timeout}s")
+        if self._load_error is not None:
+            raise RuntimeError(self._load_error)
+
+    def _worker_failed(self, worker_id, error):
+        """Record a load failure; once all workers failed, fail every pending prompt"""
+        with self._lock:
+            self._failed[worker_id] = error
+            if len(self._failed) < self.workers or any(s['ready'] for s in self._worker_stats.values()):
+                return
+            self._load_error = f"No LLM worker could load the model: {error}"
+            pending = list(self._pending.values())
+            self._pending.clear()
+
+        logger.error(self._load_error)
+        self._settled.set()
+        for future in pending:
+            future.set_exception(RuntimeError(self._load_error))
+
+    def __call__(self, prompt, **generate_kwargs):
+        return self.submit(prompt, **generate_kwargs).result()
+
+    def generate_score(self, prompt, **generate_kwargs):
+        return self.submit(prompt, score_only=True, **generate_kwargs).result()
+
+    def _collect(self):
+        """Route worker messages to their futures and keep per-worker stats"""
+        last_check = time.monotonic()
+        while not self._closed:
+            if time.monotonic() - last_check >= 1.0:
+                self._check_workers()
+                last_check = time.monotonic()
+
+            try:
+                kind, worker_id, task_id, payload, elapsed = self._result_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+
+            if kind == 'failed':
+                logger.error(f"LLM worker {worker_id} failed to load model: {payload}")
+                self._worker_failed(worker_id, payload)
+                continue
+
+            with self._lock:
+                stats = self._worker_stats.get(worker_id)
+                if kind == 'ready':
+                    stats['ready'] = True
+                    self._settled.set()
+                    logger.info(f"LLM worker {worker_id} ready")
+                    continue
+
+                stats['busy_seconds'] += elapsed
+                stats['tasks'] += 1
+                future = self._pending.pop(task_id, None)
+
+            if future is None:
+                continue
+            if kind == 'done':
+                future.set_result(payload)
+            else:
+                with self._lock:
+                    stats['errors'] += 1
+                future.set_exception(RuntimeError(f"LLM worker {worker_id} error: {payload}"))
+
+    def _check_workers(self):
+        """Respawn dead workers and fail the task each one was running
+
+        Workers that never loaded the model are not respawned.
+        """
+        with self._lock:
+            processes = list(self._processes.items())
+        for worker_id, process in processes:
+            if process.is_alive() or self._closed or worker_id in self._failed:
+                continue
+
+            with self._lock:
+                ready = self._worker_stats[worker_id]['ready']
+            if not ready:
+                # Exited before 'ready': a 'failed' message may still be queued
+                logger.error(f"LLM worker {worker_id} (pid {process.pid}) exited with {process.exitcode} while loading")
+                self._worker_failed(worker_id, f"worker exited with {process.exitcode} while loading the model")
+                continue
+
+            with self._lock:
+                task_id = self._worker_stats[worker_id]['current_task'].value
+                future = self._pending.pop(task_id, None) if task_id >= 0 else None
+
+            logger.error(f"LLM worker {worker_id} (pid {process.pid}) exited with {process.exitcode}, restarting")
+            if future is not None:
+                future.set_exception(RuntimeError(f"LLM worker {worker_id} died while generating"))
+            self._spawn(worker_id)
+
+    def stats(self):
+        """Return queue depth and per-worker utilisation"""
+        now = time.monotonic()
+        with self._lock:
+            workers = []
+            for worker_id, stats in sorted(self._worker_stats.items()):
+                uptime = max(now - stats['started_at'], 1e-9)
+                workers.append({
+                    'worker_id': worker_id,
+                    'pid': stats['pid'],
+                    'alive': self._processes[worker_id].is_alive(),
+                    'ready': stats['ready'],
+                    'load_error': self._failed.get(worker_id),
+                    'busy': stats['current_task'].value >= 0,
+                    'tasks': stats['tasks'],
+                    'errors': stats['errors'],
+                    'busy_seconds': round(stats['busy_seconds'], 3),
+                    'utilisation': round(min(stats['busy_seconds'] / uptime, 1.0), 4)
+                })
+            pending = len(self._pending)
+
+        return {
+            'workers': workers,
+            'threads_per_worker': self.threads_per_worker,
+            'pending': pending,
+            'uptime_seconds': round(now - self._started_at, 1)
+        }
+
+    def close(self):
+        """Stop all workers"""
+        self._closed = True
+        for _ in self._processes:
+            self._task_queue.put(None)
+        for process in self._processes.values():
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+
+def default_threads_per_worker(workers):
+    """Split the machine's cores evenly across workers"""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
@@ -0,0 +1,88 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ModelManager:
+    """Loads named models lazily, once, however many threads ask at the same time
+
+    ``loaders`` maps a model name to a function returning the loaded model.
+    Each model has its own lock, so a slow LLM load never blocks a request
+    that only needs the tokenizer, and concurrent first requests for the
+    same model wait for a single load instead of starting their own. A
+    failed load is reported in ``status`` and retried on the next request.
+    """
+
+    def __init__(self, loaders):
+        self._loaders = dict(loaders)
+        self._models = {}
+        self._locks = {name: threading.Lock() for name in self._loaders}
+        self._status = {name: {'state': 'not_loaded'} for name in self._loaders}
+        self._status_lock = threading.Lock()
+
+    @property
+    def names(self):
+        return tuple(self._loaders)
+
+    def _set_status(self, name, **fields):
+        with self._status_lock:
+            self._status[name] = dict(self._status[name], **fields)
+
+    def get(self, name):
+        """Return the model, loading it first if needed"""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._locks[name]:
+            model = self._models.get(name)
+            if model is not None:
+                return model
+
+            self._set_status(name, state='loading', error=None)
+            started = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                self._set_status(name, state='failed', error=str(e))
+                logger.error(f"Error loading {name} model: {str(e)}")
+                raise
+
+            load_seconds = round(time.perf_counter() - started, 2)
+            self._models[name] = model
+            self._set_status(name, state='ready', load_seconds=load_seconds)
+            logger.info(f"Loaded {name} model in {load_seconds}s")
+            return model
+
+    def loaded(self, name):
+        """Return the model if it is loaded, without loading it"""
+        return self._models.get(name)
+
+    def is_ready(self, names):
+        return all(name in self._models for name in names)
+
+    def status(self, names=None):
+        with self._status_lock:
+            return {name: dict(self._status[name]) for name in (names or self._loaders)}
+
+
+class SerializedModel:
+    """Wrap a model that is not safe to call from several threads at once
+
+    Calls go through a lock, one at a time. Attribute access is passed through
+    to the wrapped model; code driving it step by step (tokenize, evaluate,
+    sample) must hold ``lock`` for the whole sequence.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self.lock:
+            return self.model(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
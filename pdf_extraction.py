@@ -0,0 +1,353 @@
+import logging
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+
+MONOSPACE_FONTS = ('mono', 'courier', 'consolas', 'code')
+SERIF_FONTS = ('times', 'georgia', 'garamond')
+SANS_SERIF_FONTS = ('arial', 'helvetica', 'calibri', 'verdana')
+
+# Text-only extraction: image blocks are never used, so skip decoding them
+TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+PLAIN_TEXT_FLAGS = fitz.TEXTFLAGS_BLOCKS & ~fitz.TEXT_PRESERVE_IMAGES
+
+
+class FontProps:
+    """Style of a span; one shared instance per (font, flags, size) combination"""
+
+    __slots__ = ('is_bold', 'is_italic', 'is_superscript', 'is_subscript', 'is_monospace',
+                 'is_serif', 'is_sans_serif', 'font_name', 'font_size', 'size_category', 'is_large')
+
+    def __init__(self, font, flags, size):
+        # Font style analysis
+        self.is_bold = bool(flags & 2**4)  # Bold flag
+        self.is_italic = bool(flags & 2**1)  # Italic flag
+        self.is_superscript = bool(flags & 2**0)  # Superscript flag
+        self.is_subscript = bool(flags & 2**2)  # Subscript flag
+        
+        # Font family analysis
+        self.is_monospace, self.is_serif, self.is_sans_serif = classify_font_name(font)
+        self.font_name = font
+        self.font_size = size
+        
+        # Size categories
+        size_category = 'normal'
+        if size > 0:
+            if size >= 16:
+                size_category = 'large'
+            elif size >= 14:
+                size_category = 'medium-large'
+            elif size >= 12:
+                size_category = 'medium'
+            elif size >= 10:
+                size_category = 'small'
+            else:
+                size_category = 'tiny'
+        self.size_category = size_category
+        self.is_large = size_category in ('large', 'medium-large')
+
+
+class Span:
+    __slots__ = ('text', 'bbox', 'font_props')
+
+    def __init__(self, text, bbox, font_props):
+        self.text = text
+        self.bbox = bbox
+        self.font_props = font_props
+
+    @property
+    def formatted_text(self):
+        return format_text_with_style(self.text, self.font_props)
+
+
+class TextLine:
+    __slots__ = ('bbox', 'spans')
+
+    def __init__(self, bbox, spans):
+        self.bbox = bbox
+        self.spans = spans
+
+
+class TextBlock:
+    __slots__ = ('bbox', 'lines')
+
+    def __init__(self, bbox, lines):
+        self.bbox = bbox
+        self.lines = lines
+
+
+class StructuredLine:
+    """A classified line: ``type`` is one of the structure types of detect_text_structure"""
+
+    __slots__ = ('type', 'content', 'text', 'y_position', 'bbox')
+
+    def __init__(self, line_type, content, text, y_position, bbox):
+        self.type = line_type
+        self.content = content
+        self.text = text
+        self.y_position = y_position
+        self.bbox = bbox
+
+
+@lru_cache(maxsize=1024)
+def classify_font_name(font):
+    """Return ``(is_monospace, is_serif, is_sans_serif)`` for a font name
+    
+    Memoized: a document only uses a handful of fonts.
+    """
+    font_lower = font.lower()
+    return (
+        any(mono in font_lower for mono in MONOSPACE_FONTS),
+        any(serif in font_lower for serif in SERIF_FONTS),
+        any(sans in font_lower for sans in SANS_SERIF_FONTS)
+    )
+
+@lru_cache(maxsize=4096)
+def font_properties(font, flags, size):
+    """Shared FontProps for a font, flag and size combination"""
+    return FontProps(font, flags, size)
+
+def analyze_font_properties(span):
+    """Analyze font properties from a span"""
+    return font_properties(span.get("font", ""), span.get("flags", 0), span.get("size", 0))
+
+def format_text_with_style(text, font_props):
+    """Format text with appropriate markdown styling"""
+    if not text.strip():
+        return text
+    
+    formatted = text
+    
+    # Apply bold formatting
+    if font_props.is_bold:
+        formatted = f"**{formatted}**"
+    
+    # Apply italic formatting
+    if font_props.is_italic:
+        formatted = f"*{formatted}*"
+    
+    # Apply monospace formatting
+    if font_props.is_monospace:
+        formatted = f"`{formatted}`"
+    
+    # Apply superscript/subscript (using Unicode or markdown)
+    if font_props.is_superscript:
+        formatted = f"^{formatted}^"
+    elif font_props.is_subscript:
+        formatted = f"_{formatted}_"
+    
+    return formatted
+
+def extract_text_blocks_with_positioning(page):
+    """Extract text blocks with detailed positioning and formatting"""
+    blocks = []
+    text_dict = page.get_text("dict", flags=TEXT_FLAGS)
+    
+    for block in text_dict.get("blocks", []):
+        if "lines" in block:
+            lines = []
+            
+            for line in block["lines"]:
+                spans = []
+                
+                for span in line.get("spans", []):
+                    span_text = span.get("text", "")
+                    if span_text.strip():
+                        spans.append(Span(span_text, span.get('bbox', (0, 0, 0, 0)), analyze_font_properties(span)))
+                
+                if spans:
+                    lines.append(TextLine(line.get('bbox', (0, 0, 0, 0)), spans))
+            
+            if lines:
+                blocks.append(TextBlock(block.get('bbox', (0, 0, 0, 0)), lines))
+    
+    return blocks
+
+def detect_text_structure(blocks):
+    """Detect document structure like headers, paragraphs, lists, etc."""
+    structured_content = []
+    
+    for block in blocks:
+        for line in block.lines:
+            # Combine spans in the line
+            spans = line.spans
+            full_line_text = "".join(span.text for span in spans)
+            line_has_bold = any(span.font_props.is_bold for span in spans)
+            line_has_large_font = any(span.font_props.is_large for span in spans)
+            
+            # Determine line type
+            line_type = 'paragraph'
+            full_line_text_stripped = full_line_text.strip()
+            
+            if not full_line_text_stripped:
+                line_type = 'blank'
+            elif line_has_bold and line_has_large_font:
+                line_type = 'main_header'
+            elif line_has_bold:
+                line_type = 'sub_header'
+            elif full_line_text_stripped.startswith(('•', '▪', '▫', '◦', '‣', '⁃', '-', '*')):
+                line_type = 'bullet_point'
+            elif re.match(r'^\s*\d+[\.\)]\s', full_line_text_stripped):
+                line_type = 'numbered_list'
+            elif full_line_text_stripped.endswith(':') and len(full_line_text_stripped) < 100:
+                line_type = 'section_header'
+            
+            structured_content.append(StructuredLine(line_type, spans, full_line_text, line.bbox[1], line.bbox))
+    
+    return structured_content
+
+def preserve_document_layout(structured_content):
+    """Preserve document layout with proper spacing and formatting"""
+    formatted_lines = []
+    previous_y = None
+    previous_type = None
+    
+    for item in structured_content:
+        current_y = item.y_position
+        current_type = item.type
+        
+        # Calculate vertical spacing
+        if previous_y is not None:
+            y_gap = abs(previous_y - current_y)
+            
+            # Add extra spacing for significant gaps
+            if y_gap > 20:  # Significant vertical gap
+                formatted_lines.append("")
+                if y_gap > 40:  # Very large gap
+                    formatted_lines.append("")
+        
+        # Format the line based on its type
+        if current_type == 'blank':
+            formatted_lines.append("")
+        elif current_type == 'main_header':
+            formatted_lines.append("")
+            formatted_lines.append(format_line_content(item.content))
+            formatted_lines.append("")
+        elif current_type == 'sub_header':
+            if previous_type not in ['main_header', 'blank']:
+                formatted_lines.append("")
+            formatted_lines.append(format_line_content(item.content))
+        elif current_type == 'section_header':
+            formatted_lines.append("")
+            formatted_lines.append(format_line_content(item.content))
+        elif current_type == 'bullet_point':
+            formatted_lines.append(format_line_content(item.content))
+        elif current_type == 'numbered_list':
+            formatted_lines.append(format_line_content(item.content))
+        else:  # paragraph
+            formatted_lines.append(format_line_content(item.content))
+        
+        previous_y = current_y
+        previous_type = current_type
+    
+    return formatted_lines
+
+def format_line_content(spans):
+    """Format a line's content preserving all formatting"""
+    return "".join(format_text_with_style(span.text, span.font_props) for span in spans)
+
+def extract_page_content(page):
+    """Extract one page as formatted text; returns "" for pages without text"""
+    # Extract structured content with positioning
+    blocks = extract_text_blocks_with_positioning(page)
+    
+    if not blocks:
+        return ""
+    
+    # Detect document structure
+    structured_content = detect_text_structure(blocks)
+    
+    # Preserve layout and formatting
+    formatted_lines = preserve_document_layout(structured_content)
+    
+    # Join the formatted lines
+    return "\n".join(formatted_lines)
+
+def extract_page_plain_text(page):
+    """Extract one page as plain text, one paragraph per layout block
+    
+    Skips span styling and structure detection entirely. Blocks are separated
+    by blank lines so chunking can still split at natural boundaries.
+    """
+    paragraphs = []
+    for block in page.get_text("blocks", flags=PLAIN_TEXT_FLAGS):
+        if block[6] == 0:  # Text block
+            text = block[4].strip()
+            if text:
+                paragraphs.append(text)
+    
+    return "\n\n".join(paragraphs)
+
+# Extraction modes: 'rich' keeps Markdown styling and layout, 'plain' is the lean scoring path
+PAGE_EXTRACTORS = {
+    'rich': extract_page_content,
+    'plain': extract_page_plain_text
+}
+
+def open_pdf(source):
+    """Open a PDF from a file path or from bytes"""
+    if isinstance(source, str):
+        return fitz.open(source, filetype="pdf")
+    return fitz.open(stream=source, filetype="pdf")
+
+def extract_page_range(source, start, stop, mode='rich'):
+    """Extract pages ``start``..``stop - 1`` of a PDF given as a path or bytes"""
+    extract_page = PAGE_EXTRACTORS[mode]
+    doc = open_pdf(source)
+    try:
+        return [extract_page(doc[page_num]) for page_num in range(start, stop)]
+    finally:
+        doc.close()
+
+def extract_document_pages(source, mode='rich'):
+    """Extract every page of a PDF given as a path or bytes, in page order"""
+    extract_page = PAGE_EXTRACTORS[mode]
+    doc = open_pdf(source)
+    try:
+        return [extract_page(page) for page in doc]
+    finally:
+        doc.close()
+
+
+class PageExtractionPool:
+    """Process pool that extracts PDF pages, or whole documents, in parallel
+
+    ``extract_pages`` splits one document into contiguous page ranges, one per
+    worker, and stitches the results back in page order. ``submit_document``
+    hands a whole document to a single worker, for batches of many small
+    files. Documents are passed as file paths where possible, so workers open
+    them directly instead of receiving a pickled copy of the bytes. Workers
+    run the same per-page functions as the serial path, so the output is
+    identical.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        logger.info(f"Started PDF extraction pool with {workers} workers")
+
+    def extract_pages(self, source, page_count, mode='rich'):
+        """Extract all pages of a document, returning their contents in page order"""
+        ranges = min(self.workers, page_count)
+        bounds = [page_count * i // ranges for i in range(ranges + 1)]
+        futures = [
+            self._executor.submit(extract_page_range, source, start, stop, mode)
+            for start, stop in zip(bounds, bounds[1:])
+        ]
+        return [content for future in futures for content in future.result()]
+
+    def submit_document(self, source, mode='rich'):
+        """Queue a whole document; returns a Future resolving to its page contents"""
+        return self._executor.submit(extract_document_pages, source, mode)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
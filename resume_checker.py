@@ -12,18 +12,21 @@ import tempfile
 
 # --- Setup ---
 @st.cache_resource
-def load_models():
-    embed_model = SentenceTransformer("all-MiniLM-L6-v2")
-    llm_model = AutoModelForCausalLM.from_pretrained(
+def load_embed_model():
+    return SentenceTransformer("all-MiniLM-L6-v2")
+
+@st.cache_resource
+def load_llm():
+    """Loaded on the first generation, so the page renders without waiting for the 4 GB model"""
+    return AutoModelForCausalLM.from_pretrained(
         "./mistral-7b-instruct-v0.2.Q4_K_M.gguf",
         model_type="mistral",
         gpu_layers=0,
         max_new_tokens=256,
         context_length=512
     )
-    return embed_model, llm_model
 
-embed_model, llm = load_models()
+embed_model = load_embed_model()
 
 # --- Utils ---
 def extract_text_from_pdf(uploaded_file):
@@ -148,7 +151,7 @@ def process_resume_jd_matching(resume_text: str, jd: str, resume_name: str) -> D
     prompt = make_prompt(jd, top_chunks)
     
     try:
-        response = llm(prompt, max_new_tokens=100)
+        response = load_llm()(prompt, max_new_tokens=100)
         score, reasoning = extract_score_from_response(response)
         
         return {
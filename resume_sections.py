@@ -0,0 +1,99 @@
+import re
+
+# Canonical section types and the headings that introduce them
+SECTION_ALIASES = {
+    'summary': ('summary', 'professional summary', 'profile', 'objective', 'about me', 'about'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history', 'internships', 'internship'),
+    'skills': ('skills', 'technical skills', 'core skills', 'competencies', 'core competencies',
+               'technologies', 'tools', 'tech stack', 'expertise'),
+    'projects': ('projects', 'personal projects', 'key projects', 'academic projects'),
+    'education': ('education', 'academic background', 'qualifications', 'academics'),
+    'certifications': ('certifications', 'certificates', 'licenses', 'courses', 'training'),
+    'achievements': ('achievements', 'awards', 'honors', 'accomplishments'),
+    'publications': ('publications', 'research', 'patents'),
+    'languages': ('languages',),
+    'interests': ('interests', 'hobbies', 'activities', 'volunteering', 'volunteer experience'),
+}
+
+SECTION_TITLES = {section_type: section_type.capitalize() for section_type in SECTION_ALIASES}
+SECTION_TITLES['header'] = 'Header'
+
+# Order in which sections are kept when a resume has more chunks than the cap
+SECTION_PRIORITY = ('experience', 'skills', 'projects', 'summary', 'education', 'certifications',
+                    'achievements', 'publications', 'languages', 'header', 'interests')
+
+BULLET_PREFIXES = ('•', '▪', '▫', '◦', '‣', '⁃', '-', '·')
+PAGE_BREAK_LINE = '--- PAGE BREAK ---'
+
+
+def normalize_heading(line):
+    """Lowercase a heading to its words: punctuation, digits and markup dropped"""
+    name = re.sub(r'[^a-z& ]+', ' ', line.strip().lower())
+    return ' '.join(name.replace('&', ' & ').split())
+
+def detect_section_heading(line):
+    """Return the section type a heading line introduces, or None"""
+    stripped = line.strip()
+    if not stripped or len(stripped) > 50 or stripped.startswith(BULLET_PREFIXES):
+        return None
+
+    name = normalize_heading(stripped)
+    if not name or len(name.split()) > 4:
+        return None
+
+    for section_type, aliases in SECTION_ALIASES.items():
+        for alias in aliases:
+            if name == alias or name.startswith(alias + ' ') or name.endswith(' ' + alias):
+                return section_type
+    return None
+
+def is_marked_heading(line):
+    """Heading markup left by extraction: ``**bold**`` lines, ``Title:`` lines or ALL CAPS"""
+    stripped = line.strip()
+    return (
+        (stripped.startswith('**') and stripped.endswith('**'))
+        or stripped.endswith(':')
+        or (stripped.isupper() and any(c.isalpha() for c in stripped))
+    )
+
+def split_resume_sections(text):
+    """Split resume text into typed sections at recognised headings
+
+    Headings are lines that name a known section and are either marked up as
+    headings by extraction (see ``is_marked_heading``) or stand on their own
+    between blank lines. Text before the first heading is typed 'header'.
+    Returns a list of ``(section_type, body)`` in document order, or an
+    empty list when no heading is found.
+    """
+    lines = [line for line in text.split('\n') if line.strip() != PAGE_BREAK_LINE]
+    sections = []
+    current_type = 'header'
+    current_lines = []
+    found_heading = False
+
+    for i, line in enumerate(lines):
+        section_type = detect_section_heading(line)
+        if section_type is not None:
+            standalone = (i == 0 or not lines[i - 1].strip()) and (i + 1 == len(lines) or not lines[i + 1].strip())
+            if not (standalone or is_marked_heading(line)):
+                section_type = None
+
+        if section_type is None:
+            current_lines.append(line)
+            continue
+
+        found_heading = True
+        body = '\n'.join(current_lines).strip()
+        if body:
+            sections.append((current_type, body))
+        current_type = section_type
+        current_lines = []
+
+    if not found_heading:
+        return []
+
+    body = '\n'.join(current_lines).strip()
+    if body:
+        sections.append((current_type, body))
+    return sections
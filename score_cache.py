@@ -0,0 +1,105 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def normalized_text_hash(text):
+    """Hash text after collapsing whitespace, so re-extraction noise still hits"""
+    return hashlib.sha256(' '.join(text.split()).encode('utf-8')).hexdigest()
+
+
+class ScoreCache:
+    """Persistent cache of LLM scoring results with TTL and LRU eviction
+
+    Keys combine the normalized resume and JD hashes with a ``context``
+    string describing everything else that shapes the LLM output (prompt
+    template version, model and generation parameters, retrieval settings).
+    Entries older than ``ttl_seconds`` are ignored and purged; once more than
+    ``max_entries`` are stored the least recently used are deleted.
+    """
+
+    def __init__(self, db_path, context, ttl_seconds, max_entries):
+        self.db_path = db_path
+        self.context_hash = hashlib.sha256(context.encode('utf-8')).hexdigest()[:16]
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scores (
+                    key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS scores_last_used ON scores (last_used)")
+            conn.execute("DELETE FROM scores WHERE created_at < ?", (time.time() - ttl_seconds,))
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def key_for(self, resume_text, jd_text, variant=''):
+        """Cache key for a (resume, JD) pair under the current context
+
+        ``variant`` separates results produced by a different scoring method
+        (e.g. packed prompts) from the default per-pair prompt.
+        """
+        context = f"{self.context_hash}-{variant}" if variant else self.context_hash
+        return f"{context}:{normalized_text_hash(resume_text)}:{normalized_text_hash(jd_text)}"
+
+    def get(self, key):
+        """Return the cached result dict, or None if missing or expired"""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT result, created_at FROM scores WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or row[1] < now - self.ttl_seconds:
+                if row is not None:
+                    conn.execute("DELETE FROM scores WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+
+            conn.execute("UPDATE scores SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key, result):
+        """Store a scoring result, evicting least recently used entries past the limit"""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO scores (key, result, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(result), now, now)
+            )
+            count = conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM scores WHERE key IN (SELECT key FROM scores ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        with self._connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds
+        }
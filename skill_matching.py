@@ -0,0 +1,175 @@
+import re
+
+import numpy as np
+from scipy import sparse
+
+from embedding_scoring import extract_requirements
+
+TOKEN_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9+#.]*')
+
+# Lowercase skills recognised however they are written; other JD words count as skills
+# when written like a name (Kubernetes, PostgreSQL, AWS, C++, S3) away from the start of a line
+KNOWN_SKILLS = frozenset("""
+    python java javascript typescript go golang rust ruby php scala kotlin swift c c++ c# r sql bash
+    react angular vue svelte node.js django flask fastapi spring rails express next.js
+    postgres postgresql mysql sqlite mongodb redis elasticsearch kafka rabbitmq spark hadoop airflow dbt snowflake
+    aws gcp azure kubernetes docker terraform ansible helm linux git graphql grpc rest
+    pandas numpy pytorch tensorflow scikit-learn html css tailwind figma jira
+""".split())
+KNOWN_PHRASES = frozenset((
+    'machine learning', 'deep learning', 'computer vision', 'data science', 'data engineering',
+    'react native', 'spring boot', 'google cloud', 'unit testing', 'system design', 'distributed systems'
+))
+GENERIC_WORDS = frozenset("""
+    a an and are as at be by for from in into is it of on or our the to we with you your will
+    experience years year strong skills skill knowledge understanding ability familiarity proficiency
+    plus preferred bonus required requirements responsibilities qualifications nice have must
+    senior junior lead team teams role work working build building design designing own drive api apis
+""".split())
+ALTERNATIVE_WORDS = ('or', '/')
+
+
+def _tokens(text):
+    """``(token, start)`` pairs; the trailing dot of a sentence is not part of the token"""
+    return [(match.group().rstrip('.'), match.start()) for match in TOKEN_PATTERN.finditer(text)]
+
+
+def _looks_like_skill(token, first):
+    lower = token.lower()
+    if lower in KNOWN_SKILLS:
+        return True
+    if lower in GENERIC_WORDS or not any(ch.isalpha() for ch in token):
+        return False
+    if any(ch.isupper() for ch in token[1:]) or any(ch in '+#.' or ch.isdigit() for ch in token):
+        return True
+    return token[0].isupper() and not first
+
+
+def extract_skill_groups(requirement):
+    """Skills a requirement line asks for, as groups of alternatives
+
+    "Experience with AWS or GCP and Terraform" gives
+    ``[['aws', 'gcp'], ['terraform']]``: a resume covers a group with any of
+    its skills.
+    """
+    tokens = _tokens(requirement)
+    groups = []
+    previous_end = None
+    for pos, (token, start) in enumerate(tokens):
+        skill = None
+        if pos + 1 < len(tokens) and f"{token} {tokens[pos + 1][0]}".lower() in KNOWN_PHRASES:
+            skill = f"{token} {tokens[pos + 1][0]}".lower()
+        elif pos > 0 and f"{tokens[pos - 1][0]} {token}".lower() in KNOWN_PHRASES:
+            continue
+        elif _looks_like_skill(token, pos == 0):
+            skill = token.lower()
+        if skill is None:
+            continue
+
+        between = requirement[previous_end:start].strip().lower() if previous_end is not None else None
+        if groups and between in ALTERNATIVE_WORDS:
+            if skill not in groups[-1]:
+                groups[-1].append(skill)
+        elif not any(skill in group for group in groups):
+            groups.append([skill])
+        previous_end = start + len(token)
+    return groups
+
+
+def resume_terms(resume_text):
+    """Lowercase words and word pairs of a resume, the terms a skill is looked up in"""
+    words = [token.lower() for token, _ in _tokens(resume_text)]
+    return set(words) | {f"{first} {second}" for first, second in zip(words, words[1:])}
+
+
+class SkillMatch:
+    """Keyword coverage of the requirements of several JDs by several resumes
+
+    The vocabulary is every skill named in a JD requirement. Each resume is a
+    sparse binary term vector over that vocabulary, so presence of all skill
+    groups in all resumes is one sparse product (resumes x vocabulary times
+    vocabulary x groups), and coverage per requirement and per (resume, JD)
+    pair is one more product each. Requirements naming no skill are left out.
+    """
+
+    def __init__(self, resume_texts, job_descriptions):
+        self.requirements = []  # (jd_index, requirement, weight, [group, ...])
+        for j, jd_text in enumerate(job_descriptions):
+            for requirement, weight in extract_requirements(jd_text):
+                groups = extract_skill_groups(requirement)
+                if groups:
+                    self.requirements.append((j, requirement, weight, groups))
+
+        self.vocabulary = sorted({
+            skill for _, _, _, groups in self.requirements for group in groups for skill in group
+        })
+        term_ids = {term: index for index, term in enumerate(self.vocabulary)}
+        groups = [group for _, _, _, requirement_groups in self.requirements for group in requirement_groups]
+
+        rows, cols = [], []
+        for i, resume_text in enumerate(resume_texts):
+            present = [term_ids[term] for term in resume_terms(resume_text) if term in term_ids]
+            rows.extend([i] * len(present))
+            cols.extend(present)
+        self.presence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype='float32'), (rows, cols)),
+            shape=(len(resume_texts), len(self.vocabulary))
+        )
+
+        group_members = sparse.csr_matrix(
+            (
+                np.ones(sum(len(group) for group in groups), dtype='float32'),
+                ([term_ids[skill] for group in groups for skill in group],
+                 [g for g, group in enumerate(groups) for _ in group])
+            ),
+            shape=(len(self.vocabulary), len(groups))
+        )
+        requirement_of_group = [r for r, (_, _, _, gs) in enumerate(self.requirements) for _ in gs]
+        group_share = sparse.csr_matrix(
+            (
+                [1.0 / len(self.requirements[r][3]) for r in requirement_of_group],
+                (np.arange(len(groups)), requirement_of_group)
+            ),
+            shape=(len(groups), len(self.requirements))
+        )
+
+        # resumes x groups: does the resume name any skill of the group
+        self.group_hits = (self.presence @ group_members).toarray() > 0
+        # resumes x requirements: share of the requirement's groups covered
+        self.coverage = (sparse.csr_matrix(self.group_hits, dtype='float32') @ group_share).toarray()
+
+        jd_weights = np.zeros((len(self.requirements), len(job_descriptions)), dtype='float32')
+        for r, (j, _, weight, _) in enumerate(self.requirements):
+            jd_weights[r, j] = weight
+        totals = jd_weights.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # resumes x JDs: weighted coverage, NaN for JDs without skill requirements
+            self.pair_coverage = (self.coverage @ jd_weights) / np.where(totals > 0, totals, np.nan)
+
+        self._group_offsets = np.cumsum([0] + [len(gs) for _, _, _, gs in self.requirements])
+
+    def report(self, i, j):
+        """Skill coverage of resume ``i`` for JD ``j``, for the API response (None without skills)"""
+        coverage = self.pair_coverage[i, j]
+        if not np.isfinite(coverage):
+            return None
+
+        matched, missing, requirements = [], [], []
+        for r, (jd_index, requirement, _, groups) in enumerate(self.requirements):
+            if jd_index != j:
+                continue
+            hits = self.group_hits[i, self._group_offsets[r]:self._group_offsets[r + 1]]
+            for group, hit in zip(groups, hits):
+                (matched if hit else missing).append(' / '.join(group))
+            requirements.append({
+                'requirement': requirement,
+                'skills': [' / '.join(group) for group in groups],
+                'coverage': round(float(self.coverage[i, r]), 4)
+            })
+
+        return {
+            'coverage': round(float(coverage), 4),
+            'matched': list(dict.fromkeys(matched)),
+            'missing': list(dict.fromkeys(skill for skill in missing if skill not in matched)),
+            'requirements': requirements
+        }
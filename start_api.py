@@ -3,29 +3,32 @@
 Simple script to start the Resume Checker API server
 """
 
+import importlib.util
 import subprocess
 import sys
 import os
 import time
 
 def check_dependencies():
-    """Check if required dependencies are installed"""
-    required_packages = [
-        'flask',
-        'flask-cors',
-        'PyMuPDF',
-        'tiktoken',
-        'faiss-cpu',
-        'numpy',
-        'sentence-transformers',
-        'ctransformers'
-    ]
+    """Check if required dependencies are installed
+    
+    Packages are only located, not imported, so the check stays fast even
+    for sentence-transformers (torch) and ctransformers.
+    """
+    required_packages = {
+        'flask': 'flask',
+        'flask-cors': 'flask_cors',
+        'PyMuPDF': 'fitz',
+        'tiktoken': 'tiktoken',
+        'faiss-cpu': 'faiss',
+        'numpy': 'numpy',
+        'sentence-transformers': 'sentence_transformers',
+        'ctransformers': 'ctransformers'
+    }
     
     missing_packages = []
-    for package in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
-        except ImportError:
+    for package, module in required_packages.items():
+        if importlib.util.find_spec(module) is None:
             missing_packages.append(package)
     
     if missing_packages:
@@ -45,6 +48,7 @@ def start_server():
     print("📍 Server will be available at: http://localhost:8501")
     print("🔗 Test endpoint: http://localhost:8501/api/test")
     print("📊 Status endpoint: http://localhost:8501/api/status")
+    print("🟢 Readiness endpoint: http://localhost:8501/api/ready (models load in the background)")
     print("\nPress Ctrl+C to stop the server\n")
     
     try:
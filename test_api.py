@@ -5,6 +5,7 @@ Simple test script to verify the resume checker API is working
 
 import requests
 import json
+import time
 
 def test_api_status():
     """Test if the API server is running"""
@@ -24,6 +25,43 @@ def test_api_status():
         print(f"❌ Error testing API: {e}")
         return False
 
+def test_readiness():
+    """Test the readiness endpoint"""
+    try:
+        response = requests.get('http://localhost:8501/api/ready')
+        
+        # 503 only means models are still loading
+        if response.status_code in (200, 503) and 'ready' in response.json():
+            result = response.json()
+            print(f"✅ Readiness test passed: ready={result['ready']}")
+            print(f"Models: {result.get('models')}")
+            return True
+        else:
+            print(f"❌ Readiness check failed with status {response.status_code}")
+            print(f"Response: {response.text}")
+            return False
+    except Exception as e:
+        print(f"❌ Error testing readiness: {e}")
+        return False
+
+def test_metrics():
+    """Test the Prometheus metrics endpoint"""
+    try:
+        response = requests.get('http://localhost:8501/metrics')
+        
+        if response.status_code == 200 and 'hiresync_http_requests_total' in response.text:
+            samples = [line for line in response.text.splitlines() if line and not line.startswith('#')]
+            print("✅ Metrics test passed")
+            print(f"Samples: {len(samples)}")
+            return True
+        else:
+            print(f"❌ Metrics failed with status {response.status_code}")
+            print(f"Response: {response.text[:200]}")
+            return False
+    except Exception as e:
+        print(f"❌ Error testing metrics: {e}")
+        return False
+
 def test_single_resume_check():
     """Test the single resume check endpoint"""
     try:
@@ -86,6 +124,135 @@ def test_batch_resume_check():
         print(f"❌ Error testing batch resume check: {e}")
         return False
 
+def test_search_candidates():
+    """Test the candidate search endpoint"""
+    try:
+        data = {
+            'job_description': 'Software Engineer with Python experience',
+            'top_k': '5'
+        }
+        
+        response = requests.post('http://localhost:8501/api/search-candidates', data=data)
+        
+        if response.status_code == 200:
+            result = response.json()
+            print("✅ Candidate search test passed")
+            print(f"Candidates returned: {result.get('total_returned', 0)} of {result.get('indexed_candidates', 0)}")
+            print(f"Search time: {result.get('search_ms', 'N/A')} ms")
+            return True
+        else:
+            print(f"❌ Candidate search failed with status {response.status_code}")
+            print(f"Response: {response.text}")
+            return False
+    except Exception as e:
+        print(f"❌ Error testing candidate search: {e}")
+        return False
+
+def test_candidates():
+    """Test listing candidates and deleting an unknown one"""
+    try:
+        response = requests.get('http://localhost:8501/api/candidates', params={'limit': '10'})
+        if response.status_code != 200:
+            print(f"❌ Candidate listing failed with status {response.status_code}")
+            print(f"Response: {response.text}")
+            return False
+        result = response.json()
+        print(f"✅ Candidate listing test passed: {len(result.get('candidates', []))} of {result.get('total', 0)}")
+        
+        # Deleting ids that do not exist leaves the corpus untouched
+        candidate = requests.delete('http://localhost:8501/api/candidates/no-such-candidate')
+        indexed = requests.delete('http://localhost:8501/api/candidate-index/no-such-resume')
+        if candidate.status_code == 404 and indexed.status_code == 404:
+            print("✅ Candidate delete test passed")
+            return True
+        else:
+            print(f"❌ Deleting unknown ids returned {candidate.status_code} and {indexed.status_code}, expected 404")
+            return False
+    except Exception as e:
+        print(f"❌ Error testing candidates: {e}")
+        return False
+
+def test_batch_jobs():
+    """Test creating, polling and cancelling batch jobs"""
+    try:
+        data = {
+            'job_description_0': 'Software Engineer with Python experience',
+            'scoring_mode': 'embedding'
+        }
+        files = {
+            'resume_0': ('test_resume1.txt', 'Experienced Python developer with 5 years of experience in web development.', 'text/plain')
+        }
+        
+        response = requests.post('http://localhost:8501/api/jobs', data=data, files=files)
+        if response.status_code != 202:
+            print(f"❌ Job creation failed with status {response.status_code}")
+            print(f"Response: {response.text}")
+            return False
+        job_id = response.json()['job_id']
+        
+        # Poll until the job finishes
+        job = None
+        for _ in range(60):
+            job = requests.get(f'http://localhost:8501/api/jobs/{job_id}').json()
+            if job.get('status') in ('completed', 'failed', 'cancelled'):
+                break
+            time.sleep(1)
+        if job.get('status') != 'completed':
+            print(f"❌ Job {job_id} did not complete: {job}")
+            return False
+        print(f"✅ Batch job completed: {job['completed']}/{job['total']} pairs")
+        
+        # Cancel a second job; it may already have finished
+        files = {
+            'resume_0': ('test_resume2.txt', 'Data scientist with expertise in machine learning and Python.', 'text/plain')
+        }
+        job_id = requests.post('http://localhost:8501/api/jobs', data=data, files=files).json()['job_id']
+        response = requests.post(f'http://localhost:8501/api/jobs/{job_id}/cancel')
+        if response.status_code == 200 and response.json().get('status') in ('cancelled', 'completed'):
+            print(f"✅ Batch job cancel test passed: {response.json()['status']}")
+            return True
+        else:
+            print(f"❌ Job cancel failed with status {response.status_code}")
+            print(f"Response: {response.text}")
+            return False
+    except Exception as e:
+        print(f"❌ Error testing batch jobs: {e}")
+        return False
+
+def test_streamed_batch_resume_check():
+    """Test the batch resume check endpoint with an NDJSON stream"""
+    try:
+        data = {
+            'job_description_0': 'Software Engineer with Python experience',
+            'job_description_1': 'Data Scientist with machine learning skills'
+        }
+        files = {
+            'resume_0': ('test_resume1.txt', 'Experienced Python developer with 5 years of experience in web development.', 'text/plain'),
+            'resume_1': ('test_resume2.txt', 'Data scientist with expertise in machine learning and Python.', 'text/plain')
+        }
+        
+        response = requests.post(
+            'http://localhost:8501/api/resume-checker?stream=ndjson', data=data, files=files, stream=True
+        )
+        if response.status_code != 200:
+            print(f"❌ Streamed batch resume check failed with status {response.status_code}")
+            print(f"Response: {response.text}")
+            return False
+        
+        events = [json.loads(line) for line in response.iter_lines() if line]
+        types = [event.get('type') for event in events]
+        results = types.count('result')
+        if types and types[0] == 'start' and types[-1] == 'done' and results == 4:
+            print("✅ Streamed batch resume check test passed")
+            print(f"Events: {len(events)} ({results} results)")
+            return True
+        else:
+            print(f"❌ Unexpected stream events: {types}")
+            return False
+    except Exception as e:
+        print(f"❌ Error testing streamed batch resume check: {e}")
+        return False
+
 if __name__ == "__main__":
     print("Testing Resume Checker API...")
     print("=" * 50)
@@ -99,6 +266,11 @@ if __name__ == "__main__":
     
     print("\n" + "=" * 50)
     
+    # Test readiness
+    test_readiness()
+    
+    print("\n" + "=" * 50)
+    
     # Test single resume check
     test_single_resume_check()
     
@@ -107,5 +279,30 @@ if __name__ == "__main__":
     # Test batch resume check
     test_batch_resume_check()
     
+    print("\n" + "=" * 50)
+    
+    # Test streamed batch resume check
+    test_streamed_batch_resume_check()
+    
+    print("\n" + "=" * 50)
+    
+    # Test candidate search
+    test_search_candidates()
+    
+    print("\n" + "=" * 50)
+    
+    # Test candidate listing and deletion
+    test_candidates()
+    
+    print("\n" + "=" * 50)
+    
+    # Test batch jobs
+    test_batch_jobs()
+    
+    print("\n" + "=" * 50)
+    
+    # Test metrics (after the requests above, so they are counted)
+    test_metrics()
+    
     print("\n" + "=" * 50)
     print("✅ API testing completed!") 
\ No newline at end of file
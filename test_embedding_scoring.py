@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test script for splitting job descriptions into requirements (no server needed)
+"""
+
+import sys
+
+from api_server import format_job_description_text
+from embedding_scoring import extract_requirements
+
+FORMATTED_JD = """Senior Backend Engineer
+
+About Us
+We build payroll software for small businesses.
+
+Requirements:
+- 5+ years of Python experience
+- Strong SQL and Postgres skills, Kafka a plus
+5+ years of Python experience building APIs
+Experience with Kubernetes and AWS
+
+Benefits
+- Flexible working hours and remote days"""
+
+
+def test_formatted_jd():
+    """Lines bolded by format_job_description_text stay requirements, headings do not"""
+    formatted = format_job_description_text(FORMATTED_JD)
+    print(f"Formatted JD:\n{formatted}\n")
+
+    requirements = [text for text, _ in extract_requirements(formatted)]
+    print(f"Requirements: {requirements}")
+
+    expected = ['5+ years of Python experience', 'Strong SQL and Postgres skills, Kafka a plus']
+    if requirements == expected:
+        print("✅ Formatted JD test passed")
+        return True
+    print(f"❌ Formatted JD test failed, expected {expected}")
+    return False
+
+
+def test_formatted_jd_without_bullets():
+    """Without bullets, bolded sentences are requirements and the fallback has no markup"""
+    formatted = format_job_description_text(
+        "**Role**\n5+ years of Python experience building APIs\nExperience with Kubernetes and AWS\n"
+        "About Us\nWe build payroll software for small businesses."
+    )
+    requirements = [text for text, _ in extract_requirements(formatted)]
+    print(f"Requirements: {requirements}")
+
+    fallback = extract_requirements(format_job_description_text("**Skills**\nPython\nSQL"))
+    print(f"Fallback: {fallback}")
+
+    expected = ['5+ years of Python experience building APIs', 'Experience with Kubernetes and AWS']
+    if requirements == expected and fallback == [('Skills Python SQL', 1.0)]:
+        print("✅ Formatted JD without bullets test passed")
+        return True
+    print(f"❌ Formatted JD without bullets test failed, expected {expected}")
+    return False
+
+
+if __name__ == "__main__":
+    print("Testing requirement extraction...")
+    print("=" * 50)
+
+    passed = all([test_formatted_jd(), test_formatted_jd_without_bullets()])
+
+    print("\n" + "=" * 50)
+    print("✅ Requirement extraction testing completed!" if passed else "❌ Requirement extraction tests failed")
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,86 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import uuid
+
+from flask import Request
+from werkzeug.datastructures import FileStorage
+
+
+class SpooledUploadRequest(Request):
+    """Flask request that spools uploaded files to named temporary files
+
+    Small requests are parsed into memory; anything larger than
+    ``spool_max_memory`` is written to a named temporary file so PDFs can be
+    opened by path (``fitz.open(path)``) in this process or in extraction
+    workers, without holding a bytes copy. Temporary files are deleted as
+    soon as the upload is closed.
+    """
+
+    spool_max_memory = 512 * 1024
+    temp_dir = None
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if total_content_length is not None and total_content_length <= self.spool_max_memory:
+            return io.BytesIO()
+        return tempfile.NamedTemporaryFile('wb+', suffix='.upload', dir=self.temp_dir)
+
+
+def upload_size(file):
+    """Size in bytes of an uploaded file, without reading it"""
+    stream = file.stream
+    position = stream.tell()
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(position)
+    return size
+
+
+def hash_upload(file, chunk_size=1024 * 1024):
+    """SHA-256 hex digest of an uploaded file, read in chunks"""
+    digest = hashlib.sha256()
+    stream = file.stream
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def upload_source(file):
+    """Return what fitz should open for an upload: a file path, or the bytes in memory
+
+    Spooled uploads give their temporary file path, so nothing is copied.
+    In-memory uploads are at most ``spool_max_memory`` bytes.
+    """
+    stream = file.stream
+    name = getattr(stream, 'name', None)
+    if isinstance(name, str) and os.path.isfile(name):
+        stream.flush()
+        return name
+    if isinstance(stream, io.BytesIO):
+        return stream.getvalue()
+
+    stream.seek(0)
+    data = stream.read()
+    stream.seek(0)
+    return data
+
+
+def save_upload(file, directory):
+    """Copy an upload to a new file in ``directory`` and return its path"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{uuid.uuid4().hex}.pdf")
+    stream = file.stream
+    stream.seek(0)
+    with open(path, 'wb') as f:
+        shutil.copyfileobj(stream, f, 1024 * 1024)
+    stream.seek(0)
+    return path
+
+
+def open_saved_upload(path, filename):
+    """Reopen a file written by ``save_upload`` as an upload named ``filename``"""
+    return FileStorage(stream=open(path, 'rb'), filename=filename)
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Production entry points for the Resume Checker API server
+
+gunicorn (Linux/macOS, one worker process with a thread pool):
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+waitress (any OS, one process with a thread pool):
+    python wsgi.py
+"""
+
+import os
+
+from api_server import app, start_background_services, close_stores
+
+WEB_HOST = os.environ.get('WEB_HOST', '0.0.0.0')
+WEB_PORT = int(os.environ.get('WEB_PORT', 8501))
+WEB_THREADS = int(os.environ.get('WEB_THREADS', 8))
+
+if __name__ == '__main__':
+    from waitress import serve
+
+    start_background_services()
+    print(f"Starting waitress on http://{WEB_HOST}:{WEB_PORT} with {WEB_THREADS} threads")
+    try:
+        serve(app, host=WEB_HOST, port=WEB_PORT, threads=WEB_THREADS)
+    finally:
+        close_stores()